@@ -0,0 +1,95 @@
+"""
+MySQL backend pooling its connections, Django only pools them on
+PostgreSQL.
+
+It is enabled, like the PostgreSQL pool, by a `pool` entry in the
+`OPTIONS` of the database: `True` or the options of `ConnectionPool`
+(`max_size`, `timeout`, `max_lifetime`). Connections are checked with a
+ping when they are taken from the pool if `CONN_HEALTH_CHECKS` is on, and
+rolled back when they are returned to it. Pooling does not support
+persistent connections (`CONN_MAX_AGE`).
+"""
+
+import functools
+from typing import Any, Dict
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.mysql import base
+from django.db.backends.base.base import NO_DB_ALIAS
+
+from apps.core.utils.pool import ConnectionPool, PoolTimeout
+
+from .creation import DatabaseCreation
+
+
+def check_connection(connection: Any) -> bool:
+    connection.ping()
+    return True
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+    _connection_pools: Dict[str, ConnectionPool[Any]] = {}
+
+    @property
+    def pool(self) -> ConnectionPool[Any] | None:
+        pool_options = self.settings_dict["OPTIONS"].get("pool")
+        if self.alias == NO_DB_ALIAS or not pool_options:
+            return None
+
+        if self.alias not in self._connection_pools:
+            if self.settings_dict.get("CONN_MAX_AGE", 0) != 0:
+                raise ImproperlyConfigured(
+                    "Pooling doesn't support persistent connections."
+                )
+            if pool_options is True:
+                pool_options = {}
+            enable_checks = self.settings_dict["CONN_HEALTH_CHECKS"]
+            pool: ConnectionPool[Any] = ConnectionPool(
+                connect=functools.partial(
+                    super().get_new_connection, self.get_connection_params()
+                ),
+                close=lambda connection: connection.close(),
+                check=check_connection if enable_checks else None,
+                reset=lambda connection: connection.rollback(),
+                **pool_options,
+            )
+            # The first pool set wins if several threads create one.
+            self._connection_pools.setdefault(self.alias, pool)
+
+        return self._connection_pools[self.alias]
+
+    def close_pool(self) -> None:
+        if self.pool:
+            self.pool.close_all()
+            del self._connection_pools[self.alias]
+
+    def get_connection_params(self) -> Dict[str, Any]:
+        params = super().get_connection_params()
+        params.pop("pool", None)
+        return params
+
+    def get_new_connection(self, conn_params: Any) -> Any:
+        if not self.pool:
+            return super().get_new_connection(conn_params)
+        try:
+            return self.pool.acquire()
+        except PoolTimeout as exc:
+            raise self.Database.OperationalError(str(exc)) from exc
+
+    def _close(self) -> None:
+        if self.connection is None:
+            return
+        with self.wrap_database_errors:
+            if self.pool:
+                self.pool.release(self.connection)
+                # Connection can no longer be used.
+                self.connection = None
+            else:
+                self.connection.close()
+
+    def close_if_health_check_failed(self) -> None:
+        if self.pool:
+            # The pool only returns healthy connections.
+            return
+        super().close_if_health_check_failed()
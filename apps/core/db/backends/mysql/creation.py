@@ -0,0 +1,20 @@
+from typing import Any, TYPE_CHECKING
+
+from django.db.backends.mysql import creation
+
+if TYPE_CHECKING:
+    from .base import DatabaseWrapper
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    connection: "DatabaseWrapper"
+
+    def _create_test_db(self, *args: Any, **kwargs: Any) -> Any:
+        # The pool must not return connections to the database used before
+        # switching to the test database.
+        self.connection.close_pool()
+        return super()._create_test_db(*args, **kwargs)  # type: ignore[misc]
+
+    def _destroy_test_db(self, *args: Any, **kwargs: Any) -> Any:
+        self.connection.close_pool()
+        return super()._destroy_test_db(*args, **kwargs)  # type: ignore[misc]
@@ -0,0 +1,75 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Type
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Model
+
+# The replica read by the current scope, None for the primary.
+_replica: ContextVar[str | None] = ContextVar("replica", default=None)
+
+
+def choose_replica() -> str | None:
+    if not settings.DATABASE_REPLICAS:
+        return None
+    return random.choice(settings.DATABASE_REPLICAS)
+
+
+@contextmanager
+def replica_reads(enabled: bool = True) -> Iterator[None]:
+    """
+    Sends the reads of the block to a random replica of `DATABASE_REPLICAS`,
+    the same one for the whole block, or to the primary when `enabled` is
+    False.
+
+    The scope is a context variable, it follows the code run with
+    `sync_to_async` and `async_to_sync`, and a write ends it, so that the
+    following reads see the write.
+    """
+    token = _replica.set(choose_replica() if enabled else None)
+    try:
+        yield
+    finally:
+        _replica.reset(token)
+
+
+def enable_replica_reads() -> None:
+    """Sends the following reads to a random replica, until the enclosing
+    `replica_reads` block ends."""
+    _replica.set(choose_replica())
+
+
+def primary_pin_key(user_id: Any) -> str:
+    """Cache key of the users pinned to the primary after their writes."""
+    return f"db:primary-pin:{user_id}"
+
+
+class ReplicaRouter:
+    """
+    Reads from the replica chosen by `replica_reads`, otherwise from the
+    primary (`default`), which receives all the writes and migrations.
+
+    The queries of a scope all read the same replica, so that they see the
+    same state of the data despite the replicas lagging differently.
+    """
+
+    def db_for_read(self, model: Type[Model], **hints: Any) -> str | None:
+        return _replica.get()
+
+    def db_for_write(self, model: Type[Model], **hints: Any) -> str:
+        # An instance read from a replica is saved to the primary.
+        _replica.set(None)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints: Any) -> bool | None:
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db: str, app_label: str, **hints: Any) -> bool | None:
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
@@ -0,0 +1,90 @@
+from pathlib import Path
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection
+
+from benchmarks.runner import (
+    BASELINE_PATH,
+    BenchmarkRunner,
+    REFERENCE_SCENARIO,
+    compare,
+    load_baseline,
+    save_baseline,
+)
+from benchmarks.scenarios import BenchmarkContext, BenchmarkDataError, SCENARIOS
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks the hot API paths (list, count, search, detail, favorites) "
+        "against the current database and fails when the query count, rows "
+        "scanned or p50 latency relative to the reference scenario exceed the "
+        "stored baseline budgets."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--country-code", default="MK")
+        parser.add_argument("--iterations", type=int, default=30)
+        parser.add_argument("--warmup", type=int, default=3)
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            dest="scenarios",
+            choices=[scenario.name for scenario in SCENARIOS],
+            help=(
+                "Only run the given scenario, can be repeated. The "
+                f"{REFERENCE_SCENARIO} scenario always runs, the latency budgets "
+                "are relative to it."
+            ),
+        )
+        parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+        parser.add_argument(
+            "--update-baseline",
+            action="store_true",
+            help="Store the results as the new baseline instead of comparing.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["iterations"] < 1:
+            raise CommandError("--iterations must be at least 1.")
+        scenarios = [
+            scenario
+            for scenario in SCENARIOS
+            if not options["scenarios"]
+            or scenario.name in options["scenarios"]
+            or scenario.name == REFERENCE_SCENARIO
+        ]
+        try:
+            context = BenchmarkContext.from_database(options["country_code"])
+            runner = BenchmarkRunner(
+                context, iterations=options["iterations"], warmup=options["warmup"]
+            )
+            results = [runner.run(scenario) for scenario in scenarios]
+        except BenchmarkDataError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(
+            f"{'scenario':<32}{'status':>8}{'p50 ms':>10}{'p95 ms':>10}"
+            f"{'queries':>9}{'rows scanned':>14}"
+        )
+        for result in results:
+            rows = "-" if result.rows_scanned is None else str(result.rows_scanned)
+            self.stdout.write(
+                f"{result.name:<32}{result.status_code:>8}{result.p50_ms:>10.2f}"
+                f"{result.p95_ms:>10.2f}{result.queries:>9}{rows:>14}"
+            )
+
+        if options["update_baseline"]:
+            save_baseline(results, connection.vendor, options["baseline"])
+            self.stdout.write(
+                self.style.SUCCESS(f"Baseline saved to {options['baseline']}")
+            )
+            return
+
+        violations = compare(
+            results, load_baseline(options["baseline"]), connection.vendor
+        )
+        if violations:
+            raise CommandError("Benchmark budgets exceeded:\n" + "\n".join(violations))
+        self.stdout.write(self.style.SUCCESS("All benchmark budgets are respected."))
@@ -0,0 +1,41 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import DEFAULT_DB_ALIAS
+
+from benchmarks.runner import connection_overhead
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures the time to get a database connection under concurrent "
+        "load, with a connection per request, persistent connections and "
+        "the connection pool."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument(
+            "--requests", type=int, default=200, help="Requests per thread."
+        )
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["threads"] < 1 or options["requests"] < 1:
+            raise CommandError("--threads and --requests must be at least 1.")
+        results = connection_overhead(
+            threads=options["threads"],
+            requests=options["requests"],
+            alias=options["database"],
+        )
+
+        self.stdout.write(f"{'mode':<12}{'p50 ms':>10}{'p95 ms':>10}{'req/s':>10}")
+        for mode, result in results.items():
+            self.stdout.write(
+                f"{mode:<12}{result['p50_ms']:>10.3f}{result['p95_ms']:>10.3f}"
+                f"{result['requests_per_second']:>10.1f}"
+            )
+        if "pooled" not in results:
+            self.stdout.write(
+                self.style.WARNING("The database backend has no connection pool.")
+            )
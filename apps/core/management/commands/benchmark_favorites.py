@@ -0,0 +1,45 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from benchmarks.runner import favorite_throughput
+from benchmarks.scenarios import BenchmarkContext, BenchmarkDataError
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures the throughput of adding and removing favorites under "
+        "concurrent load, including concurrent adds of the same favorite."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--country-code", default="MK")
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=50,
+            help="Favorites added and removed per thread.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["threads"] < 1 or options["requests"] < 1:
+            raise CommandError("--threads and --requests must be at least 1.")
+        try:
+            context = BenchmarkContext.from_database(options["country_code"])
+            result = favorite_throughput(
+                context, threads=options["threads"], requests=options["requests"]
+            )
+        except BenchmarkDataError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(
+            f"{'p50 ms':>10}{'p95 ms':>10}{'req/s':>10}{'conflicts':>11}{'errors':>8}"
+        )
+        self.stdout.write(
+            f"{result['p50_ms']:>10.3f}{result['p95_ms']:>10.3f}"
+            f"{result['requests_per_second']:>10.1f}{result['conflicts']:>11}"
+            f"{result['errors']:>8}"
+        )
+        if result["errors"]:
+            raise CommandError(f"{result['errors']} requests failed.")
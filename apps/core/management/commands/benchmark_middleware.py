@@ -0,0 +1,33 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.urls import reverse
+
+from benchmarks.runner import middleware_overhead
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures the per-request time saved on the stateless API routes by "
+        "skipping the session based middleware."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--path", default=None, help="Defaults to the properties list."
+        )
+        parser.add_argument("--iterations", type=int, default=10_000)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["iterations"] < 1:
+            raise CommandError("--iterations must be at least 1.")
+        path = options["path"] or reverse("apps.properties:properties-list")
+        results = middleware_overhead(path, iterations=options["iterations"])
+
+        self.stdout.write(f"{'stack':<8}{'us/request':>12}")
+        for name, duration in results.items():
+            self.stdout.write(f"{name:<8}{duration:>12.2f}")
+        saved = results["full"] - results["lean"]
+        self.stdout.write(
+            self.style.SUCCESS(f"Saved {saved:.2f} us per request on {path}.")
+        )
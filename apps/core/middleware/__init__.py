@@ -0,0 +1,13 @@
+from .prometheus import PrometheusMetricsMiddleware
+from .replicas import ReplicaPinningMiddleware
+from .request_metrics import RequestMetricsMiddleware
+from .slow_queries import SlowQueryMiddleware
+from .stateful import StatefulMiddleware
+
+__all__ = [
+    "PrometheusMetricsMiddleware",
+    "ReplicaPinningMiddleware",
+    "RequestMetricsMiddleware",
+    "SlowQueryMiddleware",
+    "StatefulMiddleware",
+]
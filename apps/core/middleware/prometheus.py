@@ -0,0 +1,59 @@
+import time
+from typing import Any, Callable
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from django.http import HttpRequest, HttpResponse
+
+from apps.core.utils.prometheus import observe_connection_pools, observe_request
+from apps.core.utils.request_metrics import current_request_metrics
+
+
+class PrometheusMetricsMiddleware:
+    """
+    Records the latency, status code and database time of every request per
+    resolved view name, e.g. `apps.properties:properties-list`, and the
+    statistics of the database connection pools.
+
+    The database time and query count are read from the request metrics, so
+    it must be placed after `RequestMetricsMiddleware`.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]) -> None:
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if self.async_mode:
+            return self.__acall__(request)
+
+        start = time.perf_counter()
+        response = self.get_response(request)
+        self.observe(request, response, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        start = time.perf_counter()
+        response: HttpResponse = await self.get_response(request)
+        self.observe(request, response, time.perf_counter() - start)
+        return response
+
+    def observe(
+        self, request: HttpRequest, response: HttpResponse, duration: float
+    ) -> None:
+        metrics = current_request_metrics()
+        match = getattr(request, "resolver_match", None)
+        observe_request(
+            view=match.view_name if match else None,
+            method=request.method or "",
+            status=response.status_code,
+            duration=duration,
+            db_time=metrics.db_time if metrics else None,
+            queries=metrics.queries if metrics else None,
+        )
+        observe_connection_pools()
@@ -0,0 +1,76 @@
+from typing import Any, Callable
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpRequest, HttpResponse
+
+from rest_framework.permissions import SAFE_METHODS
+
+from apps.core.db.routers import primary_pin_key, replica_reads
+
+
+class ReplicaPinningMiddleware:
+    """
+    Pins the clients to the primary database for
+    `DATABASE_REPLICA_PIN_SECONDS` after their writes, so that they read
+    their writes despite the replication lag.
+
+    Every request of an authenticated user which is not a GET, HEAD or
+    OPTIONS is assumed to write, and pins the user in the shared cache, which
+    `ReplicaReadsMixin` checks before reading from the replicas. Users are
+    pinned by id rather than by a cookie, so that the pin works for the
+    clients which do not send cookies, e.g. mobile apps or single page apps
+    of another origin authenticated by JWT. The cache must be shared by the
+    workers, see `CACHES`.
+
+    Every request starts reading from the primary, the views enable the
+    replicas for the rest of the request.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]) -> None:
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if self.async_mode:
+            return self.__acall__(request)
+
+        with replica_reads(False):
+            response = self.get_response(request)
+        if self.writes(request):
+            cache.set(
+                primary_pin_key(request.user.pk),
+                True,
+                settings.DATABASE_REPLICA_PIN_SECONDS,
+            )
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        with replica_reads(False):
+            response: HttpResponse = await self.get_response(request)
+        # The user may be loaded lazily from the session.
+        if await sync_to_async(self.writes)(request):
+            await cache.aset(
+                primary_pin_key(request.user.pk),
+                True,
+                settings.DATABASE_REPLICA_PIN_SECONDS,
+            )
+        return response
+
+    @staticmethod
+    def writes(request: HttpRequest) -> bool:
+        """
+        Whether the request of an authenticated user may have written, once
+        the view authenticated it (DRF sets the user of the Django request).
+        """
+        if not settings.DATABASE_REPLICAS or request.method in SAFE_METHODS:
+            return False
+        user = getattr(request, "user", None)
+        return user is not None and user.is_authenticated
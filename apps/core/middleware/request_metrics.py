@@ -0,0 +1,97 @@
+import json
+import logging
+from contextlib import ExitStack
+from typing import Any, Callable
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+
+from apps.core.utils.request_metrics import RequestMetrics, collect_request_metrics
+
+logger = logging.getLogger(__name__)
+
+
+class RequestMetricsMiddleware:
+    """
+    Records the number of SQL queries, the database time, the serializer time
+    and the cache hits of every request.
+
+    The metrics are:
+    - logged as a structured (JSON) record on the `apps.core.middleware.request_metrics`
+      logger, at `WARNING` level when the request made more than
+      `REQUEST_METRICS_QUERY_WARNING` queries, which usually means an N+1;
+    - returned in a `Server-Timing` header when `DEBUG` is on or the user is
+      staff, so that they show up in the browser's developer tools without
+      leaking internals to everybody.
+
+    It should be placed near the top of `MIDDLEWARE` so that the queries of
+    the other middleware (sessions, authentication) are included.
+
+    Under ASGI the database connections belong to the thread running the
+    synchronous code of the request, the wrappers are installed and removed
+    in that thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]) -> None:
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if self.async_mode:
+            return self.__acall__(request)
+
+        with collect_request_metrics() as metrics, self.wrap_connections(metrics):
+            response = self.get_response(request)
+        self.finish(request, response, metrics)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        with collect_request_metrics() as metrics:
+            stack = await sync_to_async(self.wrap_connections)(metrics)
+            try:
+                response: HttpResponse = await self.get_response(request)
+            finally:
+                await sync_to_async(stack.close)()
+        # The user may be loaded lazily by `is_staff`.
+        await sync_to_async(self.finish)(request, response, metrics)
+        return response
+
+    def wrap_connections(self, metrics: RequestMetrics) -> ExitStack:
+        stack = ExitStack()
+        # Creating the wrappers of all aliases does not open connections.
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(metrics))
+        return stack
+
+    def finish(
+        self, request: HttpRequest, response: HttpResponse, metrics: RequestMetrics
+    ) -> None:
+        self.log(request, response, metrics)
+        if settings.DEBUG or getattr(getattr(request, "user", None), "is_staff", False):
+            response["Server-Timing"] = metrics.server_timing()
+
+    def log(
+        self, request: HttpRequest, response: HttpResponse, metrics: RequestMetrics
+    ) -> None:
+        resolver_match = request.resolver_match
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "view": resolver_match.view_name if resolver_match else None,
+            "status": response.status_code,
+            **metrics.as_dict(),
+        }
+        level = (
+            logging.WARNING
+            if metrics.queries > settings.REQUEST_METRICS_QUERY_WARNING
+            else logging.INFO
+        )
+        logger.log(level, json.dumps(record), extra={"request_metrics": record})
@@ -0,0 +1,64 @@
+from contextlib import ExitStack
+from typing import Any, Callable
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+
+from apps.core.utils.slow_queries import SlowQuerySampler
+
+
+class SlowQueryMiddleware:
+    """
+    Samples the slow queries of every request into the slow query log,
+    together with the name of the view which executed them.
+
+    Disabled when `SLOW_QUERY_THRESHOLD_MS` is None. Under ASGI the samplers
+    are installed in the thread running the synchronous code of the request,
+    like the wrappers of `RequestMetricsMiddleware`.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]) -> None:
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if self.async_mode:
+            return self.__acall__(request)
+        if settings.SLOW_QUERY_THRESHOLD_MS is None:
+            return self.get_response(request)
+
+        with self.wrap_connections(request):
+            return self.get_response(request)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        response: HttpResponse
+        if settings.SLOW_QUERY_THRESHOLD_MS is None:
+            response = await self.get_response(request)
+            return response
+
+        stack = await sync_to_async(self.wrap_connections)(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return response
+
+    def wrap_connections(self, request: HttpRequest) -> ExitStack:
+        def view() -> str | None:
+            match = getattr(request, "resolver_match", None)
+            return match.view_name if match else None
+
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(
+                connection.execute_wrapper(SlowQuerySampler(connection, view))
+            )
+        return stack
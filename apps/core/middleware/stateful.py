@@ -0,0 +1,84 @@
+from typing import Any, Callable, Dict, List, Tuple
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from django.utils.module_loading import import_string
+
+
+class StatefulMiddleware:
+    """
+    Runs the session based middleware of `STATEFUL_MIDDLEWARE` (sessions,
+    authentication, messages) only for the routes which use them.
+
+    The API authenticates every request with a JWT, yet these middleware
+    would still attach a session store, a lazy `request.user` and a message
+    storage to every request and inspect them on the way out. Requests under
+    `STATELESS_PATH_PREFIXES` skip them, except those under
+    `STATEFUL_PATH_PREFIXES`: the admin and the dj-rest-auth login, logout
+    and registration, which log into the session.
+
+    The wrapped middleware are chained in their order, with their
+    `process_view` and `process_exception` hooks. Under ASGI they are given
+    the asynchronous `get_response`, so they must support it, as Django's
+    middleware do.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            # Both chains then return coroutines.
+            markcoroutinefunction(self)
+        self.stateless_prefixes = tuple(settings.STATELESS_PATH_PREFIXES)
+        self.stateful_prefixes = tuple(settings.STATEFUL_PATH_PREFIXES)
+        self.middleware: List[Any] = []
+        handler: Callable[[HttpRequest], Any] = get_response
+        for path in reversed(settings.STATEFUL_MIDDLEWARE):
+            handler = import_string(path)(handler)
+            self.middleware.insert(0, handler)
+        self.stateful = handler
+
+    def is_stateless(self, request: HttpRequest) -> bool:
+        path = request.path_info
+        return path.startswith(self.stateless_prefixes) and not path.startswith(
+            self.stateful_prefixes
+        )
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if self.is_stateless(request):
+            return self.get_response(request)
+        return self.stateful(request)
+
+    def process_view(
+        self,
+        request: HttpRequest,
+        view_func: Callable[..., HttpResponse],
+        view_args: Tuple[Any, ...],
+        view_kwargs: Dict[str, Any],
+    ) -> HttpResponse | None:
+        if self.is_stateless(request):
+            return None
+        for middleware in self.middleware:
+            hook = getattr(middleware, "process_view", None)
+            if hook is not None:
+                response = hook(request, view_func, view_args, view_kwargs)
+                if response is not None:
+                    return response  # type: ignore[no-any-return]
+        return None
+
+    def process_exception(
+        self, request: HttpRequest, exception: Exception
+    ) -> HttpResponse | None:
+        if self.is_stateless(request):
+            return None
+        for middleware in reversed(self.middleware):
+            hook = getattr(middleware, "process_exception", None)
+            if hook is not None:
+                response = hook(request, exception)
+                if response is not None:
+                    return response  # type: ignore[no-any-return]
+        return None
@@ -1,6 +1,8 @@
 from .misc import ErrorResponseSerializer, IdNameListSerializer
+from .timing import TimedSerializerMixin
 
 __all__ = [
     "IdNameListSerializer",
     "ErrorResponseSerializer",
+    "TimedSerializerMixin",
 ]
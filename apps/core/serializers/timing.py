@@ -0,0 +1,18 @@
+from typing import Any
+
+from apps.core.utils.request_metrics import serializer_timer
+
+
+class TimedSerializerMixin:
+    """
+    Records the time spent serializing instances in the request metrics
+    (`Server-Timing: serializer`).
+
+    Note that the time includes the queries triggered while serializing, such
+    as deferred fields or relations which were not prefetched, which is where
+    N+1 problems show up.
+    """
+
+    def to_representation(self, instance: Any) -> Any:
+        with serializer_timer():
+            return super().to_representation(instance)  # type: ignore[misc]
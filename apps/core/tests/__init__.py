@@ -0,0 +1,26 @@
+from .async_views_tests import TestAsyncViews
+from .benchmark_tests import TestBenchmark
+from .bloom_filter_tests import TestBloomFilter
+from .connection_pool_tests import TestConnectionPool
+from .disk_cache_tests import TestByteRange, TestDiskLRUCache
+from .lru_cache_tests import TestLRUCache
+from .prometheus_tests import TestPrometheusMetrics
+from .replica_router_tests import TestReplicaRouter
+from .request_metrics_tests import TestRequestMetrics
+from .slow_queries_tests import TestSlowQueries
+from .stateful_middleware_tests import TestStatefulMiddleware
+
+__all__ = [
+    "TestAsyncViews",
+    "TestBenchmark",
+    "TestBloomFilter",
+    "TestByteRange",
+    "TestConnectionPool",
+    "TestDiskLRUCache",
+    "TestLRUCache",
+    "TestPrometheusMetrics",
+    "TestReplicaRouter",
+    "TestRequestMetrics",
+    "TestSlowQueries",
+    "TestStatefulMiddleware",
+]
@@ -0,0 +1,105 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.favorites.models import UserFavoriteProperty
+from apps.properties.models import Property, PropertyStatus, PropertyType
+from apps.properties.services.detail_cache import local_detail_cache
+from apps.users.authentication import token_cache
+
+User = get_user_model()
+
+LOGGER = "apps.core.middleware.request_metrics"
+
+
+class TestAsyncViews(TestCase):
+    """
+    Requests through the ASGI handler, where a synchronous query from the
+    event loop raises `SynchronousOnlyOperation`.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email="async@example.com",
+            password="testpass123",
+            first_name="Async",
+            last_name="User",
+        )
+        cls.property = Property.objects.create(
+            price=100000,
+            price_currency="DKK",
+            area=80,
+            total_area=100,
+            property_type=PropertyType.APARTMENT,
+            status=PropertyStatus.ACTIVE,
+            street_name="Strøget",
+            postal_code="8000",
+            city="Aarhus",
+            country_code="DK",
+        )
+        UserFavoriteProperty.objects.create(user=cls.user, property=cls.property)
+
+    def setUp(self):
+        token_cache().clear()
+        self.addCleanup(token_cache().clear)
+        cache.clear()
+        local_detail_cache().clear()
+        self.headers = {"Authorization": f"Bearer {AccessToken.for_user(self.user)}"}
+
+    async def test_property_list_and_count(self):
+        res = await self.async_client.get(
+            reverse("apps.properties:properties-list"),
+            {"country_code": "DK"},
+            headers=self.headers,
+        )
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([item["id"] for item in res.json()], [self.property.id])
+        self.assertTrue(res.json()[0]["favorite"])
+
+        res = await self.async_client.get(
+            reverse("apps.properties:properties-count"), {"country_code": "DK"}
+        )
+        self.assertEqual(res.json(), {"count": 1})
+
+    async def test_property_search(self):
+        res = await self.async_client.get(
+            reverse("apps.properties:property-search"),
+            {"text": "aar", "country_code": "DK"},
+        )
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["cities"], [{"city": "Aarhus", "count": 1}])
+
+    async def test_favorite_ids(self):
+        url = reverse("apps.favorites:favorite-ids")
+        res = await self.async_client.get(url, headers=self.headers)
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["ids"], [self.property.id])
+
+        res = await self.async_client.get(url)
+        self.assertEqual(res.status_code, 401)
+
+    async def test_synchronous_actions(self):
+        res = await self.async_client.get(
+            reverse("apps.properties:properties-detail", args=[self.property.id])
+        )
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["id"], self.property.id)
+
+    async def test_queries_are_measured(self):
+        with self.assertLogs(LOGGER, "INFO") as logs:
+            await self.async_client.get(
+                reverse("apps.properties:properties-count"), {"country_code": "DK"}
+            )
+
+        record = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(record["view"], "apps.properties:properties-count")
+        self.assertEqual(record["queries"], 1)
@@ -0,0 +1,194 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, TransactionTestCase
+
+from apps.core.utils import QueryRecorder
+from apps.favorites.models import UserFavoriteProperty
+from apps.properties.models import Property
+
+from benchmarks.runner import (
+    ScenarioResult,
+    compare,
+    connection_overhead,
+    favorite_throughput,
+    middleware_overhead,
+    plan_rows_scanned,
+)
+from benchmarks.scenarios import BenchmarkContext
+
+
+def result(**kwargs):
+    values = {
+        "name": "properties-list",
+        "status_code": 200,
+        "p50_ms": 10.0,
+        "p95_ms": 20.0,
+        "queries": 2,
+        "rows_scanned": None,
+    }
+    return ScenarioResult(**{**values, **kwargs})
+
+
+class TestBenchmark(TestCase):
+    baseline = {
+        "dataset": {"vendor": "postgresql"},
+        "tolerance": {"latency": 0.5, "rows_scanned": 0.1},
+        "scenarios": {
+            "properties-count": {"p50_ratio": 1.0, "queries": 1},
+            "properties-list": {"p50_ratio": 4.0, "queries": 2, "rows_scanned": 100},
+        },
+    }
+    # The latency budgets are relative to this scenario.
+    reference = result(name="properties-count", p50_ms=2.5, queries=1)
+
+    def test_query_recorder(self):
+        with QueryRecorder() as recorder:
+            list(Property.objects.all())
+            Property.objects.count()
+
+        self.assertEqual(recorder.count, 2)
+        self.assertIn("SELECT", recorder.queries[0].sql)
+        self.assertEqual(recorder.queries[0].using, "default")
+        self.assertGreaterEqual(recorder.duration, 0)
+
+        # Queries after the block are not recorded.
+        Property.objects.count()
+        self.assertEqual(recorder.count, 2)
+
+    def test_compare_within_budget(self):
+        results = [
+            self.reference,
+            result(p50_ms=14.5, rows_scanned=105),
+            # Scenarios without a baseline are not checked.
+            result(name="new-scenario", queries=100),
+        ]
+        self.assertEqual(compare(results, self.baseline, "postgresql"), [])
+
+        # On a machine twice as slow.
+        results = [
+            result(name="properties-count", p50_ms=5.0, queries=1),
+            result(p50_ms=29.0),
+        ]
+        self.assertEqual(compare(results, self.baseline, "postgresql"), [])
+
+    def test_compare_budgets_exceeded(self):
+        violations = compare(
+            [self.reference, result(queries=3, p50_ms=15.5, rows_scanned=111)],
+            self.baseline,
+            "postgresql",
+        )
+        self.assertEqual(len(violations), 3)
+        self.assertIn("3 queries, budget is 2", violations[0])
+        self.assertIn("p50 15.5ms is 6.20x properties-count", violations[1])
+        self.assertIn("111 rows scanned", violations[2])
+
+        violations = compare(
+            [self.reference, result(status_code=500)], self.baseline, "postgresql"
+        )
+        self.assertEqual(violations, ["properties-list: responded with 500"])
+
+    def test_compare_requires_the_baseline_database(self):
+        violations = compare(
+            [self.reference, result(queries=3, p50_ms=100.0, rows_scanned=1000)],
+            self.baseline,
+            "sqlite",
+        )
+
+        # Only the query count is compared.
+        self.assertEqual(len(violations), 2)
+        self.assertIn("measured on postgresql, not sqlite", violations[0])
+        self.assertIn("3 queries, budget is 2", violations[1])
+
+    def test_plan_rows_scanned(self):
+        plan = {
+            "Node Type": "Nested Loop",
+            "Plans": [
+                {
+                    "Node Type": "Seq Scan",
+                    "Actual Rows": 10,
+                    "Actual Loops": 1,
+                    "Rows Removed by Filter": 90,
+                },
+                {"Node Type": "Index Scan", "Actual Rows": 1, "Actual Loops": 10},
+                {"Node Type": "Hash", "Actual Rows": 1000, "Actual Loops": 1},
+            ],
+        }
+        self.assertEqual(plan_rows_scanned(plan), 110)
+
+    def test_benchmark_command(self):
+        call_command(
+            "generate_synthetic_data", properties=30, users=5, stdout=StringIO()
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            baseline = Path(directory) / "baseline.json"
+            options = {"iterations": 2, "warmup": 0, "baseline": baseline}
+
+            call_command(
+                "benchmark_api", update_baseline=True, stdout=StringIO(), **options
+            )
+            stored = json.loads(baseline.read_text())
+            self.assertEqual(stored["dataset"]["vendor"], "sqlite")
+            self.assertEqual(stored["scenarios"]["properties-count"]["queries"], 1)
+            self.assertEqual(stored["scenarios"]["properties-count"]["p50_ratio"], 1)
+
+            # Latency is too noisy in tests, only check the query budgets.
+            stored["tolerance"]["latency"] = 1000
+            baseline.write_text(json.dumps(stored))
+
+            out = StringIO()
+            call_command(
+                "benchmark_api", scenario=["property-detail"], stdout=out, **options
+            )
+            # The reference scenario always runs.
+            self.assertIn("properties-count", out.getvalue())
+            self.assertIn("property-detail", out.getvalue())
+
+    def test_benchmark_command_without_data(self):
+        with self.assertRaises(CommandError):
+            call_command("benchmark_api", country_code="DK", stdout=StringIO())
+
+    def test_middleware_overhead(self):
+        results = middleware_overhead("/api/v1/properties/", iterations=50)
+        self.assertEqual(set(results), {"full", "lean"})
+
+        out = StringIO()
+        call_command("benchmark_middleware", iterations=50, stdout=out)
+        self.assertIn("us per request on /api/v1/properties/", out.getvalue())
+
+    def test_connection_overhead(self):
+        results = connection_overhead(threads=2, requests=5)
+        # SQLite has no connection pool.
+        self.assertEqual(set(results), {"direct", "persistent"})
+        self.assertGreater(results["direct"]["requests_per_second"], 0)
+
+        out = StringIO()
+        call_command("benchmark_connections", threads=2, requests=5, stdout=out)
+        self.assertIn("no connection pool", out.getvalue())
+
+
+class TestFavoriteThroughput(TransactionTestCase):
+    def test_favorite_throughput(self):
+        call_command(
+            "generate_synthetic_data", properties=30, users=5, stdout=StringIO()
+        )
+        context = BenchmarkContext.from_database("MK")
+        favorites = set(UserFavoriteProperty.objects.values_list("id", flat=True))
+
+        # A single thread, SQLite in memory locks under concurrent writes.
+        result = favorite_throughput(context, threads=1, requests=3)
+
+        self.assertEqual(result["conflicts"], 0)
+        self.assertEqual(result["errors"], 0)
+        self.assertGreater(result["requests_per_second"], 0)
+        # Every favorite added was removed.
+        self.assertEqual(
+            set(UserFavoriteProperty.objects.values_list("id", flat=True)), favorites
+        )
+
+        out = StringIO()
+        call_command("benchmark_favorites", threads=1, requests=2, stdout=out)
+        self.assertIn("req/s", out.getvalue())
@@ -0,0 +1,22 @@
+from django.test import SimpleTestCase
+
+from apps.core.utils import BloomFilter
+
+
+class TestBloomFilter(SimpleTestCase):
+    def test_added_items_are_present(self):
+        bloom = BloomFilter(capacity=1000)
+        items = [f"item-{index}" for index in range(1000)]
+        for item in items:
+            bloom.add(item)
+
+        self.assertTrue(all(item in bloom for item in items))
+        self.assertEqual(bloom.count, 1000)
+
+    def test_false_positive_rate(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for index in range(1000):
+            bloom.add(f"item-{index}")
+
+        false_positives = sum(f"other-{index}" in bloom for index in range(10_000))
+        self.assertLess(false_positives, 200)
@@ -0,0 +1,136 @@
+import threading
+from unittest import mock
+
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import SimpleTestCase
+
+from prometheus_client import REGISTRY
+
+from apps.core.utils import ConnectionPool, PoolTimeout
+from apps.core.utils.prometheus import observe_connection_pools
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+        self.healthy = True
+        self.rollbacks = 0
+
+    def ping(self):
+        if not self.healthy:
+            raise OSError("Lost connection")
+        return True
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+def make_pool(**kwargs):
+    options = {
+        "connect": FakeConnection,
+        "close": FakeConnection.close,
+        "check": FakeConnection.ping,
+        "reset": FakeConnection.rollback,
+        "max_size": 2,
+        "timeout": 0.05,
+        **kwargs,
+    }
+    return ConnectionPool(**options)
+
+
+class TestConnectionPool(SimpleTestCase):
+    def test_released_connections_are_reused(self):
+        pool = make_pool()
+        connection = pool.acquire()
+        pool.release(connection)
+
+        self.assertIs(pool.acquire(), connection)
+        self.assertEqual(connection.rollbacks, 1)
+        stats = pool.get_stats()
+        self.assertEqual((stats["pool_size"], stats["pool_available"]), (1, 0))
+        self.assertEqual(stats["connections_num"], 1)
+
+    def test_broken_connections_are_replaced(self):
+        pool = make_pool()
+        connection = pool.acquire()
+        pool.release(connection)
+        connection.healthy = False
+
+        replacement = pool.acquire()
+
+        self.assertIsNot(replacement, connection)
+        self.assertTrue(connection.closed)
+        self.assertEqual(pool.get_stats()["connections_lost"], 1)
+        self.assertEqual(pool.get_stats()["pool_size"], 1)
+
+    def test_old_connections_are_replaced(self):
+        pool = make_pool(max_lifetime=0)
+        connection = pool.acquire()
+        pool.release(connection)
+
+        self.assertIsNot(pool.acquire(), connection)
+        self.assertTrue(connection.closed)
+
+    def test_full_pool_waits_for_a_release(self):
+        pool = make_pool(max_size=1, timeout=5)
+        connection = pool.acquire()
+        threading.Timer(0.05, pool.release, [connection]).start()
+
+        self.assertIs(pool.acquire(), connection)
+        stats = pool.pop_stats()
+        self.assertEqual(stats["requests_queued"], 1)
+        self.assertGreater(stats["requests_wait_ms"], 0)
+        self.assertEqual(pool.get_stats()["requests_queued"], 0)
+
+    def test_full_pool_times_out(self):
+        pool = make_pool(max_size=1)
+        pool.acquire()
+
+        with self.assertRaises(PoolTimeout):
+            pool.acquire()
+        self.assertEqual(pool.get_stats()["requests_errors"], 1)
+
+    def test_failed_connect_frees_its_slot(self):
+        pool = make_pool(max_size=1, connect=mock.Mock(side_effect=OSError))
+
+        for _ in range(2):
+            with self.assertRaises(OSError):
+                pool.acquire()
+        self.assertEqual(pool.get_stats()["pool_size"], 0)
+
+    def test_close_all(self):
+        pool = make_pool()
+        idle, in_use = pool.acquire(), pool.acquire()
+        pool.release(idle)
+
+        pool.close_all()
+        self.assertTrue(idle.closed)
+        self.assertFalse(in_use.closed)
+
+        # Connections opened before are closed on release.
+        pool.release(in_use)
+        self.assertTrue(in_use.closed)
+        self.assertEqual(pool.get_stats()["pool_size"], 0)
+
+    def test_pool_metrics(self):
+        pool = make_pool(max_size=1)
+        connection = pool.acquire()
+        with self.assertRaises(PoolTimeout):
+            pool.acquire()
+
+        with mock.patch.object(DatabaseWrapper, "pool", pool, create=True):
+            observe_connection_pools(force=True)
+
+        labels = {"alias": "default"}
+        self.assertEqual(
+            REGISTRY.get_sample_value(
+                "db_pool_connections", {**labels, "state": "in_use"}
+            ),
+            1,
+        )
+        errors = REGISTRY.get_sample_value("db_pool_request_errors_total", labels)
+        self.assertGreaterEqual(errors, 1)
+        pool.release(connection)
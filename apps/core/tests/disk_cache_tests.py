@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+
+from django.test import SimpleTestCase
+
+from apps.core.utils import DiskLRUCache, RangeNotSatisfiable, byte_range
+
+
+class TestDiskLRUCache(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+
+    def age(self, cache, key, seconds):
+        mtime = os.path.getmtime(cache.path(key)) - seconds
+        os.utime(cache.path(key), (mtime, mtime))
+
+    def test_get_and_set(self):
+        cache = DiskLRUCache(self.directory, max_bytes=1000)
+        self.assertIsNone(cache.get("missing"))
+
+        cache.set("key", b"data")
+        with cache.get("key") as file:
+            self.assertEqual(file.read(), b"data")
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = DiskLRUCache(self.directory, max_bytes=250, low_water=0.8)
+        for age, key in enumerate(["c", "b", "a"]):
+            cache.set(key, b"x" * 100)
+            self.age(cache, key, 100 - age * 10)
+        # Every entry fit until "a" was written, which evicted the oldest.
+        self.assertIsNone(cache.get("c"))
+
+        # Reading "b" makes "a" the least recently used entry.
+        cache.get("b").close()
+        cache.set("d", b"x" * 100)
+
+        self.assertIsNone(cache.get("a"))
+        for key in ["b", "d"]:
+            cache.get(key).close()
+
+    def test_open_files_survive_eviction(self):
+        cache = DiskLRUCache(self.directory, max_bytes=150)
+        cache.set("a", b"a" * 100)
+        file = cache.get("a")
+        self.age(cache, "a", 100)
+        cache.set("b", b"b" * 100)
+
+        self.assertIsNone(cache.get("a"))
+        with file:
+            self.assertEqual(file.read(), b"a" * 100)
+
+
+class TestByteRange(SimpleTestCase):
+    def test_byte_range(self):
+        for header, expected in [
+            (None, None),
+            ("bytes=0-99", (0, 99)),
+            ("bytes=100-", (100, 999)),
+            ("bytes=-100", (900, 999)),
+            ("bytes=-5000", (0, 999)),
+            ("bytes=900-5000", (900, 999)),
+            # Multiple, reversed and malformed ranges are ignored.
+            ("bytes=0-1,5-6", None),
+            ("bytes=9-1", None),
+            ("items=0-1", None),
+            ("bytes=-", None),
+        ]:
+            with self.subTest(header=header):
+                self.assertEqual(byte_range(header, 1000), expected)
+
+    def test_unsatisfiable_range(self):
+        for header in ["bytes=1000-", "bytes=-0"]:
+            with self.subTest(header=header):
+                with self.assertRaises(RangeNotSatisfiable):
+                    byte_range(header, 1000)
@@ -0,0 +1,36 @@
+import time
+
+from django.test import SimpleTestCase
+
+from apps.core.utils import LRUCache
+
+
+class TestLRUCache(SimpleTestCase):
+    def test_least_recently_used_entries_are_evicted(self):
+        cache: LRUCache[str, int] = LRUCache(max_size=2)
+        expires_at = time.monotonic() + 60
+        cache.set("a", 1, expires_at)
+        cache.set("b", 2, expires_at)
+
+        # Reading "a" makes "b" the least recently used entry.
+        self.assertEqual(cache.get("a"), 1)
+        cache.set("c", 3, expires_at)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.get("a"), cache.get("c")), (1, 3))
+
+    def test_expired_entries_are_missing(self):
+        cache: LRUCache[str, int] = LRUCache(max_size=2)
+        cache.set("a", 1, time.monotonic() - 1)
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+
+    def test_remove_where(self):
+        cache: LRUCache[str, int] = LRUCache(max_size=3)
+        for key, value in [("a", 1), ("b", 2), ("c", 1)]:
+            cache.set(key, value, time.monotonic() + 60)
+
+        self.assertEqual(cache.remove_where(lambda value: value == 1), 2)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.get("b"), 2)
@@ -0,0 +1,78 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from prometheus_client import REGISTRY
+
+from rest_framework.test import APIClient
+
+
+class TestPrometheusMetrics(TestCase):
+    labels = {
+        "view": "apps.properties:properties-count",
+        "method": "GET",
+        "status": "200",
+    }
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def requests_total(self, **labels):
+        return (
+            REGISTRY.get_sample_value("http_requests_total", {**self.labels, **labels})
+            or 0
+        )
+
+    def test_requests_are_recorded_per_view(self):
+        before = self.requests_total()
+        before_bad_request = self.requests_total(status="400")
+
+        url = reverse("apps.properties:properties-count")
+        self.client.get(url, {"country_code": "MK"})
+        self.client.get(url)
+
+        self.assertEqual(self.requests_total(), before + 1)
+        self.assertEqual(self.requests_total(status="400"), before_bad_request + 1)
+        self.assertGreater(
+            REGISTRY.get_sample_value(
+                "http_request_db_queries_count",
+                {"view": "apps.properties:properties-count", "method": "GET"},
+            ),
+            0,
+        )
+
+    def test_unresolved_paths_share_a_label(self):
+        before = self.requests_total(view="<unresolved>", status="404")
+        self.client.get("/api/v1/does-not-exist/1")
+        self.client.get("/api/v1/does-not-exist/2")
+        self.assertEqual(
+            self.requests_total(view="<unresolved>", status="404"), before + 2
+        )
+
+    @override_settings(METRICS_AUTH_TOKEN="", DEBUG=True)
+    def test_metrics_endpoint(self):
+        self.client.get(
+            reverse("apps.properties:properties-count"), {"country_code": "MK"}
+        )
+
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            'http_request_duration_seconds_bucket{le="0.005",method="GET",'
+            'view="apps.properties:properties-count"}',
+            response.content.decode(),
+        )
+
+    @override_settings(METRICS_AUTH_TOKEN="secret")
+    def test_metrics_endpoint_token(self):
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, 401)
+
+        response = self.client.get(
+            reverse("metrics"), HTTP_AUTHORIZATION="Bearer secret"
+        )
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(METRICS_AUTH_TOKEN="", DEBUG=False)
+    def test_metrics_endpoint_without_token(self):
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,194 @@
+import copy
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.core.db.routers import ReplicaRouter, primary_pin_key, replica_reads
+from apps.core.utils import QueryRecorder
+from apps.properties.models import Property, PropertyStatus, PropertyType
+from apps.properties.services.detail_cache import local_detail_cache
+from apps.users.authentication import token_cache
+
+User = get_user_model()
+
+
+def create_replica(alias):
+    """
+    Adds a test database standing for a replica, with the schema of the
+    primary but its own rows, so that the tests tell which database served
+    the reads, unlike a mirror of the primary.
+    """
+    config = copy.deepcopy(connections.settings[DEFAULT_DB_ALIAS])
+    config["TEST"] = {**config["TEST"], "NAME": None, "MIRROR": None}
+    connections.settings[alias] = config
+    return connections[alias].creation.create_test_db(
+        verbosity=0, autoclobber=True, serialize=False
+    )
+
+
+def destroy_replica(alias, name):
+    connections[alias].creation.destroy_test_db(name, verbosity=0)
+    connections[alias].close()
+    del connections[alias]
+    del connections.settings[alias]
+
+
+def create_property(city, using=DEFAULT_DB_ALIAS):
+    return Property.objects.using(using).create(
+        price=100000,
+        price_currency="DKK",
+        area=80,
+        total_area=100,
+        property_type=PropertyType.APARTMENT,
+        status=PropertyStatus.ACTIVE,
+        street_name="Strøget",
+        postal_code="8000",
+        city=city,
+        country_code="DK",
+    )
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class TestReplicaRouter(TestCase):
+    databases = {DEFAULT_DB_ALIAS, "replica"}
+
+    @classmethod
+    def setUpClass(cls):
+        cls.replica_name = create_replica("replica")
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        destroy_replica("replica", cls.replica_name)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email="replica@example.com",
+            password="testpass123",
+            first_name="Replica",
+            last_name="User",
+        )
+        cls.property = create_property("Aarhus")
+        # The replica tells apart its reads by having other rows.
+        create_property("Odense", using="replica")
+        create_property("Odense", using="replica")
+
+    def setUp(self):
+        token_cache().clear()
+        self.addCleanup(token_cache().clear)
+        cache.clear()
+        local_detail_cache().clear()
+        self.router = ReplicaRouter()
+        self.headers = {"Authorization": f"Bearer {AccessToken.for_user(self.user)}"}
+
+    def count(self, **kwargs):
+        res = self.client.get(
+            reverse("apps.properties:properties-count"),
+            {"country_code": "DK"},
+            **kwargs,
+        )
+        self.assertEqual(res.status_code, 200)
+        return res.json()["count"]
+
+    def test_property_reads_use_the_replicas(self):
+        with QueryRecorder() as recorder:
+            res = self.client.get(
+                reverse("apps.properties:properties-list"), {"country_code": "DK"}
+            )
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([result["city"] for result in res.json()], ["Odense"] * 2)
+        self.assertEqual({query.using for query in recorder.queries}, {"replica"})
+
+        with QueryRecorder() as recorder:
+            self.assertEqual(self.count(), 2)
+        self.assertEqual({query.using for query in recorder.queries}, {"replica"})
+
+        with QueryRecorder() as recorder:
+            res = self.client.get(
+                reverse("apps.properties:property-search"),
+                {"text": "ode", "country_code": "DK"},
+            )
+        self.assertEqual(res.status_code, 200)
+        self.assertIn("Odense", str(res.json()))
+        self.assertEqual({query.using for query in recorder.queries}, {"replica"})
+
+        # The scope ends with the request.
+        self.assertIsNone(self.router.db_for_read(Property))
+
+    async def test_asynchronous_reads_use_the_replicas(self):
+        res = await self.async_client.get(
+            reverse("apps.properties:properties-count"), {"country_code": "DK"}
+        )
+
+        self.assertEqual(res.json(), {"count": 2})
+
+    def test_other_reads_use_the_primary(self):
+        urls = [
+            reverse("apps.favorites:favorite-ids"),
+            # Cached, see `PropertyDetailCache`.
+            reverse("apps.properties:properties-detail", args=[self.property.id]),
+        ]
+        for url in urls:
+            with self.subTest(url=url), QueryRecorder() as recorder:
+                res = self.client.get(url, headers=self.headers)
+
+                self.assertEqual(res.status_code, 200)
+                self.assertEqual(
+                    {query.using for query in recorder.queries}, {DEFAULT_DB_ALIAS}
+                )
+
+    def test_writes_pin_the_user_to_the_primary(self):
+        self.assertEqual(self.count(headers=self.headers), 2)
+
+        res = self.client.post(
+            reverse("apps.favorites:favorite-list"),
+            {"property_id": self.property.id},
+            headers=self.headers,
+        )
+
+        self.assertEqual(res.status_code, 201)
+        self.assertTrue(cache.get(primary_pin_key(self.user.pk)))
+        # Without a cookie, e.g. from a mobile app.
+        self.client.cookies.clear()
+        self.assertEqual(self.count(headers=self.headers), 1)
+        # Other users still read the replicas.
+        self.assertEqual(self.count(), 2)
+
+        cache.delete(primary_pin_key(self.user.pk))
+        self.assertEqual(self.count(headers=self.headers), 2)
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas(self):
+        res = self.client.post(
+            reverse("apps.favorites:favorite-list"),
+            {"property_id": self.property.id},
+            headers=self.headers,
+        )
+
+        self.assertEqual(res.status_code, 201)
+        self.assertIsNone(cache.get(primary_pin_key(self.user.pk)))
+        self.assertEqual(self.count(), 1)
+
+    @override_settings(DATABASE_REPLICAS=["replica", "other_replica"])
+    def test_a_scope_reads_a_single_replica(self):
+        with replica_reads():
+            aliases = {self.router.db_for_read(Property) for _ in range(20)}
+        self.assertEqual(len(aliases), 1)
+
+    def test_writes_end_the_replica_reads(self):
+        with replica_reads():
+            self.assertEqual(self.router.db_for_read(Property), "replica")
+            self.assertEqual(self.router.db_for_write(Property), "default")
+            self.assertIsNone(self.router.db_for_read(Property))
+        self.assertIsNone(self.router.db_for_read(Property))
+
+    def test_replicas_are_not_migrated(self):
+        self.assertFalse(self.router.allow_migrate("replica", "properties"))
+        self.assertIsNone(self.router.allow_migrate("default", "properties"))
@@ -0,0 +1,103 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from apps.core.utils import RequestMetrics, record_cache_access, serializer_timer
+from apps.locations.models import City, Country
+from apps.properties.models import Property, PropertyStatus, PropertyType
+
+User = get_user_model()
+
+LOGGER = "apps.core.middleware.request_metrics"
+
+
+class TestRequestMetrics(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user(
+            email="staff@example.com",
+            password="testpass123",
+            first_name="Staff",
+            last_name="User",
+            is_staff=True,
+        )
+        cls.user = User.objects.create_user(
+            email="user@example.com",
+            password="testpass123",
+            first_name="Test",
+            last_name="User",
+        )
+        country = Country.objects.create(name="Denmark", code="DK")
+        City.objects.create(name="Aarhus", slug="aarhus-dk", country=country)
+        for price in (100000, 200000):
+            Property.objects.create(
+                price=price,
+                price_currency="DKK",
+                area=80,
+                total_area=100,
+                property_type=PropertyType.APARTMENT,
+                status=PropertyStatus.ACTIVE,
+                street_name="Strøget",
+                postal_code="8000",
+                city="Aarhus",
+                country_code="DK",
+            )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.list_url = reverse("apps.properties:properties-list")
+
+    def get_logged_metrics(self, url, data=None):
+        with self.assertLogs(LOGGER, "INFO") as logs:
+            response = self.client.get(url, data)
+        return response, json.loads(logs.records[-1].getMessage())
+
+    def test_metrics_are_logged(self):
+        response, record = self.get_logged_metrics(
+            self.list_url, {"country_code": "DK"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(record["view"], "apps.properties:properties-list")
+        self.assertEqual(record["status"], 200)
+        self.assertGreater(record["queries"], 0)
+        self.assertGreater(record["serializer_ms"], 0)
+        self.assertNotIn("Server-Timing", response)
+
+    @override_settings(REQUEST_METRICS_QUERY_WARNING=0)
+    def test_many_queries_are_logged_as_warning(self):
+        with self.assertLogs(LOGGER, "WARNING"):
+            self.client.get(self.list_url, {"country_code": "DK"})
+
+    def test_server_timing_for_staff(self):
+        self.client.force_authenticate(self.staff)
+        response, record = self.get_logged_metrics(
+            self.list_url, {"country_code": "DK"}
+        )
+
+        header = response["Server-Timing"]
+        self.assertIn(f'desc="{record["queries"]} queries"', header)
+        self.assertIn("serializer;dur=", header)
+        self.assertIn("total;dur=", header)
+
+    @override_settings(DEBUG=True)
+    def test_server_timing_in_debug(self):
+        self.client.force_authenticate(self.user)
+        url = reverse("apps.properties:properties-get-create-property-form-data")
+        self.client.get(url, {"country_code": "DK"})
+        response = self.client.get(url, {"country_code": "DK"})
+
+        self.assertIn('cache;desc="1 hits, 0 misses"', response["Server-Timing"])
+
+    def test_recording_outside_requests(self):
+        # Recording without a current request is a no-op.
+        record_cache_access(hit=True)
+        with serializer_timer():
+            pass
+
+        metrics = RequestMetrics()
+        self.assertNotIn("cache", metrics.server_timing())
@@ -0,0 +1,105 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from apps.core.utils import (
+    SlowQueryLog,
+    SlowQuerySampler,
+    fingerprint_sql,
+    slow_query_log,
+)
+from apps.properties.models import Property
+
+User = get_user_model()
+
+
+class TestSlowQueries(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user(
+            email="staff@example.com",
+            password="testpass123",
+            first_name="Staff",
+            last_name="User",
+            is_staff=True,
+        )
+
+    def setUp(self):
+        slow_query_log.clear()
+        self.client = APIClient()
+
+    def test_fingerprint_sql(self):
+        self.assertEqual(
+            fingerprint_sql(
+                "SELECT * FROM t WHERE a = 'x''y' AND b IN (%s, %s,%s)\n  AND c > 10"
+            ),
+            "SELECT * FROM t WHERE a = ? AND b IN (?+) AND c > ?",
+        )
+        self.assertEqual(
+            fingerprint_sql("SELECT id FROM t WHERE id IN (1, 2)"),
+            fingerprint_sql("SELECT id FROM t WHERE id IN (3, 4, 5, 6)"),
+        )
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_SAMPLE_RATE=1)
+    def test_sampler_captures_explain_plan(self):
+        log = SlowQueryLog(size=3)
+        sampler = SlowQuerySampler(connection, view=lambda: "test-view", log=log)
+        with connection.execute_wrapper(sampler):
+            list(Property.objects.filter(country_code="MK"))
+            list(Property.objects.filter(country_code="DK"))
+            Property.objects.filter(country_code="MK").update(city="Skopje")
+
+        samples = log.samples()
+        # The EXPLAIN queries are not sampled themselves.
+        self.assertEqual(len(samples), 3)
+        self.assertEqual(samples[0].fingerprint, samples[1].fingerprint)
+        self.assertEqual(samples[0].params, ("MK",))
+        self.assertEqual(samples[0].view, "test-view")
+        self.assertTrue(samples[0].plan)
+        # Only SELECT queries are explained.
+        self.assertIsNone(samples[2].plan)
+
+        top = log.top(order_by="count")
+        self.assertEqual(top[0]["count"], 2)
+        self.assertEqual(top[0]["views"], ["test-view"])
+        self.assertEqual(top[0]["last"]["params"], ["DK"])
+
+        # The buffer only keeps the latest samples.
+        with connection.execute_wrapper(sampler):
+            Property.objects.count()
+        self.assertEqual(len(log.samples()), 3)
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=60_000)
+    def test_fast_queries_are_not_sampled(self):
+        sampler = SlowQuerySampler(connection, log=slow_query_log)
+        with connection.execute_wrapper(sampler):
+            Property.objects.count()
+        self.assertEqual(slow_query_log.samples(), [])
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_SAMPLE_RATE=1)
+    def test_slow_query_log_api(self):
+        url = reverse("apps.core:slow-queries")
+        self.client.get(
+            reverse("apps.properties:properties-count"), {"country_code": "MK"}
+        )
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 401)
+
+        self.client.force_authenticate(self.staff)
+        response = self.client.get(url, {"order_by": "max_ms"})
+        self.assertEqual(response.status_code, 200)
+        views = {
+            view for result in response.data["results"] for view in result["views"]
+        }
+        self.assertIn("apps.properties:properties-count", views)
+
+        response = self.client.get(url, {"order_by": "sql"})
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(slow_query_log.samples(), [])
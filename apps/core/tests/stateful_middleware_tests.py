@@ -0,0 +1,26 @@
+from django.test import TestCase
+from django.urls import reverse
+
+
+class TestStatefulMiddleware(TestCase):
+    def test_api_routes_skip_the_session(self):
+        res = self.client.get(
+            reverse("apps.properties:properties-count"), {"country_code": "MK"}
+        )
+
+        self.assertEqual(res.status_code, 200)
+        self.assertFalse(hasattr(res.wsgi_request, "session"))
+        self.assertFalse(hasattr(res.wsgi_request, "_messages"))
+
+    def test_admin_uses_the_session(self):
+        res = self.client.get("/api/v1/control-center/")
+
+        self.assertEqual(res.status_code, 302)
+        self.assertTrue(hasattr(res.wsgi_request, "session"))
+        self.assertFalse(res.wsgi_request.user.is_authenticated)
+
+    def test_session_login_routes_use_the_session(self):
+        res = self.client.post(reverse("apps.users:rest_login"), {})
+
+        self.assertEqual(res.status_code, 400)
+        self.assertTrue(hasattr(res.wsgi_request, "session"))
@@ -0,0 +1,9 @@
+from django.urls import path
+
+from apps.core.views import SlowQueryLogAPI
+
+app_name = "apps.core"
+
+urlpatterns = [
+    path("slow-queries", SlowQueryLogAPI.as_view(), name="slow-queries"),
+]
@@ -1,11 +1,61 @@
 from .misc import random_string_generator, set_docstring
+from .bloom import BloomFilter
+from .disk_cache import DiskLRUCache
 from .filters import CharInFilter, CustomFilterSet, NumberInFilter
+from .http import (
+    RangeNotSatisfiable,
+    byte_range,
+    etag_matches,
+    etag_response,
+    file_response,
+    make_etag,
+)
+from .lru import LRUCache
+from .pool import ConnectionPool, PoolTimeout
+from .queries import QueryRecorder, RecordedQuery
+from .request_metrics import (
+    RequestMetrics,
+    collect_request_metrics,
+    current_request_metrics,
+    record_cache_access,
+    serializer_timer,
+)
+from .slow_queries import (
+    SlowQueryLog,
+    SlowQuerySample,
+    SlowQuerySampler,
+    fingerprint_sql,
+    slow_query_log,
+)
 
 
 __all__ = [
+    "BloomFilter",
     "CharInFilter",
+    "ConnectionPool",
     "CustomFilterSet",
+    "DiskLRUCache",
+    "LRUCache",
     "NumberInFilter",
+    "PoolTimeout",
+    "QueryRecorder",
+    "RangeNotSatisfiable",
+    "RecordedQuery",
+    "RequestMetrics",
+    "SlowQueryLog",
+    "SlowQuerySample",
+    "SlowQuerySampler",
+    "byte_range",
+    "collect_request_metrics",
+    "current_request_metrics",
+    "etag_matches",
+    "fingerprint_sql",
+    "etag_response",
+    "file_response",
+    "make_etag",
     "random_string_generator",
+    "record_cache_access",
+    "serializer_timer",
     "set_docstring",
+    "slow_query_log",
 ]
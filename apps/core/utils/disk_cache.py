@@ -0,0 +1,111 @@
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import BinaryIO, List, Tuple
+
+
+class DiskLRUCache:
+    """
+    Cache of byte strings stored as files in a local directory, evicting the
+    least recently used ones once their total size exceeds `max_bytes`.
+
+    Reads bump the modification time of the file, so the recency is shared by
+    every process using the same directory. The total size is tracked per
+    process and only when it exceeds the budget is the directory scanned and
+    the oldest files removed, down to `low_water` of the budget so that the
+    next scan is not triggered by the next write.
+
+    Example:
+    ```
+        cache = DiskLRUCache("/var/cache/images", max_bytes=512 * 1024 * 1024)
+        file = cache.get(key)
+        if file is None:
+            cache.set(key, data)
+    ```
+    """
+
+    def __init__(
+        self, directory: str | Path, max_bytes: int, low_water: float = 0.9
+    ) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.low_water = low_water
+        self._size: int | None = None
+        self._lock = threading.Lock()
+
+    def path(self, key: str) -> Path:
+        return self.directory / key[:2] / key
+
+    def get(self, key: str) -> BinaryIO | None:
+        """
+        Returns the cached file opened for reading, or None on a miss. The open
+        file stays readable if the entry is evicted meanwhile.
+        """
+        path = self.path(key)
+        try:
+            file = open(path, "rb")
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return file
+
+    def set(self, key: str, data: bytes) -> None:
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Written aside and renamed, readers never see a partial file.
+        fd, temporary = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self.entries())
+            else:
+                self._size += len(data)
+            if self._size > self.max_bytes:
+                self._size = self.evict()
+
+    def entries(self) -> List[Tuple[float, int, Path]]:
+        """Returns the (modification time, size, path) of every cached file."""
+        entries: List[Tuple[float, int, Path]] = []
+        if not self.directory.is_dir():
+            return entries
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.startswith(".tmp-"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, Path(entry.path)))
+        return entries
+
+    def evict(self) -> int:
+        """
+        Removes the least recently used files until the total size is below
+        `low_water` of the budget, and returns the remaining size.
+        """
+        entries = sorted(self.entries())
+        size = sum(entry[1] for entry in entries)
+        target = self.max_bytes * self.low_water
+        for _, entry_size, path in entries:
+            if size <= target:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+        return size
@@ -0,0 +1,134 @@
+import hashlib
+import json
+import re
+from typing import Any, BinaryIO, Dict, Tuple
+
+from django.http import FileResponse, HttpRequest, HttpResponse, HttpResponseBase
+from django.utils.http import parse_etags, quote_etag
+
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.status import HTTP_200_OK, HTTP_304_NOT_MODIFIED
+
+
+def make_etag(payload: Any) -> str:
+    """
+    Returns a quoted, strong ETag for a JSON-serializable payload.
+
+    The payload is dumped with sorted keys so that two equal payloads always
+    produce the same ETag, regardless of dict insertion order.
+    """
+    dump = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return quote_etag(hashlib.blake2b(dump.encode(), digest_size=16).hexdigest())
+
+
+def etag_matches(request: HttpRequest | Request, etag: str) -> bool:
+    """
+    Returns True if the request's `If-None-Match` header matches the `etag`.
+
+    Weak validators (`W/"..."`) are compared by their opaque tag, as required
+    for `If-None-Match` by RFC 9110.
+    """
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    etags = parse_etags(header)
+    if "*" in etags:
+        return True
+    return etag.removeprefix("W/") in {tag.removeprefix("W/") for tag in etags}
+
+
+def etag_response(
+    request: Request, data: Any, etag: str | None = None, status: int = HTTP_200_OK
+) -> Response:
+    """
+    Returns a `Response` carrying an `ETag` header for the given `data`.
+
+    If the client already holds the current representation (matching
+    `If-None-Match`), an empty `304 Not Modified` response is returned instead,
+    which saves serializing and transferring the body.
+
+    Args:
+        request: The incoming request.
+        data: The response payload.
+        etag: A precomputed ETag for `data`. Computed with `make_etag` if
+            omitted, so pass it when the payload is served from a cache.
+        status: Status code used when the representation has changed.
+    """
+    etag = etag or make_etag(data)
+    if etag_matches(request, etag):
+        return Response(status=HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return Response(data=data, status=status, headers={"ETag": etag})
+
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def byte_range(header: str | None, size: int) -> Tuple[int, int] | None:
+    """
+    Returns the first and last byte (inclusive) of a `Range` header for a
+    representation of `size` bytes, or None to serve it whole.
+
+    Only single byte ranges are supported, other ranges are ignored, which
+    RFC 9110 allows.
+
+    Raises:
+        RangeNotSatisfiable: If the range starts after the last byte.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if match is None or match.groups() == ("", ""):
+        return None
+    start, end = match.groups()
+    if not start:
+        # A suffix range, the last `end` bytes.
+        length = int(end)
+        if length == 0:
+            raise RangeNotSatisfiable()
+        return max(size - length, 0), size - 1
+    first, last = int(start), int(end) if end else size - 1
+    if first >= size:
+        raise RangeNotSatisfiable()
+    if last < first:
+        return None
+    return first, min(last, size - 1)
+
+
+def file_response(
+    request: HttpRequest,
+    file: BinaryIO,
+    content_type: str,
+    headers: Dict[str, str] | None = None,
+) -> HttpResponseBase:
+    """
+    Returns a response streaming a seekable file, honouring `Range` requests
+    with a `206 Partial Content` response.
+
+    Args:
+        request: The incoming request.
+        file: The file to send, closed once the response is sent.
+        content_type: The `Content-Type` of the file.
+        headers: Extra headers, e.g. caching headers.
+    """
+    headers = {"Accept-Ranges": "bytes", **(headers or {})}
+    size = file.seek(0, 2)
+    file.seek(0)
+    try:
+        requested = byte_range(request.headers.get("Range"), size)
+    except RangeNotSatisfiable:
+        file.close()
+        headers["Content-Range"] = f"bytes */{size}"
+        return HttpResponse(status=416, headers=headers)
+
+    if requested is None:
+        return FileResponse(file, content_type=content_type, headers=headers)
+
+    first, last = requested
+    with file:
+        file.seek(first)
+        content = file.read(last - first + 1)
+    headers["Content-Range"] = f"bytes {first}-{last}/{size}"
+    return HttpResponse(content, status=206, content_type=content_type, headers=headers)
@@ -0,0 +1,67 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """
+    Thread-safe in-memory cache of at most `max_size` entries, evicting the
+    least recently used ones. Every entry has its own expiry time.
+
+    Each worker process has its own cache, invalidations only reach the
+    process they happen in, bound the staleness of the others with the
+    expiry.
+
+    Example:
+    ```
+        cache: LRUCache[str, int] = LRUCache(max_size=1000)
+        cache.set("key", 1, expires_at=time.monotonic() + 60)
+        cache.get("key")
+    ```
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict[K, Tuple[V, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: K, value: V, expires_at: float) -> None:
+        """Caches a value until `expires_at`, a `time.monotonic()` time."""
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def remove_where(self, predicate: Callable[[V], bool]) -> int:
+        """Removes the entries whose value matches, returns their number."""
+        with self._lock:
+            keys = [
+                key for key, (value, _) in self._entries.items() if predicate(value)
+            ]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,200 @@
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Generic, Tuple, TypeVar
+
+C = TypeVar("C")
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool(Generic[C]):
+    """
+    Thread-safe pool of at most `max_size` connections.
+
+    `acquire` returns the most recently released idle connection, which is
+    checked with `check` (returning False or raising when the connection is
+    broken) and replaced when it fails or has lived `max_lifetime` seconds.
+    Without an idle connection, one is opened with `connect` while the pool
+    is below `max_size`, otherwise the caller waits up to `timeout` seconds
+    for a release. `reset` runs on release, e.g. to roll back a transaction,
+    a connection failing it is closed.
+
+    `get_stats` and `pop_stats` return the statistics of the pool, named as
+    those of `psycopg_pool`.
+
+    Example:
+    ```
+        pool = ConnectionPool(connect, close=lambda c: c.close(), max_size=10)
+        connection = pool.acquire()
+        try:
+            ...
+        finally:
+            pool.release(connection)
+    ```
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], C],
+        close: Callable[[C], None],
+        max_size: int = 10,
+        timeout: float = 30.0,
+        max_lifetime: float = 3600.0,
+        check: Callable[[C], bool] | None = None,
+        reset: Callable[[C], None] | None = None,
+    ) -> None:
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self._connect = connect
+        self._close = close
+        self._check = check
+        self._reset = reset
+        self._idle: Deque[Tuple[C, float]] = deque()
+        # Creation times of the open connections by their id.
+        self._created: Dict[int, float] = {}
+        # Open connections and connections being opened.
+        self._size = 0
+        self._waiting = 0
+        self._counters = self._empty_counters()
+        self._condition = threading.Condition()
+
+    @staticmethod
+    def _empty_counters() -> Dict[str, int]:
+        return {
+            "requests_num": 0,
+            "requests_queued": 0,
+            "requests_wait_ms": 0,
+            "requests_errors": 0,
+            "connections_num": 0,
+            "connections_lost": 0,
+        }
+
+    def acquire(self) -> C:
+        deadline = time.monotonic() + self.timeout
+        with self._condition:
+            self._counters["requests_num"] += 1
+        while True:
+            idle = self._take(deadline)
+            if idle is None:
+                return self._open()
+            connection, created_at = idle
+            if time.monotonic() - created_at >= self.max_lifetime:
+                self._discard(connection)
+            elif not self._usable(connection):
+                self._discard(connection, lost=True)
+            else:
+                return connection
+
+    def release(self, connection: C) -> None:
+        try:
+            if self._reset is not None:
+                self._reset(connection)
+        except Exception:
+            self._discard(connection, lost=True)
+            return
+        with self._condition:
+            created_at = self._created.get(id(connection))
+            if created_at is None:
+                # Opened before `close_all`.
+                self._close_quietly(connection)
+                return
+            self._idle.append((connection, created_at))
+            self._condition.notify()
+
+    def close_all(self) -> None:
+        """Closes the idle connections and forgets those in use."""
+        with self._condition:
+            idle = [connection for connection, _ in self._idle]
+            self._idle.clear()
+            self._created.clear()
+            self._size = 0
+            self._condition.notify_all()
+        for connection in idle:
+            self._close_quietly(connection)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._condition:
+            return {
+                "pool_max": self.max_size,
+                "pool_size": self._size,
+                "pool_available": len(self._idle),
+                "requests_waiting": self._waiting,
+                **self._counters,
+            }
+
+    def pop_stats(self) -> Dict[str, int]:
+        """Returns the statistics, then resets the counters."""
+        with self._condition:
+            stats = self.get_stats()
+            self._counters = self._empty_counters()
+            return stats
+
+    def _take(self, deadline: float) -> Tuple[C, float] | None:
+        """
+        Returns the most recent idle connection, or None after reserving a
+        slot for a new one.
+        """
+        with self._condition:
+            queued_at = None
+            while not self._idle and self._size >= self.max_size:
+                remaining = deadline - time.monotonic()
+                if queued_at is None:
+                    queued_at = time.monotonic()
+                    self._counters["requests_queued"] += 1
+                self._waiting += 1
+                try:
+                    released = remaining > 0 and self._condition.wait(remaining)
+                finally:
+                    self._waiting -= 1
+                if not released and not self._idle and self._size >= self.max_size:
+                    self._counters["requests_errors"] += 1
+                    raise PoolTimeout(
+                        f"No connection available after {self.timeout} seconds."
+                    )
+            if queued_at is not None:
+                waited = time.monotonic() - queued_at
+                self._counters["requests_wait_ms"] += round(waited * 1000)
+            if self._idle:
+                return self._idle.pop()
+            self._size += 1
+            return None
+
+    def _open(self) -> C:
+        try:
+            connection = self._connect()
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._created[id(connection)] = time.monotonic()
+            self._counters["connections_num"] += 1
+        return connection
+
+    def _usable(self, connection: C) -> bool:
+        if self._check is None:
+            return True
+        try:
+            return self._check(connection)
+        except Exception:
+            return False
+
+    def _discard(self, connection: C, lost: bool = False) -> None:
+        with self._condition:
+            if self._created.pop(id(connection), None) is not None:
+                self._size -= 1
+            if lost:
+                self._counters["connections_lost"] += 1
+            self._condition.notify()
+        self._close_quietly(connection)
+
+    def _close_quietly(self, connection: C) -> None:
+        try:
+            self._close(connection)
+        except Exception:
+            pass
@@ -0,0 +1,160 @@
+"""
+Prometheus metrics of the API.
+
+With several gunicorn workers, every worker has its own memory, so the
+metrics must be aggregated across processes: when the
+`PROMETHEUS_MULTIPROC_DIR` environment variable is set (before the workers
+start, see `gunicorn.conf.py`), `prometheus_client` stores the values in
+mmap-backed files in that directory and `metrics_registry` collects all of
+them. Without it, e.g. with `runserver`, the values stay in process memory.
+"""
+
+import os
+import threading
+import time
+
+from django.db import connections
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, REGISTRY
+from prometheus_client import multiprocess
+
+# Resolved view names are bounded, unresolved paths are not: they are all
+# reported under this label to keep the number of time series bounded.
+UNRESOLVED_VIEW = "<unresolved>"
+
+KNOWN_METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REQUESTS = Counter(
+    "http_requests",
+    "Number of handled requests.",
+    ["view", "method", "status"],
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time spent handling a request.",
+    ["view", "method"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUEST_DB_TIME = Histogram(
+    "http_request_db_duration_seconds",
+    "Time spent in database queries while handling a request.",
+    ["view", "method"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Number of database queries made while handling a request.",
+    ["view", "method"],
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "Connections of the database connection pools, in use or idle.",
+    ["alias", "state"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_REQUESTS_WAITING = Gauge(
+    "db_pool_requests_waiting",
+    "Requests waiting for a connection of the pool.",
+    ["alias"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_REQUESTS_QUEUED = Counter(
+    "db_pool_requests_queued",
+    "Requests which waited for a connection of the pool.",
+    ["alias"],
+)
+DB_POOL_REQUEST_WAIT_TIME = Counter(
+    "db_pool_request_wait_seconds",
+    "Time spent waiting for a connection of the pool.",
+    ["alias"],
+)
+DB_POOL_REQUEST_ERRORS = Counter(
+    "db_pool_request_errors",
+    "Requests which got no connection of the pool, e.g. timed out.",
+    ["alias"],
+)
+DB_POOL_CONNECTIONS_LOST = Counter(
+    "db_pool_connections_lost",
+    "Connections of the pool found broken by the health checks.",
+    ["alias"],
+)
+
+CACHE_REQUESTS = Counter(
+    "cache_requests",
+    "Lookups of the application caches, by cache, tier and result.",
+    ["cache", "tier", "result"],
+)
+
+# Seconds between two readings of the connection pool statistics.
+POOL_STATS_INTERVAL = 1.0
+
+_pool_stats_lock = threading.Lock()
+_pool_stats_read_at = 0.0
+
+
+def metrics_registry() -> CollectorRegistry:
+    """Returns the registry to expose, aggregating all workers in multiprocess mode."""
+    if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)  # type: ignore[no-untyped-call]
+    return registry
+
+
+def observe_request(
+    view: str | None,
+    method: str,
+    status: int,
+    duration: float,
+    db_time: float | None = None,
+    queries: int | None = None,
+) -> None:
+    """Records a handled request, durations are in seconds."""
+    view = view or UNRESOLVED_VIEW
+    method = method if method in KNOWN_METHODS else "OTHER"
+    REQUESTS.labels(view, method, str(status)).inc()
+    REQUEST_LATENCY.labels(view, method).observe(duration)
+    if db_time is not None:
+        REQUEST_DB_TIME.labels(view, method).observe(db_time)
+    if queries is not None:
+        REQUEST_QUERIES.labels(view, method).observe(queries)
+
+
+def observe_connection_pools(force: bool = False) -> None:
+    """
+    Records the statistics of the database connection pools of the process,
+    at most every `POOL_STATS_INTERVAL` seconds.
+    """
+    global _pool_stats_read_at
+    with _pool_stats_lock:
+        now = time.monotonic()
+        if not force and now - _pool_stats_read_at < POOL_STATS_INTERVAL:
+            return
+        _pool_stats_read_at = now
+
+    for alias in connections:
+        pool = getattr(connections[alias], "pool", None)
+        if pool is None:
+            continue
+        # psycopg's pool omits the zero values.
+        stats = pool.pop_stats()
+        size = stats.get("pool_size", 0)
+        idle = stats.get("pool_available", 0)
+        DB_POOL_CONNECTIONS.labels(alias, "in_use").set(size - idle)
+        DB_POOL_CONNECTIONS.labels(alias, "idle").set(idle)
+        DB_POOL_REQUESTS_WAITING.labels(alias).set(stats.get("requests_waiting", 0))
+        DB_POOL_REQUESTS_QUEUED.labels(alias).inc(stats.get("requests_queued", 0))
+        DB_POOL_REQUEST_WAIT_TIME.labels(alias).inc(
+            stats.get("requests_wait_ms", 0) / 1000
+        )
+        DB_POOL_REQUEST_ERRORS.labels(alias).inc(stats.get("requests_errors", 0))
+        DB_POOL_CONNECTIONS_LOST.labels(alias).inc(stats.get("connections_lost", 0))
+
+
+def observe_cache_access(cache: str, tier: str, hit: bool) -> None:
+    """Records a lookup of a tier (e.g. `local` or `shared`) of a cache."""
+    CACHE_REQUESTS.labels(cache, tier, "hit" if hit else "miss").inc()
@@ -0,0 +1,83 @@
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass
+from types import TracebackType
+from typing import Any, Callable, Dict, List, Type
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+@dataclass
+class RecordedQuery:
+    sql: str
+    params: Any
+    many: bool
+    duration: float
+    using: str = DEFAULT_DB_ALIAS
+
+
+class QueryRecorder:
+    """
+    Context manager recording the SQL queries executed on the connection of
+    the `using` alias, or on every database (e.g. the replicas) by default.
+
+    Unlike `connection.queries`, it works with `DEBUG = False` and records
+    the parameters separately, so queries can be replayed (e.g. with
+    `EXPLAIN`). Durations are in seconds.
+
+    Example:
+    ```
+        with QueryRecorder() as recorder:
+            list(Property.objects.all())
+        recorder.count, recorder.duration
+    ```
+    """
+
+    def __init__(self, using: str | None = None) -> None:
+        self.using = using
+        self.queries: List[RecordedQuery] = []
+
+    def __call__(
+        self,
+        execute: Callable[..., Any],
+        sql: str,
+        params: Any,
+        many: bool,
+        context: Dict[str, Any],
+    ) -> Any:
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(
+                RecordedQuery(
+                    sql,
+                    params,
+                    many,
+                    time.perf_counter() - start,
+                    context["connection"].alias,
+                )
+            )
+
+    def __enter__(self) -> "QueryRecorder":
+        aliases = list(connections) if self.using is None else [self.using]
+        self._wrappers = ExitStack()
+        for alias in aliases:
+            self._wrappers.enter_context(connections[alias].execute_wrapper(self))
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self._wrappers.__exit__(exc_type, exc, traceback)
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def duration(self) -> float:
+        return sum(query.duration for query in self.queries)
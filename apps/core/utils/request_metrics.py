@@ -0,0 +1,119 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List
+
+_current: ContextVar["RequestMetrics | None"] = ContextVar(
+    "request_metrics", default=None
+)
+
+
+@dataclass
+class RequestMetrics:
+    """
+    Metrics collected while handling a single request.
+
+    Durations are in seconds. The instance of the request being handled is
+    available through `current_request_metrics`, so that code deep in the
+    stack (serializers, caches) can record into it without threading it
+    through every call.
+    """
+
+    start: float = field(default_factory=time.perf_counter)
+    queries: int = 0
+    db_time: float = 0.0
+    serializer_time: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    _serializing: bool = field(default=False, repr=False)
+
+    @property
+    def total_time(self) -> float:
+        return time.perf_counter() - self.start
+
+    def __call__(
+        self,
+        execute: Callable[..., Any],
+        sql: str,
+        params: Any,
+        many: bool,
+        context: Dict[str, Any],
+    ) -> Any:
+        """Database execute wrapper, counting and timing the queries."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - start
+
+    def server_timing(self) -> str:
+        """Returns the metrics as a `Server-Timing` header value."""
+        metrics: List[str] = [
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries"',
+            f"serializer;dur={self.serializer_time * 1000:.1f}",
+        ]
+        if self.cache_hits or self.cache_misses:
+            metrics.append(
+                f'cache;desc="{self.cache_hits} hits, {self.cache_misses} misses"'
+            )
+        metrics.append(f"total;dur={self.total_time * 1000:.1f}")
+        return ", ".join(metrics)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "queries": self.queries,
+            "db_ms": round(self.db_time * 1000, 2),
+            "serializer_ms": round(self.serializer_time * 1000, 2),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "total_ms": round(self.total_time * 1000, 2),
+        }
+
+
+def current_request_metrics() -> RequestMetrics | None:
+    """Returns the metrics of the request being handled, None outside requests."""
+    return _current.get()
+
+
+@contextmanager
+def collect_request_metrics() -> Iterator[RequestMetrics]:
+    """Makes a new `RequestMetrics` current for the duration of the block."""
+    metrics = RequestMetrics()
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+
+def record_cache_access(hit: bool) -> None:
+    """Records a cache hit or miss on the current request, if any."""
+    metrics = _current.get()
+    if metrics is None:
+        return
+    if hit:
+        metrics.cache_hits += 1
+    else:
+        metrics.cache_misses += 1
+
+
+@contextmanager
+def serializer_timer() -> Iterator[None]:
+    """
+    Adds the time spent in the block to the serializer time of the current
+    request. Nested blocks (nested serializers) are only counted once.
+    """
+    metrics = _current.get()
+    if metrics is None or metrics._serializing:
+        yield
+        return
+
+    metrics._serializing = True
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.serializer_time += time.perf_counter() - start
+        metrics._serializing = False
@@ -0,0 +1,216 @@
+import hashlib
+import logging
+import random
+import re
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+logger = logging.getLogger(__name__)
+
+# Set while an `EXPLAIN` runs, so that it is not sampled itself.
+_explaining: ContextVar[bool] = ContextVar("slow_query_explaining", default=False)
+
+EXPLAIN_PREFIXES = {
+    "postgresql": "EXPLAIN ",
+    "mysql": "EXPLAIN ",
+    "sqlite": "EXPLAIN QUERY PLAN ",
+}
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|\?")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint_sql(sql: str) -> str:
+    """
+    Normalizes a query so that executions differing only by their parameters
+    share the same fingerprint.
+
+    Literals and placeholders become `?`, `IN` lists of any length become
+    `(?+)`, and whitespace is collapsed.
+    """
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _IN_LIST.sub("(?+)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+@dataclass
+class SlowQuerySample:
+    fingerprint: str
+    sql: str
+    params: Any
+    duration_ms: float
+    view: str | None
+    vendor: str
+    plan: List[str] | None
+    timestamp: float = field(default_factory=time.time)
+
+    @property
+    def fingerprint_id(self) -> str:
+        return hashlib.blake2b(self.fingerprint.encode(), digest_size=8).hexdigest()
+
+
+class SlowQueryLog:
+    """
+    Ring buffer of the last sampled slow queries of this process.
+
+    Each gunicorn worker keeps its own buffer, the oldest samples are dropped
+    once `SLOW_QUERY_LOG_SIZE` is reached. `top` aggregates the buffer by
+    fingerprint to find the worst offenders.
+    """
+
+    def __init__(self, size: int) -> None:
+        self._samples: Deque[SlowQuerySample] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, sample: SlowQuerySample) -> None:
+        with self._lock:
+            self._samples.append(sample)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+    def samples(self) -> List[SlowQuerySample]:
+        with self._lock:
+            return list(self._samples)
+
+    def top(self, limit: int = 20, order_by: str = "total_ms") -> List[Dict[str, Any]]:
+        """
+        Returns the slow query fingerprints ordered by `order_by` (`total_ms`,
+        `max_ms` or `count`), with the most recent sample of each.
+        """
+        groups: Dict[str, Dict[str, Any]] = {}
+        for sample in self.samples():
+            group = groups.setdefault(
+                sample.fingerprint_id,
+                {
+                    "id": sample.fingerprint_id,
+                    "fingerprint": sample.fingerprint,
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "views": set(),
+                },
+            )
+            group["count"] += 1
+            group["total_ms"] += sample.duration_ms
+            group["max_ms"] = max(group["max_ms"], sample.duration_ms)
+            if sample.view:
+                group["views"].add(sample.view)
+            # Samples are in chronological order, keep the latest.
+            group["last"] = {
+                "sql": sample.sql,
+                "params": [str(param) for param in sample.params or []],
+                "duration_ms": sample.duration_ms,
+                "view": sample.view,
+                "vendor": sample.vendor,
+                "plan": sample.plan,
+                "timestamp": sample.timestamp,
+            }
+
+        for group in groups.values():
+            group["total_ms"] = round(group["total_ms"], 2)
+            group["avg_ms"] = round(group["total_ms"] / group["count"], 2)
+            group["views"] = sorted(group["views"])
+        return sorted(groups.values(), key=lambda g: g[order_by], reverse=True)[:limit]
+
+
+slow_query_log = SlowQueryLog(settings.SLOW_QUERY_LOG_SIZE)
+
+
+def explain(connection: BaseDatabaseWrapper, sql: str, params: Any) -> List[str] | None:
+    """
+    Returns the plan of a `SELECT` query as lines of text, None if the backend
+    is not supported, the query is not a `SELECT` or `EXPLAIN` fails.
+    """
+    prefix = EXPLAIN_PREFIXES.get(connection.vendor)
+    if prefix is None or not sql.lstrip().upper().startswith("SELECT"):
+        return None
+    # A failed query leaves PostgreSQL transactions unusable, don't add to it.
+    if connection.needs_rollback:
+        return None
+
+    token = _explaining.set(True)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(prefix + sql, params)
+            return [
+                " ".join(str(column) for column in row) for row in cursor.fetchall()
+            ]
+    except DatabaseError:
+        logger.debug("Could not explain slow query: %s", sql, exc_info=True)
+        return None
+    finally:
+        _explaining.reset(token)
+
+
+class SlowQuerySampler:
+    """
+    Database execute wrapper sampling the queries slower than
+    `SLOW_QUERY_THRESHOLD_MS` into the `slow_query_log`.
+
+    Only a `SLOW_QUERY_SAMPLE_RATE` fraction of the slow queries is sampled,
+    as each sample runs an additional `EXPLAIN`.
+
+    Args:
+        connection: The connection the wrapper is installed on.
+        view: Returns the name of the view executing the queries.
+    """
+
+    def __init__(
+        self,
+        connection: BaseDatabaseWrapper,
+        view: Callable[[], str | None] = lambda: None,
+        log: SlowQueryLog = slow_query_log,
+    ) -> None:
+        self.connection = connection
+        self.view = view
+        self.log = log
+        self.threshold = settings.SLOW_QUERY_THRESHOLD_MS
+        self.sample_rate = settings.SLOW_QUERY_SAMPLE_RATE
+
+    def __call__(
+        self,
+        execute: Callable[..., Any],
+        sql: str,
+        params: Any,
+        many: bool,
+        context: Dict[str, Any],
+    ) -> Any:
+        if _explaining.get():
+            return execute(sql, params, many, context)
+
+        start = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration_ms = (time.perf_counter() - start) * 1000
+
+        if (
+            self.threshold is not None
+            and duration_ms >= self.threshold
+            and random.random() < self.sample_rate
+        ):
+            self.log.add(
+                SlowQuerySample(
+                    fingerprint=fingerprint_sql(sql),
+                    sql=sql,
+                    params=params,
+                    duration_ms=round(duration_ms, 2),
+                    view=self.view(),
+                    vendor=self.connection.vendor,
+                    plan=None if many else explain(self.connection, sql, params),
+                )
+            )
+        return result
@@ -1,3 +1,15 @@
+from .asynchronous import AsyncAPIView, AsyncDispatchMixin, AsyncViewSetMixin
+from .metrics import metrics_view
+from .replicas import ReplicaReadsMixin
+from .slow_queries import SlowQueryLogAPI
 from .viewsets import BaseAPIViewSet
 
-__all__ = ["BaseAPIViewSet"]
+__all__ = [
+    "AsyncAPIView",
+    "AsyncDispatchMixin",
+    "AsyncViewSetMixin",
+    "BaseAPIViewSet",
+    "ReplicaReadsMixin",
+    "SlowQueryLogAPI",
+    "metrics_view",
+]
@@ -0,0 +1,79 @@
+from typing import Any, Callable, TYPE_CHECKING
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+
+from django.http import HttpRequest
+from django.utils.decorators import classonlymethod
+from django.utils.functional import classproperty
+
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+if TYPE_CHECKING:
+    _APIView = APIView
+else:
+    # The mixin must not add `APIView` to the bases of the viewsets, it would
+    # precede `ViewSetMixin` in their MRO.
+    _APIView = object
+
+
+class AsyncDispatchMixin(_APIView):
+    """
+    Dispatches the requests of a DRF view from the event loop, so that under
+    ASGI a request only holds a thread while it runs synchronous code.
+
+    The authentication, permission and throttling checks may query the
+    database, they run in a thread with `sync_to_async`. Coroutine handlers
+    are then awaited and query with the async ORM, synchronous handlers run
+    in a thread, so a view can mix both. Under WSGI Django runs the view
+    with `async_to_sync`.
+
+    Coroutine handlers must not query synchronously: no lazy queryset may be
+    given to a serializer and only `id`, `pk`, `is_staff` and
+    `is_authenticated` of `request.user` are safe to read.
+    """
+
+    async def dispatch(  # type: ignore[override]
+        self, request: HttpRequest, *args: Any, **kwargs: Any
+    ) -> Response:
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            method = (request.method or "").lower()
+            handler: Callable[..., Any] = self.http_method_not_allowed
+            if method in self.http_method_names:
+                handler = getattr(self, method, self.http_method_not_allowed)
+            if iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+            else:
+                response = await sync_to_async(handler)(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+class AsyncAPIView(AsyncDispatchMixin, APIView):
+    """An `APIView` whose handlers may be coroutines, see `AsyncDispatchMixin`."""
+
+    @classproperty
+    def view_is_async(cls) -> bool:
+        return True
+
+
+class AsyncViewSetMixin(AsyncDispatchMixin):
+    """
+    Lets the actions of a viewset be coroutines, see `AsyncDispatchMixin`.
+    It must precede the viewset class in the bases.
+    """
+
+    @classonlymethod
+    def as_view(cls, actions: Any = None, **initkwargs: Any) -> Any:
+        view = super().as_view(actions, **initkwargs)  # type: ignore[call-arg]
+        return markcoroutinefunction(view)
@@ -0,0 +1,32 @@
+import hmac
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from django.views.decorators.http import require_GET
+
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from apps.core.utils.prometheus import metrics_registry
+
+
+@require_GET
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """
+    Exposes the metrics of all workers in the Prometheus text format.
+
+    The scraper must send `METRICS_AUTH_TOKEN` as a bearer token
+    (`Authorization: Bearer <token>`). Without a token the endpoint is only
+    public with `DEBUG`, otherwise it is denied.
+    """
+    token = settings.METRICS_AUTH_TOKEN
+    if not token:
+        if not settings.DEBUG:
+            return HttpResponse(status=403)
+    elif not hmac.compare_digest(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    ):
+        return HttpResponse(status=401)
+
+    return HttpResponse(
+        generate_latest(metrics_registry()), content_type=CONTENT_TYPE_LATEST
+    )
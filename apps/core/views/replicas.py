@@ -0,0 +1,41 @@
+from typing import Any, Collection, TYPE_CHECKING
+
+from django.core.cache import cache
+
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.request import Request
+from rest_framework.views import APIView
+
+from apps.core.db.routers import enable_replica_reads, primary_pin_key
+
+if TYPE_CHECKING:
+    _APIView = APIView
+else:
+    _APIView = object
+
+
+class ReplicaReadsMixin(_APIView):
+    """
+    Reads the data of the safe requests from the replicas of
+    `DATABASE_REPLICAS`, for the actions of `replica_actions` on viewsets.
+
+    The authentication runs on the primary. Users who wrote recently are
+    pinned to the primary by `ReplicaPinningMiddleware`, which must be
+    installed.
+    """
+
+    replica_actions: Collection[str] = ("list", "retrieve")
+
+    def initial(self, request: Request, *args: Any, **kwargs: Any) -> None:
+        super().initial(request, *args, **kwargs)
+        if self.reads_from_replicas(request):
+            enable_replica_reads()
+
+    def reads_from_replicas(self, request: Request) -> bool:
+        if request.method not in SAFE_METHODS:
+            return False
+        user = request.user
+        if user.is_authenticated and cache.get(primary_pin_key(user.pk)):
+            return False
+        action = getattr(self, "action", None)
+        return action is None or action in self.replica_actions
@@ -0,0 +1,73 @@
+from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema
+
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAdminUser
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.core.utils import slow_query_log
+
+ORDER_BY_CHOICES = ["total_ms", "max_ms", "count"]
+
+
+class SlowQueryLogAPI(APIView):
+    """
+    Staff only endpoint listing the top slow query offenders.
+
+    Slow queries are sampled by `SlowQueryMiddleware` into an in-memory ring
+    buffer per worker process, so the response only covers the samples of the
+    worker which handled the request.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        summary="List the slowest queries",
+        description=(
+            "Returns the sampled slow queries grouped by fingerprint, with the "
+            "calling views and the `EXPLAIN` plan of the latest sample."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="limit",
+                description="Number of fingerprints to return (default 20).",
+                required=False,
+                type=int,
+                location=OpenApiParameter.QUERY,
+            ),
+            OpenApiParameter(
+                name="order_by",
+                description="Ordering of the fingerprints.",
+                required=False,
+                type=str,
+                enum=ORDER_BY_CHOICES,
+                location=OpenApiParameter.QUERY,
+            ),
+        ],
+        responses={200: OpenApiResponse(description="The top slow queries")},
+    )
+    def get(self, request: Request) -> Response:
+        order_by = request.query_params.get("order_by", "total_ms")
+        if order_by not in ORDER_BY_CHOICES:
+            raise ValidationError(
+                {"order_by": f"Must be one of {', '.join(ORDER_BY_CHOICES)}."}
+            )
+        try:
+            limit = int(request.query_params.get("limit", 20))
+        except ValueError:
+            raise ValidationError({"limit": "A valid integer is required."})
+
+        return Response(
+            {"results": slow_query_log.top(limit=limit, order_by=order_by)},
+            status=status.HTTP_200_OK,
+        )
+
+    @extend_schema(
+        summary="Clear the slow query log",
+        responses={204: OpenApiResponse(description="The log was cleared")},
+    )
+    def delete(self, request: Request) -> Response:
+        slow_query_log.clear()
+        return Response(status=status.HTTP_204_NO_CONTENT)
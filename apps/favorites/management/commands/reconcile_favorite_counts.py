@@ -0,0 +1,21 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from apps.favorites.services.counts import (
+    favorite_count_buffer,
+    reconcile_favorite_counts,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the favorite count of the properties from their favorites, "
+        "fixing the changes lost by killed workers or deletions bypassing the "
+        "favorites API."
+    )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        favorite_count_buffer().flush()
+        fixed = reconcile_favorite_counts()
+        self.stdout.write(self.style.SUCCESS(f"Fixed {fixed} favorite counts."))
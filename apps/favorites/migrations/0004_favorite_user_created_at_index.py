@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:23
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("favorites", "0003_initial"),
+        ("properties", "0008_property_image_blurhash"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="userfavoriteproperty",
+            index=models.Index(
+                fields=["user", "-created_at"], name="favorites_u_user_id_4543c6_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,28 @@
+from django.db import migrations
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_favorite_counts(apps, schema_editor):
+    Property = apps.get_model("properties", "Property")
+    UserFavoriteProperty = apps.get_model("favorites", "UserFavoriteProperty")
+    favorites = (
+        UserFavoriteProperty.objects.filter(property_id=OuterRef("pk"))
+        .order_by()
+        .values("property_id")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    Property.objects.update(favorite_count=Coalesce(Subquery(favorites), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("favorites", "0004_favorite_user_created_at_index"),
+        ("properties", "0009_property_favorite_count"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_favorite_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:21
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("favorites", "0005_backfill_property_favorite_count"),
+        ("properties", "0010_image_blob_unique_name"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="userfavoriteproperty",
+            name="favorites_u_user_id_4543c6_idx",
+        ),
+        migrations.AddIndex(
+            model_name="userfavoriteproperty",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="favorites_u_user_id_2a9734_idx",
+            ),
+        ),
+    ]
@@ -38,6 +38,10 @@ class UserFavoriteProperty(TimeTracking):
         verbose_name = _("User Favorite Property")
         verbose_name_plural = _("User Favorite Properties")
         ordering = ["-created_at"]
+        indexes = [
+            # Keyset pagination of the favorites of a user, newest first.
+            models.Index(fields=["user", "-created_at", "-id"]),
+        ]
 
     def __str__(self) -> str:
         """
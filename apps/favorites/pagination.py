@@ -0,0 +1,18 @@
+from rest_framework.pagination import CursorPagination
+
+
+class FavoriteCursorPagination(CursorPagination):
+    """
+    Keyset pagination of a user's favorites, newest first.
+
+    Pages are fetched with `created_at < <cursor>` on the
+    `(user, -created_at, -id)` index, so deep pages cost the same as the first
+    one, unlike `OFFSET`. The favorites added together, e.g. by the bulk sync,
+    share their `created_at` and are ordered by id, so that the cursor
+    neither skips nor repeats them.
+    """
+
+    ordering = ("-created_at", "-id")
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
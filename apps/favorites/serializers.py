@@ -1,14 +1,31 @@
+from typing import Any, Dict, List
+
 from rest_framework import serializers
 
-from apps.properties.serializers import PropertySerializer
+from apps.core.serializers import TimedSerializerMixin
+from apps.properties.serializers import PropertyListSerializer
 from apps.properties.models import Property
 
 from .models import UserFavoriteProperty
 
+# Property ids accepted in each list of a bulk update.
+BULK_MAX_IDS = 500
+
+
+class FavoritePropertyCardSerializer(PropertyListSerializer):
+    """The property card of the list, without `favorite` which always holds."""
+
+    class Meta(PropertyListSerializer.Meta):
+        fields = [
+            field for field in PropertyListSerializer.Meta.fields if field != "favorite"
+        ]
 
-class UserFavoritePropertySerializer(serializers.ModelSerializer[UserFavoriteProperty]):
-    # For GET requests (listing favorites), we want to show property details
-    property = PropertySerializer(read_only=True)
+
+class UserFavoritePropertySerializer(
+    TimedSerializerMixin, serializers.ModelSerializer[UserFavoriteProperty]
+):
+    # For GET requests (listing favorites), we show the property card
+    property = FavoritePropertyCardSerializer(read_only=True)
 
     # For POST requests (adding a favorite), we expect a property_id
     # Using PrimaryKeyRelatedField for write-only property ID input
@@ -20,3 +37,42 @@ class UserFavoritePropertySerializer(serializers.ModelSerializer[UserFavoritePro
         model = UserFavoriteProperty
         fields = ["id", "user", "property", "property_id", "created_at", "updated_at"]
         read_only_fields = ["user", "created_at", "updated_at"]
+
+
+class FavoriteBulkSerializer(serializers.Serializer):  # type: ignore[type-arg]
+    """Property ids to add to and remove from the favorites of the user."""
+
+    add = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        max_length=BULK_MAX_IDS,
+        default=list,
+    )
+    remove = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        max_length=BULK_MAX_IDS,
+        default=list,
+    )
+
+    def validate_add(self, add: List[int]) -> List[int]:
+        add = list(dict.fromkeys(add))
+        existing = set(Property.objects.filter(id__in=add).values_list("id", flat=True))
+        missing = [property_id for property_id in add if property_id not in existing]
+        if missing:
+            raise serializers.ValidationError(
+                f"Invalid property ids: {', '.join(map(str, missing))}."
+            )
+        return add
+
+    def validate(self, attrs: Dict[str, Any]) -> Dict[str, Any]:
+        if set(attrs["add"]) & set(attrs["remove"]):
+            raise serializers.ValidationError(
+                "A property cannot be both added and removed."
+            )
+        return attrs
+
+
+class FavoriteIdsSerializer(serializers.Serializer):  # type: ignore[type-arg]
+    ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        help_text="Ids of the favorite properties, in ascending order.",
+    )
@@ -0,0 +1,164 @@
+import atexit
+import logging
+import threading
+from collections import defaultdict
+from typing import Dict
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Case, Count, F, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce, Greatest
+
+from apps.favorites.models import UserFavoriteProperty
+from apps.properties.models import Property
+from apps.properties.services.detail_cache import PropertyDetailCache
+
+logger = logging.getLogger(__name__)
+
+_buffer: "FavoriteCountBuffer | None" = None
+
+
+class FavoriteCountBuffer:
+    """
+    Buffers the changes of `Property.favorite_count` in the process and writes
+    them in batches.
+
+    Updating the count on every favorite would serialise the requests
+    favoriting a popular listing on the lock of its row. The changes are
+    summed per property instead and written with a single `UPDATE` once
+    `max_pending` properties have changes, or `interval` seconds after the
+    first change. Rows are locked in primary key order, so that concurrent
+    flushes of several workers cannot deadlock. With `interval = 0` every
+    change is written immediately, which is what the tests use.
+
+    Changes still buffered when a process is killed are lost, the
+    `reconcile_favorite_counts` command recomputes the counts.
+    """
+
+    def __init__(self, max_pending: int, interval: float) -> None:
+        self.max_pending = max_pending
+        self.interval = interval
+        self._pending: Dict[int, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+
+    def add(self, property_id: int, delta: int) -> None:
+        """
+        Buffers a change, flushing the buffer when it is due. Errors of the
+        flush are logged rather than raised, the favorite having already been
+        committed, and the changes are kept for the next flush.
+        """
+        with self._lock:
+            self._pending[property_id] += delta
+            flush = self.interval <= 0 or len(self._pending) >= self.max_pending
+            if not flush and self._timer is None:
+                self._timer = threading.Timer(self.interval, self.flush_in_thread)
+                self._timer.daemon = True
+                self._timer.start()
+        if flush:
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Could not write the favorite counts")
+
+    def flush(self) -> int:
+        """Writes the buffered changes and returns the number of properties."""
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(int)
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        changes = {pk: delta for pk, delta in pending.items() if delta}
+        if not changes:
+            return 0
+
+        try:
+            with transaction.atomic():
+                locked = list(
+                    Property.objects.filter(pk__in=changes)
+                    .order_by("pk")
+                    .select_for_update()
+                    .values_list("pk", flat=True)
+                )
+                delta = Case(
+                    *[When(pk=pk, then=Value(changes[pk])) for pk in locked],
+                    default=Value(0),
+                )
+                Property.objects.filter(pk__in=locked).update(
+                    favorite_count=Greatest(F("favorite_count") + delta, Value(0))
+                )
+                PropertyDetailCache.invalidate(locked)
+        except Exception:
+            # Kept for the next flush rather than lost.
+            with self._lock:
+                for pk, delta_value in changes.items():
+                    self._pending[pk] += delta_value
+            raise
+        return len(locked)
+
+    def flush_in_thread(self) -> None:
+        """Flushes from the timer thread or at exit, logging the errors."""
+        close_old_connections()
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Could not write the favorite counts")
+        finally:
+            close_old_connections()
+
+
+def favorite_count_buffer() -> FavoriteCountBuffer:
+    """Returns the favorite count buffer of the process, following the settings."""
+    global _buffer
+    max_pending = settings.FAVORITE_COUNT_FLUSH_SIZE
+    interval = settings.FAVORITE_COUNT_FLUSH_SECONDS
+    if _buffer is None or (_buffer.max_pending, _buffer.interval) != (
+        max_pending,
+        interval,
+    ):
+        if _buffer is not None:
+            _buffer.flush()
+        _buffer = FavoriteCountBuffer(max_pending, interval)
+        atexit.register(_buffer.flush_in_thread)
+    return _buffer
+
+
+def count_favorites(changes: Dict[int, int]) -> None:
+    """
+    Buffers changes of the favorite counts by property id, once the current
+    transaction commits.
+    """
+    changes = {pk: delta for pk, delta in changes.items() if delta}
+    if not changes:
+        return
+
+    def buffer() -> None:
+        counts = favorite_count_buffer()
+        for property_id, delta in changes.items():
+            counts.add(property_id, delta)
+
+    transaction.on_commit(buffer)
+
+
+def reconcile_favorite_counts() -> int:
+    """
+    Sets the favorite count of every property to its number of favorites,
+    and returns the number of properties which were off.
+    """
+    favorites = (
+        UserFavoriteProperty.objects.filter(property_id=OuterRef("pk"))
+        .order_by()
+        .values("property_id")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    actual = Coalesce(Subquery(favorites), Value(0))
+    with transaction.atomic():
+        off = list(
+            Property.objects.annotate(actual=actual)
+            .exclude(favorite_count=F("actual"))
+            .values_list("pk", flat=True)
+        )
+        Property.objects.filter(pk__in=off).update(favorite_count=actual)
+        PropertyDetailCache.invalidate(off)
+    return len(off)
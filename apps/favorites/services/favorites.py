@@ -0,0 +1,192 @@
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.core.utils import make_etag
+from apps.favorites.models import UserFavoriteProperty
+from apps.favorites.services.counts import count_favorites
+
+
+class FavoriteProperties:
+    @staticmethod
+    def insert(favorites: List[UserFavoriteProperty]) -> List[UserFavoriteProperty]:
+        """
+        Inserts favorites, skipping those which already exist, and returns the
+        inserted ones with their primary key.
+
+        A single statement both inserts and skips the duplicates, so two
+        concurrent requests cannot both pass a check and then collide on the
+        unique constraint: `INSERT ... ON CONFLICT DO NOTHING RETURNING` on
+        PostgreSQL and SQLite, `INSERT IGNORE` on MySQL, which returns no
+        rows, see `_inserted_on_mysql`.
+        """
+        if not favorites:
+            return []
+        now = timezone.now()
+        for favorite in favorites:
+            favorite.created_at = favorite.updated_at = now
+
+        opts = UserFavoriteProperty._meta
+        quote = connection.ops.quote_name
+        fields = [field for field in opts.concrete_fields if not field.primary_key]
+        unique = [
+            field.column for field in fields if field.name in ("user", "property")
+        ]
+        row = "({})".format(", ".join(["%s"] * len(fields)))
+        insert = "INSERT {ignore}INTO {table} ({columns}) VALUES {values}".format(
+            ignore="IGNORE " if connection.vendor == "mysql" else "",
+            table=quote(opts.db_table),
+            columns=", ".join(quote(field.column) for field in fields),
+            values=", ".join([row] * len(favorites)),
+        )
+        params = [
+            field.get_db_prep_save(getattr(favorite, field.attname), connection)
+            for favorite in favorites
+            for field in fields
+        ]
+        with connection.cursor() as cursor:
+            if connection.vendor == "mysql":
+                cursor.execute(insert, params)
+                rows = FavoriteProperties._inserted_on_mysql(
+                    favorites, cursor.rowcount, cursor.lastrowid, now
+                )
+            else:
+                cursor.execute(
+                    "{insert} ON CONFLICT ({unique}) DO NOTHING "
+                    "RETURNING {returning}".format(
+                        insert=insert,
+                        unique=", ".join(map(quote, unique)),
+                        returning=", ".join(map(quote, [opts.pk.column, *unique])),
+                    ),
+                    params,
+                )
+                rows = cursor.fetchall()
+
+        by_key = {
+            (favorite.user_id, favorite.property_id): favorite for favorite in favorites
+        }
+        inserted = []
+        for pk, user_id, property_id in rows:
+            favorite = by_key[(user_id, property_id)]
+            favorite.pk = pk
+            favorite._state.adding = False
+            inserted.append(favorite)
+        return inserted
+
+    @staticmethod
+    def _inserted_on_mysql(
+        favorites: List[UserFavoriteProperty],
+        rowcount: int,
+        lastrowid: int,
+        created_at: datetime,
+    ) -> List[Tuple[int, int, int]]:
+        """
+        Returns the primary key, user and property of the favorites inserted
+        by an `INSERT IGNORE`.
+
+        The row count tells how many were inserted. A single favorite gets the
+        last inserted id, those of several ones are read back in one query by
+        their creation time, the auto-increment ids of a multi-row insert not
+        being consecutive with the interleaved lock mode.
+        """
+        if rowcount <= 0:
+            return []
+        if len(favorites) == 1:
+            favorite = favorites[0]
+            return [(lastrowid, favorite.user_id, favorite.property_id)]
+        return list(
+            UserFavoriteProperty.objects.filter(
+                user_id__in={favorite.user_id for favorite in favorites},
+                property_id__in=[favorite.property_id for favorite in favorites],
+                created_at=created_at,
+            ).values_list("pk", "user_id", "property_id")
+        )
+
+    @staticmethod
+    def add(user_id: int, property_id: int) -> UserFavoriteProperty | None:
+        """
+        Adds a property to the favorites of the user, or returns None if it is
+        already one of them.
+        """
+        inserted = FavoriteProperties.insert(
+            [UserFavoriteProperty(user_id=user_id, property_id=property_id)]
+        )
+        if not inserted:
+            return None
+        count_favorites({property_id: 1})
+        return inserted[0]
+
+    @staticmethod
+    def remove(favorite: UserFavoriteProperty) -> bool:
+        """
+        Deletes a favorite, returns False if it was already deleted (by a
+        concurrent request).
+        """
+        deleted, _ = favorite.delete()
+        if deleted:
+            count_favorites({favorite.property_id: -1})
+        return bool(deleted)
+
+    @staticmethod
+    def ids(user_id: int) -> Tuple[List[int], str]:
+        """
+        Returns the ids of the properties favorited by the user, in ascending
+        order, together with their ETag.
+        """
+        ids = list(
+            UserFavoriteProperty.objects.filter(user_id=user_id)
+            .order_by("property_id")
+            .values_list("property_id", flat=True)
+        )
+        return ids, make_etag(ids)
+
+    @staticmethod
+    async def aids(user_id: int) -> Tuple[List[int], str]:
+        """`ids` with the async ORM."""
+        ids = [
+            property_id
+            async for property_id in UserFavoriteProperty.objects.filter(
+                user_id=user_id
+            )
+            .order_by("property_id")
+            .values_list("property_id", flat=True)
+        ]
+        return ids, make_etag(ids)
+
+    @staticmethod
+    @transaction.atomic
+    def bulk_update(user_id: int, add: List[int], remove: List[int]) -> None:
+        """
+        Adds and removes favorites of the user.
+
+        Properties already favorited are skipped by the database, so that
+        concurrent syncs of the same state do not fail. Only the favorites
+        actually inserted or deleted change the favorite counts. The property
+        ids must exist.
+        """
+        changes: Dict[int, int] = {}
+        inserted = FavoriteProperties.insert(
+            [
+                UserFavoriteProperty(user_id=user_id, property_id=property_id)
+                for property_id in add
+            ]
+        )
+        for favorite in inserted:
+            changes[favorite.property_id] = 1
+        if remove:
+            # Locked first, a favorite deleted by a concurrent request is
+            # skipped rather than counted twice.
+            favorites = dict(
+                UserFavoriteProperty.objects.filter(
+                    user_id=user_id, property_id__in=remove
+                )
+                .order_by("pk")
+                .select_for_update()
+                .values_list("pk", "property_id")
+            )
+            UserFavoriteProperty.objects.filter(pk__in=favorites).delete()
+            for property_id in favorites.values():
+                changes[property_id] = -1
+        count_favorites(changes)
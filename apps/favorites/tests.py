@@ -1,11 +1,24 @@
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from typing import Tuple
+from unittest import mock
+
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.management import call_command
+from django.db import DatabaseError, connection, connections
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from rest_framework.test import APIClient, APIRequestFactory
 
+from rest_framework_simplejwt.tokens import AccessToken
+
 from apps.favorites.models import UserFavoriteProperty
+from apps.favorites.services.counts import FavoriteCountBuffer, favorite_count_buffer
+from apps.properties.models import PropertyImage
 from apps.properties.models.property import Property, PropertyStatus, PropertyType
+from apps.users.authentication import token_cache
 
 UserModel = get_user_model()
 
@@ -70,6 +83,29 @@ class TestUserFavoritePropertiesAPI(TestCase):
         self.assertEqual(res.json()["property"]["id"], property_instance.id)
         self.assertEqual(res.json()["user"], self.user.id)
 
+    def test_favorite_writes_do_not_load_the_user(self) -> None:
+        token_cache().clear()
+        self.addCleanup(token_cache().clear)
+        property_instance = self.create_property()
+        headers = {"Authorization": f"Bearer {AccessToken.for_user(self.user)}"}
+        # Caches the token.
+        self.client.get(reverse("apps.favorites:favorite-ids"), headers=headers)
+
+        users = UserModel._meta.db_table
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.post(
+                self.list_url,
+                data={"property_id": property_instance.id},
+                format="json",
+                headers=headers,
+            )
+            self.assertEqual(res.status_code, 201)
+            res = self.client.delete(
+                reverse(self.detail_url, args=[res.json()["id"]]), headers=headers
+            )
+            self.assertEqual(res.status_code, 204)
+        self.assertFalse([q for q in queries if users in q["sql"]])
+
     def test_create_duplicate_favorite(self) -> None:
         self.client.force_authenticate(user=self.user)
         property_instance = self.create_property()
@@ -118,12 +154,60 @@ class TestUserFavoritePropertiesAPI(TestCase):
 
         res = self.client.get(self.list_url)
         self.assertEqual(res.status_code, 200)
-        self.assertEqual(len(res.json()), 2)
+        self.assertEqual(len(res.json()["results"]), 2)
         # Check if the properties are in the response by their IDs
-        res_property_ids = {item["property"]["id"] for item in res.json()}
+        res_property_ids = {item["property"]["id"] for item in res.json()["results"]}
         self.assertIn(property1.id, res_property_ids)
         self.assertIn(property2.id, res_property_ids)
 
+    def test_list_favorites_pages(self) -> None:
+        self.client.force_authenticate(user=self.user)
+        properties = [self.create_property() for _ in range(5)]
+        for property_instance in properties:
+            favorite = UserFavoriteProperty.objects.create(
+                user=self.user, property=property_instance
+            )
+            PropertyImage.objects.create(
+                property=property_instance, image=f"media/{favorite.id}.jpg"
+            )
+
+        ids = []
+        url = f"{self.list_url}?page_size=2"
+        while url:
+            # The favorites with their properties, and the images.
+            with self.assertNumQueries(2):
+                res = self.client.get(url)
+            self.assertEqual(res.status_code, 200)
+            ids += [item["property"]["id"] for item in res.json()["results"]]
+            url = res.json()["next"]
+
+        # Newest first.
+        self.assertEqual(ids, [p.id for p in reversed(properties)])
+        card = res.json()["results"][0]["property"]
+        self.assertIn("image", card)
+        self.assertNotIn("favorite", card)
+
+    def test_list_favorites_pages_with_the_same_time(self) -> None:
+        self.client.force_authenticate(user=self.user)
+        # As added by the bulk sync.
+        favorites = UserFavoriteProperty.objects.bulk_create(
+            [
+                UserFavoriteProperty(user=self.user, property=self.create_property())
+                for _ in range(5)
+            ]
+        )
+        UserFavoriteProperty.objects.update(created_at=favorites[0].created_at)
+
+        ids = []
+        url = f"{self.list_url}?page_size=2"
+        while url:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, 200)
+            ids += [item["id"] for item in res.json()["results"]]
+            url = res.json()["next"]
+
+        self.assertEqual(ids, sorted((f.id for f in favorites), reverse=True))
+
     def test_list_favorites_unauthenticated(self) -> None:
         """
         Test that an unauthenticated user cannot list favorites.
@@ -275,9 +359,259 @@ class TestUserFavoritePropertiesAPI(TestCase):
         res = self.client.delete(detail_url)
         self.assertEqual(res.status_code, 404)
 
+    def test_favorite_ids(self) -> None:
+        self.client.force_authenticate(user=self.user)
+        first, second, _ = [self.create_property() for _ in range(3)]
+        UserFavoriteProperty.objects.create(user=self.user, property=second)
+        UserFavoriteProperty.objects.create(user=self.user, property=first)
+        ids_url = reverse("apps.favorites:favorite-ids")
+
+        with self.assertNumQueries(1):
+            res = self.client.get(ids_url)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json(), {"ids": [first.id, second.id]})
+
+        res = self.client.get(ids_url, headers={"If-None-Match": res["ETag"]})
+        self.assertEqual(res.status_code, 304)
+
+    def test_favorite_ids_unauthenticated(self) -> None:
+        res = self.client.get(reverse("apps.favorites:favorite-ids"))
+        self.assertEqual(res.status_code, 401)
+
+    def test_bulk_favorites(self) -> None:
+        self.client.force_authenticate(user=self.user)
+        first, second, third = [self.create_property() for _ in range(3)]
+        UserFavoriteProperty.objects.create(user=self.user, property=first)
+        etag = self.client.get(reverse("apps.favorites:favorite-ids"))["ETag"]
+        bulk_url = reverse("apps.favorites:favorite-bulk")
+
+        # Validating the ids, inserting, locking and deleting in a savepoint,
+        # reading the new state.
+        with self.assertNumQueries(7):
+            res = self.client.post(
+                bulk_url,
+                {"add": [second.id, third.id, second.id], "remove": [first.id]},
+                format="json",
+            )
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json(), {"ids": [second.id, third.id]})
+        self.assertNotEqual(res["ETag"], etag)
+        self.assertEqual(
+            set(
+                UserFavoriteProperty.objects.filter(user=self.user).values_list(
+                    "property_id", flat=True
+                )
+            ),
+            {second.id, third.id},
+        )
+
+        # Adding favorites again and removing missing ones has no effect.
+        res = self.client.post(
+            bulk_url, {"add": [second.id], "remove": [first.id]}, format="json"
+        )
+        self.assertEqual(res.json(), {"ids": [second.id, third.id]})
+
+    def test_bulk_favorites_invalid(self) -> None:
+        self.client.force_authenticate(user=self.user)
+        property_instance = self.create_property()
+        bulk_url = reverse("apps.favorites:favorite-bulk")
+
+        res = self.client.post(bulk_url, {"add": [99999]}, format="json")
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(res.json(), {"add": ["Invalid property ids: 99999."]})
+
+        res = self.client.post(
+            bulk_url,
+            {"add": [property_instance.id], "remove": [property_instance.id]},
+            format="json",
+        )
+        self.assertEqual(res.status_code, 400)
+        self.assertFalse(UserFavoriteProperty.objects.exists())
+
+    @override_settings(FAVORITE_COUNT_FLUSH_SECONDS=0)
+    def test_favorite_count(self) -> None:
+        self.client.force_authenticate(user=self.user)
+        first, second = self.create_property(), self.create_property()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(
+                self.list_url, data={"property_id": first.id}, format="json"
+            )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                self.list_url, data={"property_id": first.id}, format="json"
+            )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("apps.favorites:favorite-bulk"),
+                {"add": [first.id, second.id]},
+                format="json",
+            )
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual((first.favorite_count, second.favorite_count), (1, 1))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(
+                reverse(self.detail_url, kwargs={"pk": res.json()["id"]})
+            )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("apps.favorites:favorite-bulk"),
+                {"remove": [first.id, second.id]},
+                format="json",
+            )
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual((first.favorite_count, second.favorite_count), (0, 0))
+
+    def test_favorite_count_buffer(self) -> None:
+        first, second = self.create_property(), self.create_property()
+        counts = FavoriteCountBuffer(max_pending=3, interval=60)
+
+        counts.add(first.id, 1)
+        counts.add(second.id, 1)
+        counts.add(first.id, 1)
+        self.assertEqual(
+            set(Property.objects.values_list("favorite_count", flat=True)), {0}
+        )
+
+        # Locking the rows and a single update, in a savepoint.
+        with self.assertNumQueries(4):
+            self.assertEqual(counts.flush(), 2)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual((first.favorite_count, second.favorite_count), (2, 1))
+
+        # Counts never go below zero, and are written once enough properties
+        # have changes.
+        counts.add(second.id, -2)
+        counts.add(first.id, -1)
+        counts.add(self.create_property().id, 1)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual((first.favorite_count, second.favorite_count), (1, 0))
+        self.assertEqual(counts.flush(), 0)
+
+    def test_favorite_count_buffer_errors(self) -> None:
+        property = self.create_property()
+        counts = FavoriteCountBuffer(max_pending=1, interval=60)
+
+        with mock.patch.object(
+            Property.objects, "filter", side_effect=DatabaseError
+        ), self.assertLogs("apps.favorites.services.counts", "ERROR"):
+            counts.add(property.id, 1)
+
+        # Kept for the next flush.
+        self.assertEqual(counts.flush(), 1)
+        property.refresh_from_db()
+        self.assertEqual(property.favorite_count, 1)
+
+    def test_reconcile_favorite_counts(self) -> None:
+        first, second = self.create_property(), self.create_property()
+        UserFavoriteProperty.objects.create(user=self.user, property=first)
+        Property.objects.filter(pk=second.pk).update(favorite_count=3)
+
+        out = StringIO()
+        call_command("reconcile_favorite_counts", stdout=out)
+
+        self.assertIn("Fixed 2 favorite counts.", out.getvalue())
+        self.assertEqual(
+            dict(Property.objects.values_list("id", "favorite_count")),
+            {first.id: 1, second.id: 0},
+        )
+
+    def test_order_properties_by_favorite_count(self) -> None:
+        first, second = self.create_property(), self.create_property()
+        Property.objects.filter(pk=second.pk).update(favorite_count=5)
+
+        res = self.client.get(
+            reverse("apps.properties:properties-list"),
+            {"country_code": "MK", "ordering": "-favorite_count"},
+        )
+
+        self.assertEqual(res.status_code, 200)
+        results = res.json()
+        self.assertEqual([result["id"] for result in results], [second.id, first.id])
+        self.assertEqual(results[0]["favorite_count"], 5)
+
     def tearDown(self) -> None:
         return super().tearDown()
 
     @classmethod
     def tearDownClass(cls):
         super().tearDownClass()
+
+
+class TestConcurrentFavorites(TransactionTestCase):
+    """
+    Concurrent requests favoriting the same properties, each thread with its
+    own database connection.
+    """
+
+    workers = 8
+    attempts = 4
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.list_url = reverse("apps.favorites:favorite-list")
+        self.user = UserModel.objects.create_user(
+            username="concurrent",
+            email="concurrent@example.com",
+            password="testpass123",
+            first_name="Test",
+            last_name="Test",
+            agreed_to_terms=True,
+        )
+        self.properties = [
+            Property.objects.create(
+                price="50000",
+                area=110.0,
+                total_area=130.0,
+                total_rooms=4.0,
+                street_name="Maršal Tito",
+                city="Kičevo",
+                postal_code="6250",
+                country_code="MK",
+                status=PropertyStatus.ACTIVE,
+                property_type=PropertyType.APARTMENT,
+            )
+            for _ in range(2)
+        ]
+
+    def favorite(self, property_id: int) -> Tuple[int, int]:
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        try:
+            res = client.post(
+                self.list_url, data={"property_id": property_id}, format="json"
+            )
+            return property_id, res.status_code
+        finally:
+            connections.close_all()
+
+    def test_concurrent_duplicate_favorites(self) -> None:
+        property_ids = [
+            property_instance.id
+            for property_instance in self.properties
+            for _ in range(self.workers * self.attempts)
+        ]
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = list(executor.map(self.favorite, property_ids))
+
+        for property_instance in self.properties:
+            statuses = sorted(
+                status
+                for property_id, status in results
+                if property_id == property_instance.id
+            )
+            self.assertEqual(statuses, [201] + [409] * (len(statuses) - 1))
+        self.assertEqual(
+            UserFavoriteProperty.objects.filter(user=self.user).count(),
+            len(self.properties),
+        )
+        favorite_count_buffer().flush()
+        self.assertEqual(
+            set(Property.objects.values_list("favorite_count", flat=True)), {1}
+        )
@@ -2,12 +2,14 @@
 import logging
 from typing import Any, TYPE_CHECKING, cast
 
+from django.db.models import Prefetch
 from django.db.models.query import QuerySet
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _  # For i18n
 
 from drf_spectacular.utils import OpenApiExample, OpenApiResponse, extend_schema
 
+from rest_framework.decorators import action
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
@@ -15,17 +17,28 @@ from rest_framework.response import Response
 from rest_framework.serializers import BaseSerializer
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.status import (
+    HTTP_200_OK,
     HTTP_201_CREATED,
+    HTTP_304_NOT_MODIFIED,
     HTTP_400_BAD_REQUEST,
     HTTP_401_UNAUTHORIZED,
     HTTP_404_NOT_FOUND,
     HTTP_409_CONFLICT,
 )
 
+from apps.core.utils import etag_response
+from apps.core.views import AsyncViewSetMixin
 from apps.properties.models import Property
+from apps.properties.querysets import property_card_images
 from apps.favorites.models import UserFavoriteProperty
+from apps.favorites.services.favorites import FavoriteProperties
 
-from .serializers import UserFavoritePropertySerializer
+from .pagination import FavoriteCursorPagination
+from .serializers import (
+    FavoriteBulkSerializer,
+    FavoriteIdsSerializer,
+    UserFavoritePropertySerializer,
+)
 from .exceptions import DuplicateFavoriteError
 
 logger = logging.getLogger(__name__)
@@ -40,26 +53,40 @@ else:
     CustomUserType = User
 
 
-class UserFavoritePropertyViewSet(ModelViewSet[UserFavoriteProperty]):
+class UserFavoritePropertyViewSet(
+    AsyncViewSetMixin, ModelViewSet[UserFavoriteProperty]
+):
     """
     ViewSet for managing user favorite properties.
 
     Provides actions to list, add, and remove properties from a user's favorites.
+    The `ids` action, requested on every page displaying properties, is
+    asynchronous.
     """
 
     serializer_class = UserFavoritePropertySerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = FavoriteCursorPagination
     queryset = UserFavoriteProperty.objects.all()
 
     def get_queryset(self) -> QuerySet[UserFavoriteProperty]:
         """
         Returns the queryset of favorite properties for the authenticated user.
+
+        The properties are joined and their images prefetched in one query, so
+        a page of favorites always takes two queries. The ordering is set by
+        `FavoriteCursorPagination`.
         """
         user = cast(CustomUserType, self.request.user)
         return (
-            UserFavoriteProperty.objects.filter(user=user)
+            UserFavoriteProperty.objects.filter(user_id=user.id)
             .select_related("property")
-            .order_by("created_at")
+            .prefetch_related(
+                Prefetch(
+                    "property__property_images",
+                    queryset=property_card_images(),
+                )
+            )
         )
 
     @extend_schema(
@@ -125,27 +152,27 @@ class UserFavoritePropertyViewSet(ModelViewSet[UserFavoriteProperty]):
         """
         Performs the creation of a new UserFavoriteProperty instance.
 
-        Checks for duplicates before saving.
+        The favorite is inserted with a single statement which also detects
+        duplicates, including concurrent double taps.
         """
         favourite_serializer = cast(UserFavoritePropertySerializer, serializer)
         property_instance: Property = favourite_serializer.validated_data["property"]
         user: CustomUserType = cast(CustomUserType, self.request.user)
 
-        if UserFavoriteProperty.objects.filter(
-            user=user, property=property_instance
-        ).exists():
+        favorite = FavoriteProperties.add(user.id, property_instance.id)
+        if favorite is None:
             logger.info(
-                f"User {user.username} tried to favorite property "
+                f"User {user.id} tried to favorite property "
                 f"{property_instance.id} which is already favorited."
             )
             raise DuplicateFavoriteError(
                 detail=_("This property is already in your favorites.")
             )
 
-        # Only save if it's NOT a duplicate
-        favourite_serializer.save(user=user)
+        favorite.property = property_instance
+        favourite_serializer.instance = favorite
         logger.info(
-            f"User {user.username} successfully favorited property "
+            f"User {user.id} successfully favorited property "
             f"{property_instance.id}."
         )
 
@@ -181,10 +208,10 @@ class UserFavoritePropertyViewSet(ModelViewSet[UserFavoriteProperty]):
         Ensures only the owner can delete their favorite.
         """
         user: CustomUserType = cast(CustomUserType, self.request.user)
-        if instance.user != user:
+        if instance.user_id != user.id:
             logger.warning(
-                f"User {user.username} attempted to delete "
-                f"favorite {instance.id} owned by {instance.user.username}."
+                f"User {user.id} attempted to delete "
+                f"favorite {instance.id} owned by user {instance.user_id}."
             )
             # DRF's default permission_classes usually handle this,
             # but an explicit check within perform_destroy is also valid.
@@ -192,8 +219,61 @@ class UserFavoritePropertyViewSet(ModelViewSet[UserFavoriteProperty]):
             raise PermissionDenied(
                 detail=_("You do not have permission to delete this favorite.")
             )
-        instance.delete()
+        FavoriteProperties.remove(instance)
         logger.info(
-            f"User {user.username} successfully removed favorite "
-            f"{instance.id} (property {instance.property.id})."
+            f"User {user.id} successfully removed favorite "
+            f"{instance.id} (property {instance.property_id})."
+        )
+
+    # The stubs of `action` only accept synchronous views.
+    @extend_schema(  # type: ignore[type-var]
+        summary=_("List the ids of the user's favorite properties"),
+        description=_(
+            "Returns only the ids of the properties favorited by the "
+            "authenticated user, to mark the favorites among the properties "
+            "displayed. The response carries an `ETag`, send it back in "
+            "`If-None-Match` to get an empty `304 Not Modified` response while "
+            "the favorites are unchanged."
+        ),
+        responses={
+            HTTP_200_OK: FavoriteIdsSerializer,
+            HTTP_304_NOT_MODIFIED: OpenApiResponse(
+                description=_("The client's cached copy is current.")
+            ),
+        },
+    )
+    @action(detail=False, methods=["GET"], url_path="ids", url_name="ids")
+    async def ids(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        user = cast(CustomUserType, request.user)
+        ids, etag = await FavoriteProperties.aids(user.id)
+        return etag_response(request, {"ids": ids}, etag=etag)
+
+    @extend_schema(
+        summary=_("Add and remove favorite properties in bulk"),
+        description=_(
+            "Adds the `add` property ids to the favorites of the authenticated "
+            "user and removes the `remove` ones, with one statement each. "
+            "Adding a favorite property or removing a property which is not "
+            "favorited has no effect. Returns the ids of the favorite "
+            "properties after the update, with their `ETag`."
+        ),
+        request=FavoriteBulkSerializer,
+        responses={
+            HTTP_200_OK: FavoriteIdsSerializer,
+            HTTP_400_BAD_REQUEST: OpenApiResponse(
+                description=_("Unknown property ids or too many ids.")
+            ),
+        },
+    )
+    @action(detail=False, methods=["POST"], url_path="bulk", url_name="bulk")
+    def bulk(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        serializer = FavoriteBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user = cast(CustomUserType, request.user)
+        FavoriteProperties.bulk_update(
+            user.id,
+            add=serializer.validated_data["add"],
+            remove=serializer.validated_data["remove"],
         )
+        ids, etag = FavoriteProperties.ids(user.id)
+        return Response({"ids": ids}, status=HTTP_200_OK, headers={"ETag": etag})
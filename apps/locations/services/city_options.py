@@ -0,0 +1,73 @@
+from typing import Any, Dict, FrozenSet, List
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db.models import F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from apps.locations.models import City, CityTranslation, Country
+
+CITY_OPTIONS_VERSION_KEY = "locations:city-options:version"
+COUNTRY_CODES_TIMEOUT = 60 * 60 * 24
+
+
+def city_options_version() -> str:
+    """
+    Returns the current version token of the city options.
+
+    Every cache entry derived from `City` or `CityTranslation` rows should
+    include this token in its key, so that bumping it with
+    `invalidate_city_options` makes all of them stale at once.
+    """
+    return str(cache.get_or_set(CITY_OPTIONS_VERSION_KEY, uuid4().hex, timeout=None))
+
+
+def invalidate_city_options() -> None:
+    """
+    Invalidates every cached city option list.
+
+    Cities and countries change rarely (admin edits and seeding), so a single
+    version token shared by all countries and languages is enough. Note that
+    `bulk_create` does not send model signals, so bulk loaders must call this
+    explicitly.
+    """
+    cache.set(CITY_OPTIONS_VERSION_KEY, uuid4().hex, timeout=None)
+
+
+def country_codes() -> FrozenSet[str]:
+    """
+    Returns the codes of the known countries, cached under the city options
+    version so that request parameters can be checked without a query.
+    """
+    key = f"locations:country-codes:{city_options_version()}"
+    codes = cache.get_or_set(
+        key,
+        lambda: frozenset(Country.objects.values_list("code", flat=True)),
+        timeout=COUNTRY_CODES_TIMEOUT,
+    )
+    return frozenset(codes or ())
+
+
+def city_options(country_code: str, language: str) -> List[Dict[str, Any]]:
+    """
+    Returns the cities of a country as options for a select input.
+
+    Each option contains the city `id`, its native `name`, the `slug` and the
+    `translated_name` in the requested language. Cities without a translation
+    fall back to their native name. The translation is resolved with a
+    correlated subquery, so the whole list is fetched in a single query.
+
+    Args:
+        country_code: ISO 3166-1 Alpha-2 code of the country.
+        language: ISO 639-1 code of the language for `translated_name`.
+    """
+    translation = CityTranslation.objects.filter(
+        city=OuterRef("pk"), language=language
+    ).values("translated_name")[:1]
+
+    return list(
+        City.objects.filter(country__code=country_code.upper())
+        .annotate(translated_name=Coalesce(Subquery(translation), F("name")))
+        .order_by("name")
+        .values("id", "name", "slug", "translated_name")
+    )
@@ -1,10 +1,11 @@
 from typing import Any
 
-from django.db.models.signals import pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.utils.text import slugify
 
-from .models import City, Location
+from .models import City, CityTranslation, Country, Location
+from .services.city_options import invalidate_city_options
 
 
 def generate_slug(
@@ -64,3 +65,14 @@ def set_city_slug(sender: City, instance: City, **kwargs: Any) -> None:
 @receiver(pre_save, sender=Location)
 def set_location_slug(sender: Location, instance: Location, **kwargs: Any) -> None:
     generate_slug(instance)
+
+
+@receiver([post_save, post_delete], sender=City)
+@receiver([post_save, post_delete], sender=CityTranslation)
+@receiver([post_save, post_delete], sender=Country)
+def clear_city_options_cache(
+    sender: type[City | CityTranslation | Country],
+    instance: City | CityTranslation | Country,
+    **kwargs: Any,
+) -> None:
+    invalidate_city_options()
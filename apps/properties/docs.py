@@ -10,3 +10,30 @@ property_count_doc = dedent(
     status(es).
     """
 )
+
+property_form_data_doc = dedent(
+    """
+    Returns the data to help create a `Property`.
+
+    The response contains the available property types and statuses, and the
+    cities of the requested country. Each city carries its `slug` and its name
+    translated to the requested `language`, falling back to the native name.
+
+    The response is cached per country and language, and carries an `ETag`.
+    Send it back in the `If-None-Match` header to get an empty
+    `304 Not Modified` response while the data is unchanged.
+    """
+)
+
+property_images_upload_doc = dedent(
+    """
+    Uploads several images of a `Property` at once, as the `images` fields of a
+    `multipart/form-data` body. Only the owner of the property can upload.
+
+    Every file is validated on its own. The valid ones are stored and
+    processed (re-encoding, variants, placeholders) in the background, so the
+    `202 Accepted` response returns before their variants exist. The response
+    lists the status of every file in upload order: `accepted` with the `id`
+    of the new image, or `rejected` with the validation `errors`.
+    """
+)
@@ -0,0 +1,143 @@
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Iterator
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import transaction
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+
+from apps.properties.models import ImageBlob, PropertyImage
+from apps.properties.storage import (
+    BLOB_PREFIX,
+    ContentAddressedStorage,
+    is_blob_name,
+    property_image_storage,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconciles the reference counts of the content-addressed image blobs "
+        "with the PropertyImage rows, and deletes the unreferenced blobs and the "
+        "orphan files older than the grace period."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--grace-minutes",
+            type=int,
+            default=60,
+            help=(
+                "Keep the counts of the blobs saved more recently than this, "
+                "uploads may be in flight."
+            ),
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report what would be fixed and deleted.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        dry_run = options["dry_run"]
+        cutoff = timezone.now() - timedelta(minutes=options["grace_minutes"])
+        storage = property_image_storage()
+        if not isinstance(storage, ContentAddressedStorage):
+            raise CommandError("The property_images storage is not content-addressed.")
+
+        references = self.references(PropertyImage.objects.all())
+        fixed = deleted = 0
+        known = set()
+        for blob in ImageBlob.objects.iterator(chunk_size=2000):
+            known.add(blob.name)
+            count = references[blob.name]
+            if count == blob.ref_count and (count or blob.updated_at >= cutoff):
+                continue
+            if dry_run:
+                outcome = self.outcome(blob, count, cutoff)
+            else:
+                outcome = self.reconcile(storage, blob.pk, cutoff)
+            if outcome == "fixed":
+                fixed += 1
+            elif outcome == "deleted":
+                deleted += 1
+                self.stdout.write(f"Unreferenced blob: {blob.name}")
+
+        orphans = 0
+        for name in self.blob_files(storage):
+            if name in known or storage.get_modified_time(name) >= cutoff:
+                continue
+            orphans += 1
+            self.stdout.write(f"Orphan file: {name}")
+            if not dry_run:
+                storage.purge(name)
+
+        prefix = "Would fix" if dry_run else "Fixed"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{prefix} {fixed} reference counts, "
+                f"{'would delete' if dry_run else 'deleted'} {deleted} unreferenced "
+                f"blobs and {orphans} orphan files."
+            )
+        )
+
+    @staticmethod
+    def references(images: QuerySet[PropertyImage]) -> Counter[str]:
+        """Counts the references to the blobs of the images and variants."""
+        references: Counter[str] = Counter()
+        rows = images.values_list("image", "variants")
+        for image, variants in rows.iterator(chunk_size=2000):
+            for name in [image, *(variants or {}).values()]:
+                if name and is_blob_name(name):
+                    references[name] += 1
+        return references
+
+    @staticmethod
+    def outcome(blob: ImageBlob, count: int, cutoff: datetime) -> str | None:
+        """
+        Tells what to do with a blob referenced `count` times. Blobs saved
+        within the grace period may have references in flight, which are
+        counted but not yet stored, so their count is only raised.
+        """
+        recent = blob.updated_at >= cutoff
+        if count == 0 and not recent:
+            return "deleted"
+        if count > blob.ref_count or (count < blob.ref_count and not recent):
+            return "fixed"
+        return None
+
+    def reconcile(
+        self, storage: ContentAddressedStorage, pk: int, cutoff: datetime
+    ) -> str | None:
+        """
+        Fixes or deletes a blob, locked and with its references counted again,
+        as uploads may have referenced it since the sweep started.
+        """
+        with transaction.atomic():
+            blob = ImageBlob.objects.select_for_update().filter(pk=pk).first()
+            if blob is None:
+                return None
+            images = PropertyImage.objects.filter(
+                Q(image=blob.name) | Q(variants__icontains=blob.name)
+            )
+            count = self.references(images)[blob.name]
+            outcome = self.outcome(blob, count, cutoff)
+            if outcome == "deleted":
+                blob.delete()
+                # Under the lock, like `ContentAddressedStorage.delete`.
+                storage.purge(blob.name)
+            elif outcome == "fixed":
+                ImageBlob.objects.filter(pk=pk).update(ref_count=count)
+        return outcome
+
+    def blob_files(
+        self, storage: ContentAddressedStorage, path: str = BLOB_PREFIX
+    ) -> Iterator[str]:
+        if not storage.exists(path):
+            return
+        directories, files = storage.listdir(path)
+        for name in files:
+            yield f"{path}/{name}"
+        for directory in directories:
+            yield from self.blob_files(storage, f"{path}/{directory}")
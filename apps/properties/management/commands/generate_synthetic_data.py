@@ -0,0 +1,102 @@
+from typing import Any, Dict
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from seed.synthetic import SyntheticDataConfig, SyntheticDataGenerator
+
+
+def parse_countries(value: str) -> Dict[str, float]:
+    """Parses country weights given as `MK=0.6,DK=0.4` (or just `MK,DK`)."""
+    countries = {}
+    for item in value.split(","):
+        code, _, weight = item.strip().partition("=")
+        try:
+            countries[code.strip().upper()] = float(weight) if weight else 1.0
+        except ValueError:
+            raise CommandError(f"Invalid weight for country '{code}': '{weight}'")
+    if not countries or any(w <= 0 for w in countries.values()):
+        raise CommandError("Country weights must be positive numbers.")
+    return countries
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates a reproducible synthetic dataset (users, addresses, properties, "
+        "images and favorites) for benchmarking. The same options and --seed "
+        "always produce the same data."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        defaults = SyntheticDataConfig()
+        parser.add_argument("--properties", type=int, default=defaults.properties)
+        parser.add_argument("--users", type=int, default=defaults.users)
+        parser.add_argument(
+            "--images-per-property",
+            type=float,
+            default=defaults.images_per_property,
+            help="Average number of images per property.",
+        )
+        parser.add_argument(
+            "--favorites-per-user",
+            type=float,
+            default=defaults.favorites_per_user,
+            help="Average number of favorites per user.",
+        )
+        parser.add_argument(
+            "--countries",
+            default="MK=1,DK=1",
+            help="Comma separated country codes with optional weights, e.g. 'MK=0.6,DK=0.4'.",
+        )
+        parser.add_argument(
+            "--cities-per-country",
+            type=int,
+            default=defaults.cities_per_country,
+            help="Cities generated for countries without seeded city data.",
+        )
+        parser.add_argument(
+            "--city-skew",
+            type=float,
+            default=defaults.city_skew,
+            help="Zipf exponent of the distribution of properties over cities.",
+        )
+        parser.add_argument(
+            "--favorite-skew",
+            type=float,
+            default=defaults.favorite_skew,
+            help="How strongly favorites concentrate on popular properties (1 is uniform).",
+        )
+        parser.add_argument("--seed", type=int, default=defaults.seed)
+        parser.add_argument("--chunk-size", type=int, default=defaults.chunk_size)
+        parser.add_argument(
+            "--no-copy",
+            action="store_true",
+            help="Use bulk_create instead of COPY on PostgreSQL.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be at least 1.")
+        config = SyntheticDataConfig(
+            properties=options["properties"],
+            users=options["users"],
+            images_per_property=options["images_per_property"],
+            favorites_per_user=options["favorites_per_user"],
+            countries=parse_countries(options["countries"]),
+            cities_per_country=options["cities_per_country"],
+            city_skew=options["city_skew"],
+            favorite_skew=options["favorite_skew"],
+            seed=options["seed"],
+            chunk_size=options["chunk_size"],
+            use_copy=not options["no_copy"],
+        )
+        generator = SyntheticDataGenerator(config, log=self.stdout.write)
+        try:
+            counts = generator.run()
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                ", ".join(f"{count} {name}" for name, count in counts.items())
+            )
+        )
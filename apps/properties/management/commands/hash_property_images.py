@@ -0,0 +1,54 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from PIL import Image
+
+from apps.properties.models import PropertyImage
+from apps.properties.services.duplicates import NearDuplicateImages, hash_fields
+
+
+class Command(BaseCommand):
+    help = (
+        "Computes the perceptual hash of the property images processed before "
+        "hashes were stored, from their smallest variant when there is one, and "
+        "stores the near duplicate images report."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of images loaded per query.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        images = PropertyImage.objects.filter(perceptual_hash__isnull=True).only(
+            "image", "variants"
+        )
+        hashed = failed = 0
+        for image in images.iterator(chunk_size=options["batch_size"]):
+            if not image.image:
+                continue
+            # The hash only depends on a 9x8 thumbnail, any variant will do.
+            name = image.variants.get("card") or image.image.name
+            try:
+                with image.image.storage.open(name, "rb") as f, Image.open(
+                    f
+                ) as picture:
+                    fields = hash_fields(picture)
+            except (OSError, Image.DecompressionBombError) as e:
+                failed += 1
+                self.stderr.write(f"Could not hash property image {image.pk}: {e}")
+                continue
+            PropertyImage.objects.filter(pk=image.pk).update(**fields)
+            hashed += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Hashed {hashed} property images, {failed} failed.")
+        )
+        duplicates = NearDuplicateImages.refresh()
+        self.stdout.write(
+            self.style.SUCCESS(f"Found {duplicates} near duplicate image pairs.")
+        )
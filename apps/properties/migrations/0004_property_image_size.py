@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:41
+
+import apps.properties.models.property_image
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("properties", "0003_property_image_variants"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="propertyimage",
+            name="original_size",
+            field=models.PositiveIntegerField(
+                blank=True,
+                editable=False,
+                help_text="Size in bytes of the file as uploaded.",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="propertyimage",
+            name="size",
+            field=models.PositiveIntegerField(
+                blank=True,
+                editable=False,
+                help_text="Size in bytes of the stored file, after normalization.",
+                null=True,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="propertyimage",
+            name="image",
+            field=models.ImageField(
+                help_text="Image of the property.",
+                upload_to=apps.properties.models.property_image.property_image_path,
+                validators=[
+                    django.core.validators.FileExtensionValidator(
+                        allowed_extensions=["png", "jpg", "jpeg", "bmp", "gif", "webp"]
+                    )
+                ],
+            ),
+        ),
+    ]
@@ -0,0 +1,92 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:44
+
+import apps.properties.models.property_image
+import apps.properties.storage
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("properties", "0004_property_image_size"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImageBlob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True,
+                        help_text="The date and time when this record was first created.",
+                        verbose_name="Creation Date & Time",
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True,
+                        help_text="The date and time when this record was last updated.",
+                        verbose_name="Last Update Date & Time",
+                    ),
+                ),
+                (
+                    "hash",
+                    models.CharField(
+                        help_text="SHA-256 of the file content.",
+                        max_length=64,
+                        unique=True,
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        help_text="Storage name of the file, derived from the hash.",
+                        max_length=255,
+                    ),
+                ),
+                (
+                    "size",
+                    models.PositiveBigIntegerField(
+                        help_text="Size of the file in bytes."
+                    ),
+                ),
+                (
+                    "ref_count",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Number of image fields referencing the file.",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Image Blob",
+                "verbose_name_plural": "Image Blobs",
+            },
+        ),
+        migrations.AlterField(
+            model_name="propertyimage",
+            name="image",
+            field=models.ImageField(
+                help_text="Image of the property.",
+                storage=apps.properties.storage.property_image_storage,
+                upload_to=apps.properties.models.property_image.property_image_path,
+                validators=[
+                    django.core.validators.FileExtensionValidator(
+                        allowed_extensions=["png", "jpg", "jpeg", "bmp", "gif", "webp"]
+                    )
+                ],
+            ),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("properties", "0005_image_blob"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="propertyimage",
+            name="hash_band_0",
+            field=models.PositiveIntegerField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                help_text="Bits 0-15 of `perceptual_hash`, indexed for lookups.",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="propertyimage",
+            name="hash_band_1",
+            field=models.PositiveIntegerField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                help_text="Bits 16-31 of `perceptual_hash`, indexed for lookups.",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="propertyimage",
+            name="hash_band_2",
+            field=models.PositiveIntegerField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                help_text="Bits 32-47 of `perceptual_hash`, indexed for lookups.",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="propertyimage",
+            name="hash_band_3",
+            field=models.PositiveIntegerField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                help_text="Bits 48-63 of `perceptual_hash`, indexed for lookups.",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="propertyimage",
+            name="perceptual_hash",
+            field=models.BigIntegerField(
+                blank=True,
+                editable=False,
+                help_text="64 bit difference hash of the image, close for resized or recompressed copies of the same photo. Stored signed.",
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:05
+
+import apps.properties.models.property_image
+import apps.properties.storage
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("properties", "0006_property_image_perceptual_hash"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="propertyimage",
+            name="image",
+            field=models.ImageField(
+                help_text="Image of the property.",
+                storage=apps.properties.storage.property_image_storage,
+                upload_to=apps.properties.models.property_image.property_image_path,
+                validators=[
+                    django.core.validators.FileExtensionValidator(
+                        allowed_extensions=["png", "jpg", "jpeg", "bmp", "gif", "webp"]
+                    ),
+                    apps.properties.models.property_image.validate_image_pixels,
+                ],
+            ),
+        ),
+    ]
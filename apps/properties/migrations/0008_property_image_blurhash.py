@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("properties", "0007_property_image_pixels"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="propertyimage",
+            name="blurhash",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="BlurHash of the image, rendered by clients as a placeholder while the image loads. Filled in by the image pipeline after upload.",
+                max_length=64,
+            ),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("locations", "0001_initial"),
+        ("properties", "0008_property_image_blurhash"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="property",
+            name="favorite_count",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                help_text="The number of users who favorited the property. Maintained\n                from the favorites in batches, it may lag for a few seconds.",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="property",
+            index=models.Index(
+                fields=["country_code", "status", "favorite_count"],
+                name="properties__country_ad0ed9_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("properties", "0009_property_favorite_count"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="imageblob",
+            name="hash",
+            field=models.CharField(
+                db_index=True, help_text="SHA-256 of the file content.", max_length=64
+            ),
+        ),
+        migrations.AlterField(
+            model_name="imageblob",
+            name="name",
+            field=models.CharField(
+                help_text="Storage name of the file, derived from the hash and the extension. The same content saved with another extension is another blob.",
+                max_length=255,
+                unique=True,
+            ),
+        ),
+    ]
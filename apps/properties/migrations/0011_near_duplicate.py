@@ -0,0 +1,95 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("properties", "0010_image_blob_unique_name"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="propertyimage",
+            name="hash_band_0",
+        ),
+        migrations.RemoveField(
+            model_name="propertyimage",
+            name="hash_band_1",
+        ),
+        migrations.RemoveField(
+            model_name="propertyimage",
+            name="hash_band_2",
+        ),
+        migrations.RemoveField(
+            model_name="propertyimage",
+            name="hash_band_3",
+        ),
+        migrations.CreateModel(
+            name="NearDuplicate",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True,
+                        help_text="The date and time when this record was first created.",
+                        verbose_name="Creation Date & Time",
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True,
+                        help_text="The date and time when this record was last updated.",
+                        verbose_name="Last Update Date & Time",
+                    ),
+                ),
+                (
+                    "distance",
+                    models.PositiveSmallIntegerField(
+                        help_text="Number of differing perceptual hash bits."
+                    ),
+                ),
+                (
+                    "first",
+                    models.ForeignKey(
+                        help_text="Image with the lower id of the pair.",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="properties.propertyimage",
+                    ),
+                ),
+                (
+                    "second",
+                    models.ForeignKey(
+                        help_text="Image with the higher id of the pair.",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="properties.propertyimage",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Near Duplicate",
+                "verbose_name_plural": "Near Duplicates",
+                "indexes": [
+                    models.Index(
+                        fields=["distance", "first"],
+                        name="properties__distanc_eaad54_idx",
+                    )
+                ],
+                "unique_together": {("first", "second")},
+            },
+        ),
+    ]
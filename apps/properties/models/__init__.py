@@ -1,7 +1,11 @@
+from .image_blob import ImageBlob
+from .near_duplicate import NearDuplicate
 from .property import Property, PropertyStatus, PropertyType
 from .property_image import PropertyImage
 
 __all__ = [
+    "ImageBlob",
+    "NearDuplicate",
     "Property",
     "PropertyStatus",
     "PropertyType",
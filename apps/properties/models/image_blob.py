@@ -0,0 +1,41 @@
+from django.db import models
+
+from apps.core.models import TimeTracking
+
+
+class ImageBlob(TimeTracking):
+    """
+    A unique image file in the content-addressed image storage.
+
+    The same photo uploaded for several listings is stored once, every
+    `PropertyImage.image` and variant referencing it counts in `ref_count`.
+    The file is deleted when the last reference is released, and
+    `manage.py gc_image_blobs` reconciles the counts with the actual
+    references and removes orphans.
+    """
+
+    hash = models.CharField(
+        max_length=64,
+        db_index=True,
+        help_text="SHA-256 of the file content.",
+    )
+    name = models.CharField(
+        max_length=255,
+        unique=True,
+        help_text=(
+            "Storage name of the file, derived from the hash and the extension. "
+            "The same content saved with another extension is another blob."
+        ),
+    )
+    size = models.PositiveBigIntegerField(help_text="Size of the file in bytes.")
+    ref_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of image fields referencing the file.",
+    )
+
+    class Meta:
+        verbose_name = "Image Blob"
+        verbose_name_plural = "Image Blobs"
+
+    def __str__(self) -> str:
+        return f"{self.name} ({self.ref_count} references)"
@@ -0,0 +1,40 @@
+from django.db import models
+
+from apps.core.models import TimeTracking
+
+from .property_image import PropertyImage
+
+
+class NearDuplicate(TimeTracking):
+    """
+    Two images of different listings whose perceptual hashes are close.
+
+    The pairs are computed for all the images at once by
+    `manage.py hash_property_images`, and the staff report pages through the
+    stored pairs instead of comparing the hashes for every request.
+    """
+
+    first = models.ForeignKey(
+        PropertyImage,
+        on_delete=models.CASCADE,
+        related_name="+",
+        help_text="Image with the lower id of the pair.",
+    )
+    second = models.ForeignKey(
+        PropertyImage,
+        on_delete=models.CASCADE,
+        related_name="+",
+        help_text="Image with the higher id of the pair.",
+    )
+    distance = models.PositiveSmallIntegerField(
+        help_text="Number of differing perceptual hash bits."
+    )
+
+    class Meta:
+        verbose_name = "Near Duplicate"
+        verbose_name_plural = "Near Duplicates"
+        unique_together = ("first", "second")
+        indexes = [models.Index(fields=["distance", "first"])]
+
+    def __str__(self) -> str:
+        return f"{self.first_id} ~ {self.second_id} ({self.distance} bits)"
@@ -1,5 +1,6 @@
 import datetime
 from textwrap import dedent
+from typing import TYPE_CHECKING
 
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
@@ -10,6 +11,9 @@ from django.utils.translation import gettext_lazy as _
 from apps.core.models import TimeTracking
 from apps.locations.models import Address
 
+if TYPE_CHECKING:
+    from .property_image import PropertyImage
+
 
 def validate_positive(value: int | float) -> None:
     if value is not None and value <= 0:
@@ -340,6 +344,16 @@ class Property(TimeTracking):
             )
         ),
     )
+    favorite_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text=_(
+            dedent(
+                """The number of users who favorited the property. Maintained
+                from the favorites in batches, it may lag for a few seconds."""
+            )
+        ),
+    )
 
     class Meta:
         verbose_name = _("Property")
@@ -356,6 +370,7 @@ class Property(TimeTracking):
             # Support sorting if needed
             models.Index(fields=["country_code", "status", "created_at"]),
             models.Index(fields=["country_code", "status", "construction_year"]),
+            models.Index(fields=["country_code", "status", "favorite_count"]),
         ]
 
     def __str__(self) -> str:
@@ -367,3 +382,15 @@ class Property(TimeTracking):
             currency=self.price_currency or "",
             area=self.area or "N/A",
         )
+
+    @property
+    def primary_image(self) -> "PropertyImage | None":
+        """
+        Returns the primary image of the property, else its first image.
+
+        The image is picked among `property_images.all()`, prefetch them when
+        listing properties.
+        """
+        images = list(self.property_images.all())
+        primary = next((image for image in images if image.is_primary), None)
+        return primary or (images[0] if images else None)
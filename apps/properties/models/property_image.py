@@ -1,9 +1,15 @@
 from typing import Any
 
+from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.core.validators import FileExtensionValidator
 from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from PIL import Image
 
 from apps.core.models import TimeTracking
+from apps.properties.storage import property_image_storage
 
 from .property import Property
 
@@ -19,6 +25,35 @@ def property_image_path(instance: Any, filename: str) -> str:
     )
 
 
+def validate_image_pixels(file: Any) -> None:
+    """
+    Rejects images larger than `PROPERTY_IMAGE_MAX_PIXELS`, including
+    decompression bombs: small files declaring huge dimensions, which would
+    exhaust the memory of the worker once decoded.
+
+    Only the image header is read, nothing is decoded.
+
+    Raises:
+        django.core.validators.ValidationError: If the image is too large.
+    """
+    position = file.tell()
+    pixels: int | None
+    try:
+        with Image.open(file) as picture:
+            pixels = picture.width * picture.height
+    except Image.DecompressionBombError:
+        # Pillow refuses to open images beyond twice its own limit.
+        pixels = None
+    finally:
+        file.seek(position)
+
+    if pixels is None or pixels > settings.PROPERTY_IMAGE_MAX_PIXELS:
+        raise ValidationError(
+            _("Images can have at most %(max)d megapixels."),
+            params={"max": settings.PROPERTY_IMAGE_MAX_PIXELS // 1_000_000},
+        )
+
+
 class PropertyImage(TimeTracking):
     title = models.CharField(
         max_length=255,
@@ -35,10 +70,12 @@ class PropertyImage(TimeTracking):
     )
     image = models.ImageField(
         upload_to=property_image_path,
+        storage=property_image_storage,
         validators=[
             FileExtensionValidator(
-                allowed_extensions=["png", "jpg", "jpeg", "bmp", "gif"]
+                allowed_extensions=["png", "jpg", "jpeg", "bmp", "gif", "webp"]
             ),
+            validate_image_pixels,
         ],
         help_text="Image of the property.",
     )
@@ -48,6 +85,45 @@ class PropertyImage(TimeTracking):
         related_name="property_images",
         help_text="Image belong to the given property.",
     )
+    variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text=(
+            "Storage names of the resized variants of the image, by variant "
+            "name (e.g. 'card'). Filled in by the image pipeline after upload."
+        ),
+    )
+    original_size = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Size in bytes of the file as uploaded.",
+    )
+    size = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Size in bytes of the stored file, after normalization.",
+    )
+    blurhash = models.CharField(
+        max_length=64,
+        blank=True,
+        editable=False,
+        help_text=(
+            "BlurHash of the image, rendered by clients as a placeholder while "
+            "the image loads. Filled in by the image pipeline after upload."
+        ),
+    )
+    perceptual_hash = models.BigIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=(
+            "64 bit difference hash of the image, close for resized or "
+            "recompressed copies of the same photo. Stored signed."
+        ),
+    )
 
     class Meta:
         verbose_name = "Property Image"
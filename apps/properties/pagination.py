@@ -0,0 +1,14 @@
+from rest_framework.pagination import PageNumberPagination
+
+
+class NearDuplicatePagination(PageNumberPagination):
+    """
+    Pages of the near duplicate images report, closest pairs first.
+
+    The pairs are stored by `manage.py hash_property_images`, so a page only
+    loads its own pairs.
+    """
+
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
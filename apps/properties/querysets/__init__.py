@@ -1,5 +1,6 @@
-from .property import property_list_queryset
+from .property import property_card_images, property_list_queryset
 
 __all__ = [
+    "property_card_images",
     "property_list_queryset",
 ]
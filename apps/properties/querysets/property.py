@@ -6,6 +6,16 @@ from apps.favorites.models import UserFavoriteProperty
 from apps.properties.models import Property, PropertyImage
 
 
+def property_card_images() -> QuerySet[PropertyImage]:
+    """
+    Returns the queryset to prefetch the images of property cards with, the
+    fields `PropertyPrimaryImageSerialzier` and `Property.primary_image` use.
+    """
+    return PropertyImage.objects.only(
+        "image", "variants", "blurhash", "is_primary", "property_id"
+    )
+
+
 def property_list_queryset(
     filter: List[float | int | str] | None = None,
     filter_key: str = "id",
@@ -48,16 +58,25 @@ def property_list_queryset(
     list_qs = base_query.prefetch_related(
         Prefetch(
             "property_images",
-            queryset=PropertyImage.objects.only("image"),
+            queryset=property_card_images(),
         ),
     ).only(
+        # Every field of `PropertyListSerializer`, a deferred one would be
+        # loaded with a query per property.
         "id",
         "property_type",
         "description",
         "created_at",
         "price",
         "price_currency",
+        "total_rooms",
+        "area",
+        "energy_class",
+        "street_name",
+        "street_number",
+        "postal_code",
         "city",
+        "favorite_count",
         "country_code",
     )
 
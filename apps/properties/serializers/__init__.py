@@ -3,15 +3,19 @@ from .property import (
     PropertySerializer,
 )
 from .property_image import (
+    NearDuplicateSerializer,
     PropertyImageSerializer,
+    PropertyImageUploadSerializer,
     PropertyPrimaryImageSerialzier,
 )
 from .search import PropertySearchQuerySerializer, PropertySearchResponseSerializer
 
 __all__ = [
+    "NearDuplicateSerializer",
     "PropertyListSerializer",
     "PropertySerializer",
     "PropertyImageSerializer",
+    "PropertyImageUploadSerializer",
     "PropertyPrimaryImageSerialzier",
     "PropertySearchQuerySerializer",
     "PropertySearchResponseSerializer",
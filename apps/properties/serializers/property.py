@@ -4,7 +4,9 @@ from django.db import transaction
 
 from rest_framework.serializers import BooleanField, ModelSerializer
 
+from apps.core.serializers import TimedSerializerMixin
 from apps.properties.models import Property, PropertyImage
+from apps.properties.services.images import PropertyImagePipeline
 
 from .property_image import (
     PropertyImageSerializer,
@@ -12,7 +14,7 @@ from .property_image import (
 )
 
 
-class PropertySerializer(ModelSerializer[Property]):
+class PropertySerializer(TimedSerializerMixin, ModelSerializer[Property]):
     property_images = PropertyImageSerializer(many=True, required=False)
 
     class Meta:
@@ -44,12 +46,14 @@ class PropertySerializer(ModelSerializer[Property]):
                     PropertyImage(**image) for image in image_serializer.validated_data
                 ]
                 PropertyImage.objects.bulk_create(property_images)
+                # `bulk_create` does not send `post_save`, schedule explicitly.
+                PropertyImagePipeline.schedule_property(property_instance.id)
 
         return property_instance
 
 
-class PropertyListSerializer(ModelSerializer[Property]):
-    image = PropertyPrimaryImageSerialzier(read_only=True)
+class PropertyListSerializer(TimedSerializerMixin, ModelSerializer[Property]):
+    image = PropertyPrimaryImageSerialzier(source="primary_image", read_only=True)
     favorite = BooleanField(source="is_favorite", default=False, read_only=True)
 
     class Meta:
@@ -68,6 +72,7 @@ class PropertyListSerializer(ModelSerializer[Property]):
             "street_number",
             "postal_code",
             "city",
+            "favorite_count",
             "image",
             "favorite",
         ]
@@ -1,15 +1,83 @@
-from rest_framework.serializers import ModelSerializer
+from typing import Any, Dict
 
-from apps.properties.models import PropertyImage
+from rest_framework.serializers import Field, ModelSerializer, SerializerMethodField
+
+from apps.properties.models import NearDuplicate, PropertyImage
+from apps.properties.services.resizing import resized_url_template
+
+
+class ImageVariantsField(Field):  # type: ignore[type-arg]
+    """
+    Read-only field turning the `PropertyImage.variants` storage names into
+    URLs, absolute when the request is in the serializer context. Empty until
+    the image pipeline has processed the image.
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        kwargs["read_only"] = True
+        kwargs.setdefault("source", "*")
+        super().__init__(**kwargs)
+
+    def to_representation(self, image: PropertyImage) -> Dict[str, str]:
+        storage = image.image.storage
+        request = self.context.get("request")
+        urls = {}
+        for name, path in image.variants.items():
+            url = storage.url(path)
+            urls[name] = request.build_absolute_uri(url) if request else url
+        return urls
 
 
 class PropertyImageSerializer(ModelSerializer[PropertyImage]):
+    variants = ImageVariantsField()
+    resize_url = SerializerMethodField(
+        help_text=(
+            "URL of the image resized on demand, with `{width}` and `{format}` "
+            "(`jpg` or `webp`) placeholders. Widths are rounded up to a multiple "
+            "of 64 pixels."
+        )
+    )
+
     class Meta:
         model = PropertyImage
         fields = "__all__"
 
+    def get_resize_url(self, image: PropertyImage) -> str | None:
+        if not image.image:
+            return None
+        url = resized_url_template(image)
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request else url
+
+
+class PropertyImageUploadSerializer(ModelSerializer[PropertyImage]):
+    """Validates a file of a bulk upload, with the `PropertyImage.image` validators."""
 
-class PropertyPrimaryImageSerialzier(ModelSerializer[PropertyImage]):
     class Meta:
         model = PropertyImage
         fields = ("image",)
+
+
+class PropertyPrimaryImageSerialzier(ModelSerializer[PropertyImage]):
+    variants = ImageVariantsField()
+
+    class Meta:
+        model = PropertyImage
+        fields = ("image", "variants", "blurhash")
+
+
+class NearDuplicateImageSerializer(ModelSerializer[PropertyImage]):
+    variants = ImageVariantsField()
+
+    class Meta:
+        model = PropertyImage
+        fields = ("id", "property", "image", "variants")
+
+
+class NearDuplicateSerializer(ModelSerializer[NearDuplicate]):
+    first = NearDuplicateImageSerializer()
+    second = NearDuplicateImageSerializer()
+
+    class Meta:
+        model = NearDuplicate
+        fields = ("first", "second", "distance")
@@ -0,0 +1,85 @@
+import time
+from typing import Any, Callable, Dict, Iterable
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.core.utils import LRUCache, record_cache_access
+from apps.core.utils.prometheus import observe_cache_access
+
+CACHE_NAME = "property_detail"
+
+_local_cache: LRUCache[str, Dict[str, Any]] | None = None
+
+
+def local_detail_cache() -> LRUCache[str, Dict[str, Any]]:
+    """Returns the property details cached in the process, following the settings."""
+    global _local_cache
+    max_size = settings.PROPERTY_DETAIL_LOCAL_CACHE_SIZE
+    if _local_cache is None or _local_cache.max_size != max_size:
+        _local_cache = LRUCache(max_size)
+    return _local_cache
+
+
+class PropertyDetailCache:
+    """
+    Two-tier cache of the serialized property details: the memory of the
+    worker, then the shared cache.
+
+    Entries are keyed by the current version of the property, a token kept
+    in the shared cache and dropped by `invalidate` once a write commits, so
+    the workers never serve a detail older than the last write without being
+    notified of it, provided the cache backend is shared by the workers, see
+    `CACHES`. An entry loaded while a write is in flight is stored under the
+    version it started with, which the commit replaces.
+    """
+
+    @staticmethod
+    def version_key(property_id: int) -> str:
+        return f"properties:detail-version:{property_id}"
+
+    @staticmethod
+    def get(
+        property_id: int, variant: str, load: Callable[[], Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Returns the cached detail of a property, or caches the one returned
+        by `load` in both tiers.
+
+        `variant` tells apart the details serialized differently, e.g. with
+        the absolute URLs of another host.
+        """
+        timeout = settings.PROPERTY_DETAIL_CACHE_TIMEOUT
+        version = cache.get_or_set(
+            PropertyDetailCache.version_key(property_id), uuid4().hex, timeout
+        )
+        key = f"properties:detail:{property_id}:{version}:{variant}"
+        local = local_detail_cache()
+
+        data = local.get(key)
+        observe_cache_access(CACHE_NAME, "local", hit=data is not None)
+        hit = data is not None
+        if data is None:
+            data = cache.get(key)
+            hit = data is not None
+            observe_cache_access(CACHE_NAME, "shared", hit=hit)
+            if data is None:
+                # A plain dict, a `ReturnDict` keeps its serializer and request.
+                data = dict(load())
+                cache.set(key, data, timeout)
+            local.set(key, data, time.monotonic() + timeout)
+        record_cache_access(hit=hit)
+        return data
+
+    @staticmethod
+    def invalidate(property_ids: Iterable[int]) -> None:
+        """
+        Makes the cached details of the properties stale once the current
+        transaction commits. Writes which bypass the model signals, e.g.
+        `QuerySet.update`, must call it.
+        """
+        keys = [PropertyDetailCache.version_key(pk) for pk in set(property_ids)]
+        if keys:
+            transaction.on_commit(lambda: cache.delete_many(keys))
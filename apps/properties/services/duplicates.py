@@ -0,0 +1,178 @@
+from functools import reduce
+from itertools import combinations
+from operator import xor
+from typing import Dict, Iterator, List, Set, Tuple
+
+from django.db import transaction
+
+import numpy as np
+
+from PIL import Image
+
+from apps.properties.models import NearDuplicate, PropertyImage
+
+HASH_BITS = 64
+HASH_MASK = (1 << HASH_BITS) - 1
+# Multi-index hashing: every hash is split in `BANDS` bands, each looked up
+# along with the keys at most `PROBE_BITS` bits away. Two hashes with more than
+# `PROBE_BITS` differing bits in every band differ by at least `MAX_DISTANCE`
+# + 1 bits, so the lookups find every pair up to `MAX_DISTANCE`, which covers
+# the 4 to 10 bits of typical resized, recompressed or retouched copies.
+BANDS = 6
+PROBE_BITS = 1
+MAX_DISTANCE = BANDS * (PROBE_BITS + 1) - 1
+# 11 or 10 bits, so that a band of a few hundred thousand images holds a few
+# hundred images per key at most.
+BAND_WIDTHS = [HASH_BITS // BANDS + (band < HASH_BITS % BANDS) for band in range(BANDS)]
+# Larger buckets hold flat or degenerate images, e.g. hashed to 0, whose
+# pairs are not worth reporting and would be quadratic to compare.
+MAX_BUCKET_SIZE = 500
+
+
+def dhash(picture: Image.Image) -> int:
+    """
+    Returns the 64 bit difference hash of an image.
+
+    The image is reduced to 9x8 grey pixels and every bit tells whether a
+    pixel is brighter than its left neighbour. Resized, recompressed or
+    slightly retouched copies of a photo have the same or a close hash.
+    """
+    small = picture.convert("L").resize(
+        (9, 8), Image.Resampling.LANCZOS, reducing_gap=3.0
+    )
+    pixels = np.asarray(small, dtype=np.int16)
+    bits = pixels[:, 1:] > pixels[:, :-1]
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def to_signed(value: int) -> int:
+    """Maps an unsigned 64 bit hash to the range of a `BigIntegerField`."""
+    return value - (1 << HASH_BITS) if value >= 1 << (HASH_BITS - 1) else value
+
+
+def hash_bands(value: int) -> List[int]:
+    """Splits a hash into `BANDS` unsigned integers of `BAND_WIDTHS` bits."""
+    value &= HASH_MASK
+    bands = []
+    for width in BAND_WIDTHS:
+        bands.append(value & ((1 << width) - 1))
+        value >>= width
+    return bands
+
+
+def probes(key: int, width: int) -> Iterator[int]:
+    """Yields the band keys of `width` bits at most `PROBE_BITS` bits from `key`."""
+    for bits in range(PROBE_BITS + 1):
+        for positions in combinations(range(width), bits):
+            yield reduce(xor, (1 << position for position in positions), key)
+
+
+def hash_fields(picture: Image.Image) -> Dict[str, int]:
+    """Returns the `PropertyImage` hash field of an image."""
+    return {"perceptual_hash": to_signed(dhash(picture))}
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin((a ^ b) & HASH_MASK).count("1")
+
+
+class NearDuplicateImages:
+    @staticmethod
+    def pairs(
+        hashes: np.ndarray,
+        groups: np.ndarray,
+        max_distance: int = MAX_DISTANCE,
+        max_bucket_size: int = MAX_BUCKET_SIZE,
+    ) -> Dict[Tuple[int, int], int]:
+        """
+        Returns the distances of the index pairs of the unsigned `hashes` at
+        most `max_distance` bits apart and of different `groups`, the lower
+        index first.
+
+        Only the images sharing a band key, or keys `PROBE_BITS` bits apart,
+        are compared, a bucket against another at once. The keys shared by
+        more than `max_bucket_size` images are skipped.
+        """
+        found: Dict[Tuple[int, int], int] = {}
+        offset = 0
+        for width in BAND_WIDTHS:
+            keys = (hashes >> np.uint64(offset)) & np.uint64((1 << width) - 1)
+            offset += width
+            order = np.argsort(keys, kind="stable")
+            values, starts, counts = np.unique(
+                keys[order], return_index=True, return_counts=True
+            )
+            buckets = {
+                int(key): order[start:end]
+                for key, start, end in zip(values, starts, starts + counts)
+                if end - start <= max_bucket_size
+            }
+            for key, members in buckets.items():
+                for probe in probes(key, width):
+                    others = buckets.get(probe)
+                    # Every pair of buckets is compared once.
+                    if others is None or probe < key:
+                        continue
+                    distances = np.bitwise_count(
+                        hashes[members][:, None] ^ hashes[others][None, :]
+                    )
+                    close = (distances <= max_distance) & (
+                        groups[members][:, None] != groups[others][None, :]
+                    )
+                    for a, b in zip(*np.nonzero(close)):
+                        first, second = sorted((int(members[a]), int(others[b])))
+                        found[first, second] = int(distances[a, b])
+        return found
+
+    @staticmethod
+    def find(max_distance: int = MAX_DISTANCE) -> List[NearDuplicate]:
+        """
+        Returns the unsaved pairs of images belonging to different listings
+        whose perceptual hashes are at most `max_distance` bits apart, closest
+        first.
+
+        Only the stored hashes are compared, no image is decoded. Images
+        stored in the same file are exact duplicates, deduplicated by the
+        storage, so only the first image of every file is compared.
+        """
+        if not 0 <= max_distance <= MAX_DISTANCE:
+            raise ValueError(f"max_distance must be between 0 and {MAX_DISTANCE}.")
+
+        ids: List[int] = []
+        hashes: List[int] = []
+        groups: List[int] = []
+        names: Set[str] = set()
+        for pk, name, property_id, value in (
+            PropertyImage.objects.filter(perceptual_hash__isnull=False)
+            .order_by("id")
+            .values_list("id", "image", "property_id", "perceptual_hash")
+            .iterator(chunk_size=5000)
+        ):
+            if name not in names:
+                names.add(name)
+                ids.append(pk)
+                hashes.append((value or 0) & HASH_MASK)
+                groups.append(property_id)
+        found = NearDuplicateImages.pairs(
+            np.array(hashes, dtype=np.uint64),
+            np.array(groups, dtype=np.int64),
+            max_distance,
+        )
+        duplicates = [
+            NearDuplicate(first_id=ids[first], second_id=ids[second], distance=distance)
+            for (first, second), distance in found.items()
+        ]
+        duplicates.sort(key=lambda duplicate: (duplicate.distance, duplicate.first_id))
+        return duplicates
+
+    @staticmethod
+    def refresh() -> int:
+        """
+        Replaces the stored pairs, up to `MAX_DISTANCE`, with the pairs of the
+        current hashes, and returns their number.
+        """
+        duplicates = NearDuplicateImages.find()
+        with transaction.atomic():
+            NearDuplicate.objects.all().delete()
+            NearDuplicate.objects.bulk_create(duplicates, batch_size=1000)
+        return len(duplicates)
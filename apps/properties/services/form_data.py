@@ -0,0 +1,56 @@
+from typing import Any, Dict, FrozenSet, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.core.utils import make_etag, record_cache_access
+from apps.locations.services.city_options import city_options, city_options_version
+from apps.properties.models import PropertyStatus, PropertyType
+
+# The choices are static for the lifetime of the process, build them once.
+PROPERTY_TYPES = list(PropertyType.values)
+PROPERTY_STATUSES = list(PropertyStatus.values)
+
+
+class PropertyFormData:
+    @staticmethod
+    def languages() -> FrozenSet[str]:
+        """Returns the ISO 639-1 codes of `settings.LANGUAGES`."""
+        return frozenset(code.split("-")[0] for code, _ in settings.LANGUAGES)
+
+    @staticmethod
+    def cache_key(country_code: str, language: str) -> str:
+        return "properties:form-data:{country}:{language}:{version}".format(
+            country=country_code.upper(),
+            language=language,
+            version=city_options_version(),
+        )
+
+    @staticmethod
+    def get(country_code: str, language: str) -> Tuple[Dict[str, Any], str]:
+        """
+        Returns the data needed to render the create `Property` form together
+        with its ETag.
+
+        The payload is cached per country and language. Cache keys embed the
+        city options version, so any change to `City` or `CityTranslation`
+        rows makes the cached payloads stale without having to enumerate them.
+        """
+        key = PropertyFormData.cache_key(country_code, language)
+        cached = cache.get(key)
+        record_cache_access(hit=cached is not None)
+        if cached is not None:
+            return cached["data"], cached["etag"]
+
+        data = {
+            "types": PROPERTY_TYPES,
+            "status": PROPERTY_STATUSES,
+            "cities": city_options(country_code, language),
+        }
+        etag = make_etag(data)
+        cache.set(
+            key,
+            {"data": data, "etag": etag},
+            timeout=settings.PROPERTY_FORM_DATA_CACHE_TIMEOUT,
+        )
+        return data, etag
@@ -0,0 +1,316 @@
+import logging
+import math
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from io import BytesIO
+from typing import Any, Callable, Dict, List, Tuple
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+
+from PIL import Image, ImageOps
+
+from apps.properties.models import PropertyImage
+from apps.properties.services.detail_cache import PropertyDetailCache
+from apps.properties.services.duplicates import hash_fields
+from apps.properties.services.placeholders import blurhash
+
+logger = logging.getLogger(__name__)
+
+EXTENSIONS = {"JPEG": ".jpg", "WEBP": ".webp"}
+
+_executor: ThreadPoolExecutor | None = None
+
+
+@dataclass
+class ImageProcessing:
+    """
+    State shared by the stages processing one image.
+
+    Attributes:
+        image: The `PropertyImage` row being processed.
+        picture: The decoded image, stages may replace it (e.g. once oriented).
+        source_size: Size of the stored image, which `picture` may have been
+            decoded at a fraction of (see `draft`).
+        updates: `PropertyImage` fields to update once all stages ran.
+        obsolete: Storage names to delete once the updates are saved.
+        saved: Storage names saved by the stages, released if a later stage
+            fails, as no row references them then.
+    """
+
+    image: PropertyImage
+    picture: Image.Image
+    source_size: Tuple[int, int]
+    updates: Dict[str, Any] = field(default_factory=dict)
+    obsolete: List[str] = field(default_factory=list)
+    saved: List[str] = field(default_factory=list)
+
+
+Stage = Callable[[ImageProcessing], None]
+
+
+def encode(
+    picture: Image.Image, quality: int, image_format: str | None = None
+) -> bytes:
+    """
+    Encodes to `image_format` (`PROPERTY_IMAGE_FORMAT` by default), progressive
+    for JPEG, without metadata.
+    """
+    image_format = image_format or settings.PROPERTY_IMAGE_FORMAT
+    if image_format == "JPEG" and picture.mode != "RGB":
+        if picture.mode in ("RGBA", "LA", "P"):
+            # JPEG has no transparency, flatten on white.
+            rgba = picture.convert("RGBA")
+            background = Image.new("RGB", picture.size, "white")
+            background.paste(rgba, mask=rgba.getchannel("A"))
+            picture = background
+        else:
+            picture = picture.convert("RGB")
+    elif image_format == "WEBP" and picture.mode not in ("RGB", "RGBA"):
+        picture = picture.convert("RGBA" if "A" in picture.getbands() else "RGB")
+
+    buffer = BytesIO()
+    options: Dict[str, Any] = {"quality": quality}
+    if image_format == "JPEG":
+        options.update(optimize=True, progressive=True)
+    else:
+        options.update(method=6)
+    picture.save(buffer, format=image_format, **options)
+    return buffer.getvalue()
+
+
+def draft(picture: Image.Image, size: Tuple[int, int]) -> None:
+    """
+    Configures a not yet loaded JPEG to be decoded at 1/2, 1/4 or 1/8 of its
+    size, the smallest scale still covering a thumbnail fitting in `size`.
+
+    Decoding at a reduced scale is much faster and bounds the memory used by
+    large photos: a 50 megapixel JPEG needs 150 MB decoded at full scale.
+    Other formats are decoded at full scale.
+    """
+    width, height = picture.size
+    ratio = min(size[0] / width, size[1] / height)
+    if ratio < 1:
+        picture.draft(
+            picture.mode, (math.ceil(width * ratio), math.ceil(height * ratio))
+        )
+
+
+def replace_extension(name: str, suffix: str = "") -> str:
+    stem, _ = os.path.splitext(name)
+    return f"{stem}{suffix}{EXTENSIONS[settings.PROPERTY_IMAGE_FORMAT]}"
+
+
+def variant_name(original_name: str, variant: str) -> str:
+    """
+    Returns the storage name of a variant, next to the original under
+    `property_image_path`, e.g. `.../property_1/living_room_card.jpg`.
+    """
+    return replace_extension(original_name, f"_{variant}")
+
+
+def normalize(processing: ImageProcessing) -> None:
+    """
+    Replaces the original upload by a compact version of it.
+
+    The EXIF orientation is applied to the pixels, the metadata (EXIF, GPS
+    position, ICC profile) is dropped, images larger than
+    `PROPERTY_IMAGE_MAX_DIMENSION` are downscaled, and the result is encoded to
+    `PROPERTY_IMAGE_FORMAT` with `PROPERTY_IMAGE_QUALITY`. An original which
+    needed none of that is kept when re-encoding would not make it smaller.
+    Animated images are kept as uploaded.
+
+    The sizes before and after are stored in `original_size` and `size`.
+    """
+    image, picture = processing.image, processing.picture
+    original_size = image.image.size
+    if getattr(picture, "is_animated", False):
+        processing.updates.update(original_size=original_size, size=original_size)
+        return
+
+    max_dimension = settings.PROPERTY_IMAGE_MAX_DIMENSION
+    needs_rewrite = (
+        picture.format != settings.PROPERTY_IMAGE_FORMAT
+        or bool(picture.getexif())
+        or "icc_profile" in picture.info
+        or max(processing.source_size) > max_dimension
+    )
+    normalized = ImageOps.exif_transpose(picture)
+    normalized.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+    data = encode(normalized, settings.PROPERTY_IMAGE_QUALITY)
+    processing.picture = normalized
+
+    if not needs_rewrite and len(data) >= original_size:
+        processing.updates.update(original_size=original_size, size=original_size)
+        return
+
+    storage = image.image.storage
+    old_name = image.image.name
+    image.image.name = storage.save(replace_extension(old_name), ContentFile(data))
+    processing.saved.append(image.image.name)
+    processing.obsolete.append(old_name)
+    processing.updates.update(
+        image=image.image.name, original_size=original_size, size=len(data)
+    )
+    logger.info(
+        "Normalized property image %s: %d -> %d bytes (%d saved)",
+        image.pk,
+        original_size,
+        len(data),
+        original_size - len(data),
+    )
+
+
+def perceptual_hash(processing: ImageProcessing) -> None:
+    """
+    Stores the perceptual hash of the normalized image, used to report near
+    duplicate images across listings without decoding them again.
+    """
+    processing.updates.update(hash_fields(processing.picture))
+
+
+def placeholder(processing: ImageProcessing) -> None:
+    """
+    Stores the BlurHash of the normalized image, which list responses include
+    so that clients render a placeholder before the image arrives.
+    """
+    processing.updates["blurhash"] = blurhash(processing.picture)
+
+
+def generate_variants(processing: ImageProcessing) -> None:
+    """
+    Generates a resized copy of the image for every size in
+    `PROPERTY_IMAGE_VARIANTS`, keeping the aspect ratio.
+
+    Originals smaller than a variant are not upscaled.
+    """
+    image = processing.image
+    storage = image.image.storage
+    variants = {}
+    for name, size in settings.PROPERTY_IMAGE_VARIANTS.items():
+        resized = processing.picture.copy()
+        resized.thumbnail(size, Image.Resampling.LANCZOS)
+        data = encode(resized, settings.PROPERTY_IMAGE_VARIANT_QUALITY)
+        if image.variants.get(name):
+            processing.obsolete.append(image.variants[name])
+        variants[name] = storage.save(
+            variant_name(image.image.name, name), ContentFile(data)
+        )
+        processing.saved.append(variants[name])
+    processing.updates["variants"] = variants
+
+
+class PropertyImagePipeline:
+    """
+    Processes uploaded property images off the request thread.
+
+    Images are processed by a pool of `PROPERTY_IMAGE_WORKERS` threads in the
+    web process, once the transaction which created them is committed. Each
+    stage in `STAGES` runs on the decoded original and its field updates are
+    saved at the end, before the replaced files are deleted. With
+    `PROPERTY_IMAGE_WORKERS = 0` the images are processed synchronously, which
+    is what the tests use.
+    """
+
+    STAGES: List[Stage] = [
+        normalize,
+        perceptual_hash,
+        placeholder,
+        generate_variants,
+    ]
+
+    @staticmethod
+    def executor() -> ThreadPoolExecutor:
+        global _executor
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.PROPERTY_IMAGE_WORKERS,
+                thread_name_prefix="property-image",
+            )
+        return _executor
+
+    @staticmethod
+    def schedule(image_ids: List[int]) -> None:
+        """Processes the images after the current transaction commits."""
+        if image_ids:
+            transaction.on_commit(lambda: PropertyImagePipeline.submit(image_ids))
+
+    @staticmethod
+    def schedule_property(property_id: int) -> None:
+        """
+        Processes the unprocessed images of a property after the current
+        transaction commits. Used after `bulk_create`, which neither sends
+        signals nor returns the primary keys on every database.
+        """
+        transaction.on_commit(
+            lambda: PropertyImagePipeline.submit(
+                list(
+                    PropertyImage.objects.filter(
+                        property_id=property_id, variants={}
+                    ).values_list("id", flat=True)
+                )
+            )
+        )
+
+    @staticmethod
+    def submit(image_ids: List[int]) -> List[Future[None]]:
+        if settings.PROPERTY_IMAGE_WORKERS <= 0:
+            for image_id in image_ids:
+                PropertyImagePipeline.process(image_id)
+            return []
+        executor = PropertyImagePipeline.executor()
+        return [
+            executor.submit(PropertyImagePipeline.run_in_worker, image_id)
+            for image_id in image_ids
+        ]
+
+    @staticmethod
+    def run_in_worker(image_id: int) -> None:
+        # Worker threads have their own connections, which must not outlive
+        # `CONN_MAX_AGE` or leak when the thread is reused.
+        close_old_connections()
+        try:
+            PropertyImagePipeline.process(image_id)
+        finally:
+            close_old_connections()
+
+    @staticmethod
+    def process(image_id: int) -> None:
+        image = PropertyImage.objects.filter(pk=image_id).first()
+        if image is None or not image.image:
+            return
+
+        try:
+            with image.image.open("rb") as f, Image.open(f) as picture:
+                source_size = picture.size
+                if source_size[0] * source_size[1] > settings.PROPERTY_IMAGE_MAX_PIXELS:
+                    logger.warning(
+                        "Skipped property image %s of %dx%d pixels",
+                        image_id,
+                        *source_size,
+                    )
+                    return
+                max_dimension = settings.PROPERTY_IMAGE_MAX_DIMENSION
+                draft(picture, (max_dimension, max_dimension))
+                picture.load()
+                processing = ImageProcessing(image, picture, source_size)
+                try:
+                    for stage in PropertyImagePipeline.STAGES:
+                        stage(processing)
+                except Exception:
+                    # With the content-addressed storage every save holds a
+                    # reference to its blob.
+                    for name in processing.saved:
+                        image.image.storage.delete(name)
+                    raise
+        except Exception:
+            logger.exception("Could not process property image %s", image_id)
+            return
+
+        PropertyImage.objects.filter(pk=image_id).update(**processing.updates)
+        PropertyDetailCache.invalidate([image.property_id])
+        storage = image.image.storage
+        for name in processing.obsolete:
+            storage.delete(name)
@@ -0,0 +1,86 @@
+from typing import Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from PIL import Image
+
+BASE83 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+# Horizontal and vertical components, suited to landscape photos. A hash has
+# 6 + 2 * (x * y - 1) characters, 28 for 4x3.
+BLURHASH_COMPONENTS = (4, 3)
+# The hash only keeps the lowest frequencies, a thumbnail of this size has
+# them all and is cheap to transform.
+SAMPLE_SIZE = (64, 64)
+
+
+def encode83(value: int, length: int) -> str:
+    return "".join(
+        BASE83[(value // 83 ** (length - position)) % 83]
+        for position in range(1, length + 1)
+    )
+
+
+def srgb_to_linear(pixels: NDArray[np.uint8]) -> NDArray[np.float64]:
+    values = pixels / 255.0
+    return np.where(
+        values <= 0.04045, values / 12.92, ((values + 0.055) / 1.055) ** 2.4
+    )
+
+
+def linear_to_srgb(value: float) -> int:
+    value = min(max(value, 0.0), 1.0)
+    if value <= 0.0031308:
+        return int(value * 12.92 * 255 + 0.5)
+    return int((1.055 * value ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def blurhash(
+    picture: Image.Image, components: Tuple[int, int] = BLURHASH_COMPONENTS
+) -> str:
+    """
+    Returns the BlurHash (https://blurha.sh) of an image: a ~30 character
+    string from which clients render a blurred placeholder while the image
+    loads.
+
+    The cosine transform of every component is computed at once on a
+    `SAMPLE_SIZE` thumbnail with NumPy.
+    """
+    x_components, y_components = components
+    if picture.mode != "RGB":
+        picture = picture.convert("RGB")
+    sample = picture.resize(SAMPLE_SIZE, Image.Resampling.BOX, reducing_gap=2.0)
+    pixels = srgb_to_linear(np.asarray(sample))
+    height, width, _ = pixels.shape
+
+    basis_x = np.cos(
+        np.pi * np.outer(np.arange(x_components), np.arange(width)) / width
+    )
+    basis_y = np.cos(
+        np.pi * np.outer(np.arange(y_components), np.arange(height)) / height
+    )
+    factors = np.einsum("jy,ix,yxc->jic", basis_y, basis_x, pixels) / (width * height)
+    # The DC component has a normalisation of 1, the AC components 2.
+    factors *= 2
+    factors[0, 0] /= 2
+    factors = factors.reshape(-1, 3)
+    dc, ac = factors[0], factors[1:]
+
+    result = encode83((x_components - 1) + (y_components - 1) * 9, 1)
+    if len(ac):
+        quantised_max = int(max(0, min(82, np.floor(np.abs(ac).max() * 166 - 0.5))))
+        maximum = (quantised_max + 1) / 166
+    else:
+        quantised_max, maximum = 0, 1.0
+    result += encode83(quantised_max, 1)
+
+    red, green, blue = (linear_to_srgb(value) for value in dc)
+    result += encode83((red << 16) + (green << 8) + blue, 4)
+
+    scaled = ac / maximum
+    quantised = np.clip(
+        np.floor(np.sign(scaled) * np.sqrt(np.abs(scaled)) * 9 + 9.5), 0, 18
+    ).astype(int)
+    for red, green, blue in quantised:
+        result += encode83(red * 19 * 19 + green * 19 + blue, 2)
+    return result
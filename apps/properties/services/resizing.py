@@ -0,0 +1,123 @@
+import hashlib
+import math
+import os
+from io import BytesIO
+from pathlib import Path
+from typing import BinaryIO
+
+from django.conf import settings
+from django.urls import reverse
+
+from PIL import Image
+
+from apps.core.utils import DiskLRUCache
+from apps.properties.models import PropertyImage
+from apps.properties.services.images import draft, encode
+from apps.properties.storage import is_blob_name
+
+# URL extension of the formats images can be resized to.
+RESIZE_FORMATS = {"jpg": "JPEG", "webp": "WEBP"}
+CONTENT_TYPES = {"JPEG": "image/jpeg", "WEBP": "image/webp"}
+
+_cache: DiskLRUCache | None = None
+
+
+def image_cache() -> DiskLRUCache:
+    """Returns the disk cache of the resized images, following the settings."""
+    global _cache
+    directory = Path(settings.PROPERTY_IMAGE_CACHE_DIR)
+    max_bytes = settings.PROPERTY_IMAGE_CACHE_MAX_BYTES
+    if _cache is None or (_cache.directory, _cache.max_bytes) != (directory, max_bytes):
+        _cache = DiskLRUCache(directory, max_bytes)
+    return _cache
+
+
+def image_version(image: PropertyImage) -> str:
+    """
+    Returns a short token changing with the content of the image.
+
+    Content-addressed names already are the SHA-256 of the content, older
+    names are hashed (a replaced file gets a new name).
+    """
+    name: str = image.image.name
+    if is_blob_name(name):
+        digest = os.path.splitext(os.path.basename(name))[0]
+    else:
+        digest = hashlib.sha256(name.encode()).hexdigest()
+    return digest[:16]
+
+
+def canonical_width(width: int) -> int:
+    """
+    Rounds a width up to a multiple of `PROPERTY_IMAGE_RESIZE_STEP`, within
+    `PROPERTY_IMAGE_MAX_DIMENSION`, which bounds the number of resized copies
+    of each image.
+    """
+    step = settings.PROPERTY_IMAGE_RESIZE_STEP
+    width = max(step, math.ceil(width / step) * step)
+    return min(width, settings.PROPERTY_IMAGE_MAX_DIMENSION)
+
+
+def resized_url(image: PropertyImage, width: int, extension: str = "webp") -> str:
+    return reverse(
+        "apps.properties:property-image-resized",
+        kwargs={
+            "pk": image.pk,
+            "version": image_version(image),
+            "width": canonical_width(width),
+            "extension": extension,
+        },
+    )
+
+
+def resized_url_template(image: PropertyImage) -> str:
+    """
+    Returns the resized URL of an image with `{width}` and `{format}`
+    placeholders, for clients picking their own sizes.
+    """
+    step = settings.PROPERTY_IMAGE_RESIZE_STEP
+    return resized_url(image, step, "jpg").replace(
+        f"/w{step}.jpg", "/w{width}.{format}"
+    )
+
+
+class PropertyImageResizer:
+    """
+    Resizes property images on demand, for clients needing other sizes than
+    the `PROPERTY_IMAGE_VARIANTS`.
+
+    The results are cached on local disk by content version, width and
+    format, so identical images of different listings share their entries.
+    """
+
+    @staticmethod
+    def cache_key(version: str, width: int, extension: str) -> str:
+        return f"{version}-w{width}.{extension}"
+
+    @staticmethod
+    def resize(image: PropertyImage, width: int, image_format: str) -> bytes:
+        with image.image.open("rb") as f, Image.open(f) as picture:
+            draft(picture, (width, settings.PROPERTY_IMAGE_MAX_DIMENSION))
+            picture.thumbnail(
+                (width, settings.PROPERTY_IMAGE_MAX_DIMENSION),
+                Image.Resampling.LANCZOS,
+            )
+            return encode(
+                picture, settings.PROPERTY_IMAGE_VARIANT_QUALITY, image_format
+            )
+
+    @staticmethod
+    def get(image: PropertyImage, width: int, extension: str) -> BinaryIO:
+        """
+        Returns the image resized to `width` in the format of `extension`,
+        from the disk cache when possible.
+        """
+        cache = image_cache()
+        key = PropertyImageResizer.cache_key(image_version(image), width, extension)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+        data = PropertyImageResizer.resize(image, width, RESIZE_FORMATS[extension])
+        cache.set(key, data)
+        return BytesIO(data)
@@ -54,3 +54,19 @@ class PropertySearch:
             #     "filtered": base_qs.count() if property_types else None,
             # },
         }
+
+    @staticmethod
+    async def aquick_search(
+        query: str,
+        country_code: str,
+        property_types: List[str] | None = None,
+        status: List[str] | str | None = None,
+    ) -> Dict[str, Any]:
+        """`quick_search` with the results fetched by the async ORM."""
+        results = PropertySearch.quick_search(
+            query=query,
+            country_code=country_code,
+            property_types=property_types,
+            status=status,
+        )
+        return {key: [row async for row in rows] for key, rows in results.items()}
@@ -0,0 +1,53 @@
+from typing import Any, Dict, List, Tuple
+
+from django.core.files.uploadedfile import UploadedFile
+from django.db import transaction
+
+from apps.properties.models import Property, PropertyImage
+from apps.properties.serializers import PropertyImageUploadSerializer
+from apps.properties.services.detail_cache import PropertyDetailCache
+from apps.properties.services.images import PropertyImagePipeline
+
+
+class PropertyImageUpload:
+    @staticmethod
+    def upload(property: Property, files: List[UploadedFile]) -> List[Dict[str, Any]]:
+        """
+        Validates the uploaded files and stores the valid ones as images of the
+        `property`, returning the status of every file in upload order.
+
+        The images are inserted with a single `bulk_create` and processed by
+        `PropertyImagePipeline` once the transaction commits, so this returns
+        without decoding more than the image headers.
+        """
+        statuses: List[Dict[str, Any]] = []
+        accepted: List[Tuple[Dict[str, Any], PropertyImage]] = []
+        for file in files:
+            serializer = PropertyImageUploadSerializer(data={"image": file})
+            if serializer.is_valid():
+                status: Dict[str, Any] = {"name": file.name, "status": "accepted"}
+                image = PropertyImage(property=property, **serializer.validated_data)
+                accepted.append((status, image))
+            else:
+                status = {
+                    "name": file.name,
+                    "status": "rejected",
+                    "errors": serializer.errors["image"],
+                }
+            statuses.append(status)
+
+        images = [image for _, image in accepted]
+
+        with transaction.atomic():
+            PropertyImage.objects.bulk_create(images)
+            if images and all(image.pk for image in images):
+                PropertyImagePipeline.schedule([image.pk for image in images])
+            elif images:
+                # Databases which do not return the primary keys of bulk inserts.
+                PropertyImagePipeline.schedule_property(property.pk)
+            # `bulk_create` does not send `post_save`.
+            PropertyDetailCache.invalidate([property.pk])
+
+        for status, image in accepted:
+            status["id"] = image.pk
+        return statuses
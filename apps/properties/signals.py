@@ -0,0 +1,52 @@
+from typing import Any
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Property, PropertyImage
+from .services.detail_cache import PropertyDetailCache
+from .services.images import PropertyImagePipeline
+
+
+@receiver(post_save, sender=PropertyImage)
+def process_uploaded_image(
+    sender: type[PropertyImage],
+    instance: PropertyImage,
+    created: bool,
+    **kwargs: Any,
+) -> None:
+    if created and not kwargs.get("raw"):
+        PropertyImagePipeline.schedule([instance.pk])
+
+
+@receiver(post_delete, sender=PropertyImage)
+def release_image_files(
+    sender: type[PropertyImage], instance: PropertyImage, **kwargs: Any
+) -> None:
+    """
+    Releases the files of a deleted image (also when its property is deleted).
+    Shared content-addressed files are only removed with their last reference.
+    """
+    storage = instance.image.storage
+    names = [instance.image.name, *instance.variants.values()]
+
+    def release() -> None:
+        for name in names:
+            if name:
+                storage.delete(name)
+
+    transaction.on_commit(release)
+
+
+@receiver([post_save, post_delete], sender=Property)
+@receiver([post_save, post_delete], sender=PropertyImage)
+def invalidate_property_detail(
+    sender: type[Property] | type[PropertyImage],
+    instance: Property | PropertyImage,
+    **kwargs: Any,
+) -> None:
+    property_id = (
+        instance.pk if isinstance(instance, Property) else instance.property_id
+    )
+    PropertyDetailCache.invalidate([property_id])
@@ -0,0 +1,108 @@
+import hashlib
+import os
+from typing import Any, IO, Type
+
+from django.apps import apps
+from django.core.files.storage import FileSystemStorage, Storage, storages
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+# Content-addressed files live under this prefix, e.g.
+# `media/property/blobs/3f/a2/3fa2...c1.jpg`.
+BLOB_PREFIX = "media/property/blobs"
+
+
+def property_image_storage() -> Storage:
+    """Storage of `PropertyImage.image`, the `property_images` alias of `STORAGES`."""
+    return storages["property_images"]
+
+
+def image_blob_model() -> Type[Any]:
+    # Imported lazily, the storage is instantiated while the models load.
+    return apps.get_model("properties", "ImageBlob")
+
+
+def content_hash(content: IO[Any]) -> str:
+    sha256 = hashlib.sha256()
+    for chunk in content.chunks():  # type: ignore[attr-defined]
+        sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def blob_name(digest: str, extension: str) -> str:
+    """Two levels of 256 shards keep every directory small."""
+    return f"{BLOB_PREFIX}/{digest[:2]}/{digest[2:4]}/{digest}{extension.lower()}"
+
+
+def is_blob_name(name: str) -> bool:
+    return name.startswith(f"{BLOB_PREFIX}/")
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File system storage naming files after the SHA-256 of their content and
+    their extension.
+
+    Saving content which is already stored returns the existing name instead
+    of writing a copy, so a photo uploaded for several listings is stored
+    once. References are counted in `ImageBlob.ref_count`: every save adds
+    one, every delete releases one and the file is only removed with its
+    last reference. The name passed to `save` (`property_image_path`) is only
+    used for its extension.
+
+    Files stored before this storage was introduced keep their names and are
+    deleted as usual.
+    """
+
+    def _save(self, name: str, content: Any) -> str:
+        ImageBlob = image_blob_model()
+        digest = content_hash(content)
+        name = blob_name(digest, os.path.splitext(name)[1])
+
+        # The row is locked while the file is checked and written, so that a
+        # concurrent `delete` of the last reference cannot remove the file
+        # between the check and the new reference.
+        with transaction.atomic():
+            blob, created = ImageBlob.objects.select_for_update().get_or_create(
+                name=name, defaults={"hash": digest, "size": 0}
+            )
+            if not self.exists(name):
+                stored_name = super()._save(name, content)  # type: ignore[misc]
+                if stored_name != name:
+                    # Another process stored the same content meanwhile.
+                    super().delete(stored_name)
+            # `updated_at` tells the garbage collector that a reference may
+            # be in flight.
+            ImageBlob.objects.filter(pk=blob.pk).update(
+                ref_count=F("ref_count") + 1,
+                size=self.size(name),
+                updated_at=timezone.now(),
+            )
+        return name
+
+    def delete(self, name: str) -> None:
+        if not is_blob_name(name):
+            return super().delete(name)
+
+        ImageBlob = image_blob_model()
+        with transaction.atomic():
+            blob = ImageBlob.objects.select_for_update().filter(name=name).first()
+            if blob is None or blob.ref_count == 0:
+                return
+            if blob.ref_count > 1:
+                ImageBlob.objects.filter(pk=blob.pk).update(
+                    ref_count=F("ref_count") - 1
+                )
+                return
+            blob.delete()
+            # Under the lock: a concurrent `_save` waits, then stores the file
+            # again.
+            super().delete(name)
+
+    def purge(self, name: str) -> None:
+        """
+        Removes the file regardless of its reference count, for the garbage
+        collector which reconciles the `ImageBlob` rows itself.
+        """
+        super().delete(name)
@@ -1,9 +1,23 @@
 from .test_setup import TestSetUp
+from .detail_cache_tests import TestPropertyDetailCache
+from .image_duplicate_tests import TestImageDuplicates
+from .image_pipeline_tests import TestImagePipeline
+from .image_resize_tests import TestImageResizing
+from .image_storage_tests import TestContentAddressedStorage
+from .image_upload_tests import TestImageUpload
 from .property_api_tests import TestPropertyAPI
 from .search_api_tests import TestSearchAPI
+from .synthetic_data_tests import TestSyntheticData
 
 __all__ = [
     "TestSetUp",
+    "TestPropertyDetailCache",
+    "TestImageDuplicates",
+    "TestImagePipeline",
+    "TestImageResizing",
+    "TestContentAddressedStorage",
+    "TestImageUpload",
     "TestPropertyAPI",
     "TestSearchAPI",
+    "TestSyntheticData",
 ]
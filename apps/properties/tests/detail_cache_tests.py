@@ -0,0 +1,89 @@
+from django.core.cache import cache
+from django.urls import reverse
+
+from prometheus_client import REGISTRY
+
+from apps.favorites.services.counts import reconcile_favorite_counts
+from apps.properties.models import Property, PropertyImage
+from apps.properties.services.detail_cache import (
+    PropertyDetailCache,
+    local_detail_cache,
+)
+
+from .test_setup import TestSetUp
+
+
+def cache_requests(tier, result):
+    value = REGISTRY.get_sample_value(
+        "cache_requests_total",
+        {"cache": "property_detail", "tier": tier, "result": result},
+    )
+    return value or 0
+
+
+class TestPropertyDetailCache(TestSetUp):
+    def setUp(self) -> None:
+        super().setUp()
+        local_detail_cache().clear()
+        self.property = self.create_property()
+        self.url = reverse(
+            "apps.properties:properties-detail", kwargs={"pk": self.property.pk}
+        )
+
+    def test_details_are_cached(self) -> None:
+        local_hits = cache_requests("local", "hit")
+        shared_hits = cache_requests("shared", "hit")
+        shared_misses = cache_requests("shared", "miss")
+
+        res = self.client.get(self.url)
+        self.assertEqual(res.status_code, 200)
+        version = cache.get(PropertyDetailCache.version_key(self.property.pk))
+        key = f"properties:detail:{self.property.pk}:{version}:http://testserver/"
+        # Not a `ReturnDict`, which would keep the serializer and the request.
+        self.assertIs(type(local_detail_cache().get(key)), dict)
+        with self.assertNumQueries(0):
+            cached = self.client.get(self.url)
+        self.assertEqual(cached.json(), res.json())
+
+        # Another worker.
+        local_detail_cache().clear()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url).json(), res.json())
+
+        self.assertEqual(cache_requests("shared", "miss") - shared_misses, 1)
+        self.assertEqual(cache_requests("local", "hit") - local_hits, 1)
+        self.assertEqual(cache_requests("shared", "hit") - shared_hits, 1)
+
+    def test_writes_invalidate_the_details(self) -> None:
+        self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.property.price = 60000
+            self.property.save()
+        self.assertEqual(self.client.get(self.url).data["price"], 60000)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            image = PropertyImage.objects.create(
+                property=self.property, image="properties/image.jpg"
+            )
+        self.assertEqual(len(self.client.get(self.url).data["property_images"]), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            image.delete()
+        self.assertEqual(self.client.get(self.url).data["property_images"], [])
+
+    def test_bulk_updates_invalidate_the_details(self) -> None:
+        Property.objects.filter(pk=self.property.pk).update(favorite_count=3)
+        self.assertEqual(self.client.get(self.url).data["favorite_count"], 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(reconcile_favorite_counts(), 1)
+
+        self.assertEqual(self.client.get(self.url).data["favorite_count"], 0)
+
+    def test_unknown_property(self) -> None:
+        res = self.client.get(reverse("apps.properties:properties-list") + "abc/")
+        self.assertEqual(res.status_code, 404)
+
+        url = reverse("apps.properties:properties-detail", kwargs={"pk": 0})
+        self.assertEqual(self.client.get(url).status_code, 404)
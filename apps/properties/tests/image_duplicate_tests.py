@@ -0,0 +1,225 @@
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+
+import numpy as np
+
+from PIL import Image, ImageChops
+
+from apps.properties.models import NearDuplicate, PropertyImage
+from apps.properties.services.duplicates import (
+    BAND_WIDTHS,
+    HASH_BITS,
+    MAX_DISTANCE,
+    NearDuplicateImages,
+    dhash,
+    hamming_distance,
+    hash_bands,
+    to_signed,
+)
+
+from .test_setup import TestSetUp
+
+User = get_user_model()
+
+
+def photo(angle=0, size=(1600, 1200)):
+    """A smooth image whose structure changes with `angle`."""
+    radial = Image.radial_gradient("L").resize(size)
+    linear = Image.linear_gradient("L").rotate(angle).resize(size)
+    return Image.merge("RGB", (radial, linear, ImageChops.multiply(radial, linear)))
+
+
+def photo_file(picture, name="photo.jpg", **options):
+    buffer = BytesIO()
+    picture.save(buffer, format="JPEG", **options)
+    return SimpleUploadedFile(name, buffer.getvalue())
+
+
+class TestImageDuplicates(TestSetUp):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.staff = User.objects.create_user(
+            email="staff@example.com",
+            password="staffpass123",
+            first_name="Staff",
+            last_name="User",
+            is_staff=True,
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings = override_settings(
+            MEDIA_ROOT=self.media_root, PROPERTY_IMAGE_WORKERS=0
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.url = reverse("apps.properties:property-image-duplicates")
+
+    def upload(self, property, file):
+        with self.captureOnCommitCallbacks(execute=True):
+            image = PropertyImage.objects.create(property=property, image=file)
+        image.refresh_from_db()
+        return image
+
+    def test_dhash_is_close_for_resized_and_recompressed_copies(self):
+        original = photo()
+        buffer = BytesIO()
+        original.resize((640, 480)).save(buffer, format="JPEG", quality=40)
+        with Image.open(buffer) as copy:
+            self.assertLessEqual(hamming_distance(dhash(original), dhash(copy)), 1)
+        self.assertGreater(hamming_distance(dhash(original), dhash(photo(90))), 10)
+
+    def test_pipeline_stores_the_hash(self):
+        image = self.upload(self.create_property(), photo_file(photo()))
+
+        self.assertIsNotNone(image.perceptual_hash)
+        self.assertEqual(image.perceptual_hash, to_signed(dhash(photo())))
+
+    def test_bands_split_the_hash(self):
+        value = dhash(photo())
+        bands = hash_bands(to_signed(value))
+
+        self.assertEqual(sum(BAND_WIDTHS), HASH_BITS)
+        self.assertEqual(
+            sum(band << sum(BAND_WIDTHS[:i]) for i, band in enumerate(bands)), value
+        )
+
+    def test_pairs_are_found_up_to_the_max_distance(self):
+        rng = np.random.default_rng(0)
+        hashes = list(rng.integers(0, 1 << 63, 200, dtype=np.uint64) << np.uint64(1))
+        # Copies of the first hashes with 0 to `MAX_DISTANCE` + 1 bits flipped.
+        for distance, value in enumerate(hashes[: MAX_DISTANCE + 2]):
+            bits = rng.choice(HASH_BITS, distance, replace=False)
+            hashes.append(value ^ np.uint64(sum(1 << int(bit) for bit in bits)))
+        hashes_array = np.array(hashes, dtype=np.uint64)
+        groups = np.arange(len(hashes))
+
+        expected = {
+            (first, second): distance
+            for first in range(len(hashes))
+            for second in range(first + 1, len(hashes))
+            if (distance := hamming_distance(int(hashes[first]), int(hashes[second])))
+            <= MAX_DISTANCE
+        }
+        self.assertEqual(len(expected), MAX_DISTANCE + 1)
+        self.assertEqual(NearDuplicateImages.pairs(hashes_array, groups), expected)
+        self.assertEqual(
+            NearDuplicateImages.pairs(hashes_array, groups, max_distance=4),
+            {pair: distance for pair, distance in expected.items() if distance <= 4},
+        )
+
+    def test_report_requires_staff(self):
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_report_lists_near_duplicates_across_listings(self):
+        listing, other_listing = self.create_property(), self.create_property()
+        original = self.upload(listing, photo_file(photo()))
+        # The same photo, smaller and recompressed, on another listing.
+        copy = self.upload(
+            other_listing, photo_file(photo().resize((800, 600)), quality=50)
+        )
+        # Similar photos of the same listing are expected.
+        self.upload(listing, photo_file(photo(), quality=60))
+        self.upload(other_listing, photo_file(photo(90)))
+
+        NearDuplicateImages.refresh()
+        self.client.force_authenticate(self.staff)
+        # The stored pairs and their count, the hashes are not compared.
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        pairs = {
+            frozenset((result["first"]["id"], result["second"]["id"]))
+            for result in response.data["results"]
+        }
+        self.assertIn(frozenset((original.id, copy.id)), pairs)
+        for result in response.data["results"]:
+            self.assertNotEqual(
+                result["first"]["property"], result["second"]["property"]
+            )
+            self.assertLessEqual(result["distance"], MAX_DISTANCE)
+            self.assertIn("card", result["first"]["variants"])
+
+    def test_report_is_paginated(self):
+        listings = [self.create_property() for _ in range(3)]
+        for index, listing in enumerate(listings):
+            self.upload(listing, photo_file(photo(), quality=50 + 10 * index))
+        NearDuplicateImages.refresh()
+
+        self.client.force_authenticate(self.staff)
+        response = self.client.get(self.url, {"page_size": 2})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 3)
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertIsNotNone(response.data["next"])
+
+    def test_exact_duplicates_are_skipped(self):
+        content = photo_file(photo()).read()
+        first = self.upload(
+            self.create_property(), SimpleUploadedFile("a.jpg", content)
+        )
+        second = self.upload(
+            self.create_property(), SimpleUploadedFile("b.jpg", content)
+        )
+        self.assertEqual(first.image.name, second.image.name)
+
+        self.assertEqual(NearDuplicateImages.find(), [])
+
+    def test_crowded_bands_are_skipped(self):
+        hashes = np.zeros(4, dtype=np.uint64)
+        groups = np.arange(4)
+
+        self.assertEqual(
+            len(NearDuplicateImages.pairs(hashes, groups, max_bucket_size=4)), 6
+        )
+        self.assertEqual(
+            NearDuplicateImages.pairs(hashes, groups, max_bucket_size=3), {}
+        )
+
+    def test_deleted_images_leave_the_report(self):
+        listing, other_listing = self.create_property(), self.create_property()
+        self.upload(listing, photo_file(photo()))
+        copy = self.upload(other_listing, photo_file(photo(), quality=50))
+        self.assertEqual(NearDuplicateImages.refresh(), 1)
+
+        copy.delete()
+
+        self.assertFalse(NearDuplicate.objects.exists())
+
+    def test_report_validates_max_distance(self):
+        self.client.force_authenticate(self.staff)
+        for value in ["-1", str(MAX_DISTANCE + 1), "x"]:
+            response = self.client.get(self.url, {"max_distance": value})
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("max_distance", response.data)
+
+    def test_hash_property_images_fills_missing_hashes(self):
+        image = self.upload(self.create_property(), photo_file(photo()))
+        expected = image.perceptual_hash
+        copy = self.upload(self.create_property(), photo_file(photo(), quality=50))
+        PropertyImage.objects.update(perceptual_hash=None)
+
+        call_command("hash_property_images", stdout=StringIO())
+
+        image.refresh_from_db()
+        # Hashed from the card variant, which has the same structure.
+        self.assertLessEqual(hamming_distance(image.perceptual_hash, expected), 1)
+        # The report is stored.
+        self.assertEqual(
+            list(NearDuplicate.objects.values_list("first", "second")),
+            [(image.id, copy.id)],
+        )
@@ -0,0 +1,246 @@
+import os
+import shutil
+import tempfile
+from io import BytesIO
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+
+from PIL import Image
+
+from apps.properties.models import ImageBlob, PropertyImage
+from apps.properties.serializers import PropertyImageSerializer
+from apps.properties.services.images import (
+    PropertyImagePipeline,
+    draft,
+    normalize,
+    perceptual_hash,
+)
+from apps.properties.services.placeholders import blurhash
+
+from .test_setup import TestSetUp
+
+
+def image_file(name="photo.jpg", size=(3000, 2000), format="JPEG", **options):
+    buffer = BytesIO()
+    Image.new("RGB", size, color=(200, 120, 40)).save(buffer, format=format, **options)
+    return SimpleUploadedFile(name, buffer.getvalue())
+
+
+class TestImagePipeline(TestSetUp):
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings = override_settings(
+            MEDIA_ROOT=self.media_root, PROPERTY_IMAGE_WORKERS=0
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.property = self.create_property()
+
+    def upload(self, file):
+        with self.captureOnCommitCallbacks(execute=True):
+            image = PropertyImage.objects.create(property=self.property, image=file)
+        image.refresh_from_db()
+        return image
+
+    def test_variants_are_generated_after_upload(self):
+        image = self.upload(image_file())
+
+        self.assertEqual(set(image.variants), {"card", "gallery", "full"})
+        storage = image.image.storage
+        for name, (width, height) in {
+            "card": (480, 360),
+            "gallery": (1280, 960),
+            "full": (2048, 1536),
+        }.items():
+            path = image.variants[name]
+            self.assertTrue(path.startswith("media/property/blobs/"))
+            self.assertTrue(path.endswith(".jpg"))
+            with storage.open(path) as f, Image.open(f) as variant:
+                self.assertEqual(variant.format, "JPEG")
+                self.assertLessEqual(variant.width, width)
+                self.assertLessEqual(variant.height, height)
+                # The aspect ratio is kept.
+                self.assertAlmostEqual(variant.width / variant.height, 1.5, places=1)
+
+    def test_small_images_are_not_upscaled(self):
+        image = self.upload(image_file("small.png", size=(300, 200), format="PNG"))
+
+        with image.image.storage.open(image.variants["full"]) as f, Image.open(
+            f
+        ) as variant:
+            self.assertEqual(variant.size, (300, 200))
+
+    def test_images_are_not_processed_before_commit(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            image = PropertyImage.objects.create(
+                property=self.property, image=image_file()
+            )
+
+        image.refresh_from_db()
+        self.assertEqual(image.variants, {})
+        # Processing the image, and invalidating the cached property detail.
+        self.assertEqual(len(callbacks), 2)
+
+    def test_invalid_image_is_skipped(self):
+        with self.assertLogs("apps.properties.services.images", "ERROR"):
+            image = self.upload(SimpleUploadedFile("broken.jpg", b"not an image"))
+        self.assertEqual(image.variants, {})
+
+    def test_failed_runs_release_the_saved_blobs(self):
+        def fail(processing):
+            raise ValueError("placeholder")
+
+        stages = [normalize, perceptual_hash, fail]
+        with mock.patch.object(PropertyImagePipeline, "STAGES", stages):
+            with self.assertLogs("apps.properties.services.images", "ERROR"):
+                image = self.upload(image_file())
+
+        self.assertEqual(image.variants, {})
+        # Only the upload is referenced, the normalized blob was released.
+        self.assertEqual(
+            list(ImageBlob.objects.filter(ref_count__gt=0).values_list("name")),
+            [(image.image.name,)],
+        )
+        self.assertEqual(
+            set(os.listdir(os.path.dirname(image.image.path))),
+            {os.path.basename(image.image.name)},
+        )
+
+    def test_schedule_property_processes_bulk_created_images(self):
+        PropertyImage.objects.bulk_create(
+            [
+                PropertyImage(
+                    property=self.property, image=image_file(f"{i}.jpg", (800, 600))
+                )
+                for i in range(2)
+            ]
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            PropertyImagePipeline.schedule_property(self.property.id)
+
+        self.assertFalse(PropertyImage.objects.filter(variants={}).exists())
+
+    def test_serializer_exposes_variant_urls(self):
+        image = self.upload(image_file())
+        request = self.factory.get("/")
+
+        data = PropertyImageSerializer(image, context={"request": request}).data
+        self.assertTrue(data["variants"]["card"].startswith("http://testserver/"))
+        self.assertTrue(data["variants"]["card"].endswith(".jpg"))
+
+    def test_uploads_are_oriented_and_stripped(self):
+        exif = Image.Exif()
+        exif[0x0112] = 6  # Orientation: rotated 90° clockwise
+        exif[0x010F] = "Camera maker"
+        image = self.upload(image_file(size=(300, 200), exif=exif.tobytes()))
+
+        storage = image.image.storage
+        with storage.open(image.image.name) as f, Image.open(f) as stored:
+            self.assertEqual(stored.size, (200, 300))
+            self.assertFalse(stored.getexif())
+        self.assertEqual(image.size, storage.size(image.image.name))
+        self.assertGreater(image.original_size, 0)
+        # The upload is replaced, and the three variants of a small image
+        # are identical, so they are stored once.
+        self.assertEqual(ImageBlob.objects.count(), 2)
+        self.assertEqual(
+            ImageBlob.objects.get(name=image.variants["card"]).ref_count, 3
+        )
+
+    def test_bmp_uploads_are_reencoded(self):
+        image = self.upload(image_file("scan.bmp", size=(1200, 800), format="BMP"))
+
+        self.assertTrue(image.image.name.endswith(".jpg"))
+        self.assertLess(image.size, image.original_size)
+
+    @override_settings(PROPERTY_IMAGE_MAX_DIMENSION=1000)
+    def test_large_uploads_are_downscaled(self):
+        image = self.upload(image_file())
+
+        with image.image.storage.open(image.image.name) as f, Image.open(f) as stored:
+            self.assertEqual(stored.size, (1000, 667))
+            self.assertEqual(stored.info.get("progressive"), 1)
+
+    @override_settings(PROPERTY_IMAGE_FORMAT="WEBP")
+    def test_webp_format(self):
+        image = self.upload(image_file("photo.png", size=(600, 400), format="PNG"))
+
+        self.assertTrue(image.image.name.endswith(".webp"))
+        self.assertTrue(image.variants["card"].endswith(".webp"))
+        with image.image.storage.open(image.image.name) as f, Image.open(f) as stored:
+            self.assertEqual(stored.format, "WEBP")
+
+    def test_compact_uploads_are_kept(self):
+        buffer = BytesIO()
+        Image.effect_noise((600, 400), 60).convert("RGB").save(
+            buffer, "JPEG", quality=30
+        )
+        image = self.upload(SimpleUploadedFile("photo.jpg", buffer.getvalue()))
+
+        self.assertEqual(image.size, image.original_size)
+        with image.image.open("rb") as f:
+            self.assertEqual(f.read(), buffer.getvalue())
+
+    def test_large_jpegs_are_decoded_at_a_reduced_scale(self):
+        with Image.open(image_file()) as picture:
+            draft(picture, (500, 500))
+            # The smallest of 1/2, 1/4 and 1/8 still covering 500x500.
+            self.assertEqual(picture.size, (750, 500))
+
+        with Image.open(image_file("photo.png", format="PNG")) as picture:
+            draft(picture, (500, 500))
+            self.assertEqual(picture.size, (3000, 2000))
+
+    @override_settings(PROPERTY_IMAGE_MAX_DIMENSION=1500)
+    def test_drafted_uploads_are_downscaled(self):
+        # Decoded at exactly the maximum dimension, still replaced.
+        image = self.upload(image_file())
+
+        with image.image.storage.open(image.image.name) as f, Image.open(f) as stored:
+            self.assertEqual(stored.size, (1500, 1000))
+        self.assertLess(image.size, image.original_size)
+
+    @override_settings(PROPERTY_IMAGE_MAX_PIXELS=1_000_000)
+    def test_images_with_too_many_pixels_are_rejected(self):
+        serializer = PropertyImageSerializer(
+            data={"image": image_file(), "property": self.property.id}
+        )
+
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(
+            serializer.errors["image"], ["Images can have at most 1 megapixels."]
+        )
+        # Images stored before the limit are not decoded either.
+        image = self.upload(image_file())
+        self.assertEqual(image.variants, {})
+
+    def test_placeholder_is_stored(self):
+        image = self.upload(image_file())
+
+        # 4x3 components, the flat image has no AC component.
+        self.assertEqual(len(image.blurhash), 28)
+        self.assertEqual(image.blurhash[0], "L")
+        flat = blurhash(Image.new("RGB", (8, 8), (200, 120, 40)))
+        # The average colour (characters 2 to 5) is shifted by JPEG.
+        self.assertEqual(image.blurhash[6:], flat[6:])
+
+    def test_list_includes_the_primary_image_placeholder(self):
+        self.upload(image_file())
+        primary = self.upload(image_file(size=(600, 400)))
+        PropertyImage.objects.filter(pk=primary.pk).update(is_primary=True)
+        self.create_property()
+        url = reverse("apps.properties:properties-list")
+
+        # The properties and their images, whatever the number of properties.
+        with self.assertNumQueries(2):
+            response = self.client.get(url, {"country_code": "MK"})
+
+        images = {item["id"]: item["image"] for item in response.data}
+        self.assertEqual(images[self.property.id]["blurhash"], primary.blurhash)
+        self.assertIn("card", images[self.property.id]["variants"])
+        self.assertEqual(len([image for image in images.values() if image]), 1)
@@ -0,0 +1,112 @@
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.test import override_settings
+
+from PIL import Image
+
+from apps.properties.models import PropertyImage
+from apps.properties.serializers import PropertyImageSerializer
+from apps.properties.services.resizing import image_cache, image_version, resized_url
+
+from .image_pipeline_tests import image_file
+from .test_setup import TestSetUp
+
+
+class TestImageResizing(TestSetUp):
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings = override_settings(
+            MEDIA_ROOT=self.media_root,
+            PROPERTY_IMAGE_WORKERS=0,
+            PROPERTY_IMAGE_CACHE_DIR=f"{self.media_root}/cache",
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.image = PropertyImage.objects.create(
+                property=self.create_property(), image=image_file()
+            )
+        self.image.refresh_from_db()
+
+    def test_image_is_resized_and_cached(self):
+        url = resized_url(self.image, 640, "webp")
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "image/webp")
+        self.assertEqual(
+            response["Cache-Control"], "public, max-age=31536000, immutable"
+        )
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        content = b"".join(response.streaming_content)
+        with Image.open(BytesIO(content)) as picture:
+            self.assertEqual(picture.format, "WEBP")
+            self.assertEqual(picture.size, (640, 427))
+
+        cached = image_cache().get(f"{image_version(self.image)}-w640.webp")
+        self.assertIsNotNone(cached)
+        with cached:
+            self.assertEqual(cached.read(), content)
+
+        # Served from the disk cache, without opening the original.
+        self.image.image.storage.delete(self.image.image.name)
+        response = self.client.get(url)
+        self.assertEqual(b"".join(response.streaming_content), content)
+
+    def test_conditional_request(self):
+        url = resized_url(self.image, 320, "jpg")
+        etag = self.client.get(url)["ETag"]
+
+        response = self.client.get(url, headers={"If-None-Match": etag})
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_range_request(self):
+        url = resized_url(self.image, 320, "jpg")
+        content = b"".join(self.client.get(url).streaming_content)
+
+        response = self.client.get(url, headers={"Range": "bytes=10-19"})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.content, content[10:20])
+        self.assertEqual(response["Content-Range"], f"bytes 10-19/{len(content)}")
+
+        response = self.client.get(url, headers={"Range": f"bytes={len(content)}-"})
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], f"bytes */{len(content)}")
+
+    def test_non_canonical_urls_redirect(self):
+        canonical = resized_url(self.image, 640, "jpg")
+        self.assertTrue(canonical.endswith("/w640.jpg"))
+
+        response = self.client.get(canonical.replace("w640", "w600"))
+        self.assertEqual(response.status_code, 301)
+        self.assertEqual(response["Location"], canonical)
+
+        response = self.client.get(
+            canonical.replace(image_version(self.image), "0" * 16)
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response["Location"], canonical)
+
+    def test_unknown_image_or_format(self):
+        url = resized_url(self.image, 640, "jpg")
+        self.assertEqual(self.client.get(url.replace(".jpg", ".gif")).status_code, 404)
+        self.assertEqual(
+            self.client.get(
+                url.replace(f"/images/{self.image.pk}/", "/images/0/")
+            ).status_code,
+            404,
+        )
+
+    def test_serializer_exposes_resize_url_template(self):
+        data = PropertyImageSerializer(self.image).data
+
+        self.assertEqual(
+            data["resize_url"],
+            f"/api/v1/properties/images/{self.image.pk}/"
+            f"{image_version(self.image)}/w{{width}}.{{format}}",
+        )
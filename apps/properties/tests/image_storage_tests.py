@@ -0,0 +1,160 @@
+import os
+import shutil
+import tempfile
+import time
+from io import StringIO
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import override_settings
+
+from apps.properties.management.commands.gc_image_blobs import Command
+from apps.properties.models import ImageBlob, PropertyImage
+from apps.properties.storage import property_image_storage
+
+from .image_pipeline_tests import image_file
+from .test_setup import TestSetUp
+
+
+class TestContentAddressedStorage(TestSetUp):
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings = override_settings(
+            MEDIA_ROOT=self.media_root, PROPERTY_IMAGE_WORKERS=0
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.storage = property_image_storage()
+
+    def upload(self, property, file):
+        with self.captureOnCommitCallbacks(execute=True):
+            image = PropertyImage.objects.create(property=property, image=file)
+        image.refresh_from_db()
+        return image
+
+    def test_same_content_is_stored_once(self):
+        first = self.upload(self.create_property(), image_file("a.jpg"))
+        second = self.upload(self.create_property(), image_file("b.jpg"))
+
+        self.assertEqual(first.image.name, second.image.name)
+        self.assertEqual(first.variants, second.variants)
+        self.assertRegex(
+            first.image.name, r"^media/property/blobs/(\w\w)/(\w\w)/\1\2\w{60}\.jpg$"
+        )
+        # The original and 3 variants, shared by both images.
+        self.assertEqual(ImageBlob.objects.count(), 4)
+        self.assertEqual(ImageBlob.objects.get(name=first.image.name).ref_count, 2)
+
+    def test_files_are_deleted_with_their_last_reference(self):
+        first_property, second_property = self.create_property(), self.create_property()
+        image = self.upload(first_property, image_file())
+        self.upload(second_property, image_file())
+        names = [image.image.name, *image.variants.values()]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first_property.delete()
+        self.assertTrue(all(self.storage.exists(name) for name in names))
+        self.assertEqual(ImageBlob.objects.get(name=image.image.name).ref_count, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second_property.delete()
+        self.assertFalse(any(self.storage.exists(name) for name in names))
+        self.assertFalse(ImageBlob.objects.exists())
+
+    def test_gc_image_blobs(self):
+        image = self.upload(self.create_property(), image_file())
+        # A leaked reference, e.g. from a failed transaction.
+        ImageBlob.objects.filter(name=image.image.name).update(ref_count=5)
+        unreferenced = self.storage.save("x.jpg", ContentFile(b"unreferenced"))
+        orphan = "media/property/blobs/ab/cd/abcd.jpg"
+        # A file without a row, e.g. left behind by a crashed worker.
+        os.makedirs(os.path.dirname(self.storage.path(orphan)))
+        with open(self.storage.path(orphan), "wb") as file:
+            file.write(b"orphan")
+
+        call_command("gc_image_blobs", stdout=StringIO())
+        # Recent files may belong to uploads in flight.
+        self.assertTrue(self.storage.exists(unreferenced))
+        self.assertEqual(ImageBlob.objects.get(name=image.image.name).ref_count, 5)
+
+        past = time.time() - 2 * 60 * 60
+        for name in (unreferenced, orphan):
+            os.utime(self.storage.path(name), (past, past))
+        ImageBlob.objects.update(updated_at="2000-01-01T00:00Z")
+
+        out = StringIO()
+        call_command("gc_image_blobs", dry_run=True, stdout=out)
+        self.assertTrue(self.storage.exists(unreferenced))
+        self.assertIn(f"Orphan file: {orphan}", out.getvalue())
+
+        call_command("gc_image_blobs", stdout=StringIO())
+        self.assertFalse(self.storage.exists(unreferenced))
+        self.assertFalse(self.storage.exists(orphan))
+        self.assertFalse(ImageBlob.objects.filter(name=unreferenced).exists())
+        self.assertTrue(self.storage.exists(image.image.name))
+        self.assertEqual(ImageBlob.objects.get(name=image.image.name).ref_count, 1)
+
+    def test_gc_image_blobs_with_a_concurrent_reference(self):
+        name = self.storage.save("x.jpg", ContentFile(b"content"))
+        # Unreferenced for long.
+        ImageBlob.objects.update(ref_count=0, updated_at="2000-01-01T00:00Z")
+        references = Command.references
+        uploads = []
+
+        def upload_during_the_sweep(images):
+            counted = references(images)
+            if not uploads:
+                # Dedups onto the blob the sweep found unreferenced.
+                uploads.append(self.storage.save("y.jpg", ContentFile(b"content")))
+                PropertyImage.objects.create(
+                    property=self.create_property(), image=uploads[0]
+                )
+            return counted
+
+        with mock.patch.object(
+            Command, "references", staticmethod(upload_during_the_sweep)
+        ):
+            call_command("gc_image_blobs", stdout=StringIO())
+
+        self.assertEqual(uploads, [name])
+        self.assertTrue(self.storage.exists(name))
+        self.assertEqual(ImageBlob.objects.get(name=name).ref_count, 1)
+
+    def test_same_content_with_another_extension(self):
+        jpg = self.storage.save("x.jpg", ContentFile(b"content"))
+        jpeg = self.storage.save("y.jpeg", ContentFile(b"content"))
+
+        self.assertNotEqual(jpg, jpeg)
+        for name in (jpg, jpeg):
+            self.assertEqual(ImageBlob.objects.get(name=name).ref_count, 1)
+
+        property = self.create_property()
+        PropertyImage.objects.bulk_create(
+            [PropertyImage(property=property, image=name) for name in (jpg, jpeg)]
+        )
+        past = time.time() - 2 * 60 * 60
+        for name in (jpg, jpeg):
+            os.utime(self.storage.path(name), (past, past))
+        ImageBlob.objects.update(updated_at="2000-01-01T00:00Z")
+        call_command("gc_image_blobs", stdout=StringIO())
+        self.assertTrue(self.storage.exists(jpg))
+        self.assertTrue(self.storage.exists(jpeg))
+
+        self.storage.delete(jpeg)
+        self.assertFalse(self.storage.exists(jpeg))
+        self.assertTrue(self.storage.exists(jpg))
+        self.assertEqual(ImageBlob.objects.get(name=jpg).ref_count, 1)
+
+    def test_content_is_stored_again_after_its_last_reference(self):
+        name = self.storage.save("x.jpg", ContentFile(b"content"))
+        self.storage.delete(name)
+        self.assertFalse(self.storage.exists(name))
+        self.assertFalse(ImageBlob.objects.exists())
+
+        self.assertEqual(self.storage.save("y.jpg", ContentFile(b"content")), name)
+        self.assertTrue(self.storage.exists(name))
+        blob = ImageBlob.objects.get(name=name)
+        self.assertEqual((blob.ref_count, blob.size), (1, len(b"content")))
@@ -0,0 +1,99 @@
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+
+from apps.properties.models import PropertyImage
+
+from .image_pipeline_tests import image_file
+from .test_setup import TestSetUp
+
+User = get_user_model()
+
+
+class TestImageUpload(TestSetUp):
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings = override_settings(
+            MEDIA_ROOT=self.media_root, PROPERTY_IMAGE_WORKERS=0
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.property = self.create_property(owner=self.user)
+        self.url = reverse("apps.properties:properties-images", args=[self.property.id])
+
+    def post(self, files):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(self.url, {"images": files}, format="multipart")
+
+    def test_upload_images(self):
+        self.client.force_authenticate(self.user)
+        response = self.post(
+            [
+                image_file("kitchen.jpg", size=(600, 400)),
+                SimpleUploadedFile("plan.pdf", b"%PDF-1.4"),
+                image_file("garden.png", size=(600, 400), format="PNG"),
+            ]
+        )
+
+        self.assertEqual(response.status_code, 202)
+        results = response.data["results"]
+        self.assertEqual(
+            [(result["name"], result["status"]) for result in results],
+            [
+                ("kitchen.jpg", "accepted"),
+                ("plan.pdf", "rejected"),
+                ("garden.png", "accepted"),
+            ],
+        )
+        self.assertTrue(results[1]["errors"])
+        images = PropertyImage.objects.filter(property=self.property).order_by("id")
+        self.assertEqual(
+            [image.id for image in images], [results[0]["id"], results[2]["id"]]
+        )
+        # Processed in the background once committed.
+        for image in images:
+            self.assertEqual(set(image.variants), {"card", "gallery", "full"})
+
+    def test_upload_requires_the_owner(self):
+        response = self.post([image_file()])
+        self.assertEqual(response.status_code, 401)
+
+        other = User.objects.create_user(
+            email="other@example.com",
+            password="otherpass123",
+            first_name="Other",
+            last_name="User",
+        )
+        self.client.force_authenticate(other)
+        response = self.post([image_file()])
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(PropertyImage.objects.exists())
+
+    def test_upload_without_valid_files(self):
+        self.client.force_authenticate(self.user)
+
+        response = self.post([])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("images", response.data)
+
+        response = self.post([SimpleUploadedFile("notes.txt", b"text")])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["results"][0]["status"], "rejected")
+        self.assertFalse(PropertyImage.objects.exists())
+
+    @override_settings(PROPERTY_IMAGE_UPLOAD_MAX_FILES=2)
+    def test_upload_is_limited(self):
+        self.client.force_authenticate(self.user)
+
+        response = self.post([image_file(f"{i}.jpg", size=(60, 40)) for i in range(3)])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.data["images"], "At most 2 files can be uploaded at once."
+        )
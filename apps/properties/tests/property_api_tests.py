@@ -4,7 +4,7 @@ from django.urls import reverse
 
 from rest_framework.exceptions import ValidationError
 
-from apps.locations.models import City, Country
+from apps.locations.models import City, CityTranslation, Country
 from apps.properties.models import PropertyStatus, PropertyType
 from apps.properties.querysets import property_list_queryset
 from apps.properties.serializers import (
@@ -156,8 +156,10 @@ class TestPropertyAPI(TestSetUp):
                 )
             )
         City.objects.bulk_create(cities_to_create)
+        macedonia = Country.objects.create(code="MK", name="North Macedonia")
+        City.objects.create(name="Skopje", country=macedonia)
 
-        res = self.client.get(self.property_form_url)
+        res = self.client.get(f"{self.property_form_url}?country_code=dk")
         self.assertEqual(res.status_code, 200)
 
         # --- Assert Genres ---
@@ -169,10 +171,80 @@ class TestPropertyAPI(TestSetUp):
         self.assertEqual(res.data["status"], expected_statuses_data)
 
         # --- Assert Cities ---
-        expected_cities_names = list(
-            City.objects.only("name").order_by("name").values_list("name", flat=True)
+        expected_cities = [
+            {
+                "id": city.id,
+                "name": city.name,
+                "slug": city.slug,
+                "translated_name": city.name,
+            }
+            for city in City.objects.filter(country=self.country).order_by("name")
+        ]
+        self.assertEqual(res.data["cities"], expected_cities)
+
+    def test_create_property_form_data_requires_country_code(self) -> None:
+        self.client.force_authenticate(user=self.user)
+        res = self.client.get(self.property_form_url)
+        self.assertEqual(res.status_code, 400)
+        self.assertIn("country_code", res.data)
+
+    def test_create_property_form_data_rejects_unknown_parameters(self) -> None:
+        self.client.force_authenticate(user=self.user)
+        Country.objects.create(code="DK", name="Denmark")
+
+        res = self.client.get(f"{self.property_form_url}?country_code=XX")
+        self.assertEqual(res.status_code, 400)
+        self.assertIn("country_code", res.data)
+
+        res = self.client.get(f"{self.property_form_url}?country_code=DK&language=zz")
+        self.assertEqual(res.status_code, 400)
+        self.assertIn("language", res.data)
+
+    def test_create_property_form_data_translated_city_names(self) -> None:
+        self.client.force_authenticate(user=self.user)
+        country = Country.objects.create(code="DK", name="Denmark")
+        city = City.objects.create(name="København", country=country)
+        CityTranslation.objects.create(
+            city=city, language="en", translated_name="Copenhagen"
+        )
+
+        res = self.client.get(f"{self.property_form_url}?country_code=DK&language=en")
+        self.assertEqual(res.data["cities"][0]["translated_name"], "Copenhagen")
+        self.assertEqual(res.data["cities"][0]["slug"], city.slug)
+
+        res = self.client.get(
+            f"{self.property_form_url}?country_code=DK",
+            HTTP_ACCEPT_LANGUAGE="en-US",
+        )
+        self.assertEqual(res.data["cities"][0]["translated_name"], "Copenhagen")
+
+        res = self.client.get(f"{self.property_form_url}?country_code=DK&language=mk")
+        self.assertEqual(res.data["cities"][0]["translated_name"], "København")
+
+    def test_create_property_form_data_etag(self) -> None:
+        self.client.force_authenticate(user=self.user)
+        country = Country.objects.create(code="DK", name="Denmark")
+        City.objects.create(name="Aarhus", country=country)
+        url = f"{self.property_form_url}?country_code=DK&language=en"
+
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+        etag = res.headers["ETag"]
+
+        # Served from the cache without touching the database.
+        with self.assertNumQueries(0):
+            res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 304)
+        self.assertEqual(res.headers["ETag"], etag)
+
+        # A new city invalidates the cached data and changes the ETag.
+        City.objects.create(name="Odense", country=country)
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+        self.assertNotEqual(res.headers["ETag"], etag)
+        self.assertEqual(
+            [city["name"] for city in res.data["cities"]], ["Aarhus", "Odense"]
         )
-        self.assertEqual(res.data["cities"], expected_cities_names)
 
     def test_property_default_ordering(self) -> None:
         """
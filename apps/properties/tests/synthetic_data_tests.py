@@ -0,0 +1,86 @@
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db.models import Count, F
+from django.test import TestCase
+
+from apps.favorites.models import UserFavoriteProperty
+from apps.locations.models import Address, City
+from apps.properties.models import Property, PropertyImage
+
+from seed.synthetic import HISTORY
+
+
+class TestSyntheticData(TestCase):
+    def generate(self, **options):
+        defaults = {
+            "properties": 60,
+            "users": 10,
+            "chunk_size": 25,
+            "countries": "MK=3,DK=1,SE=1",
+            "cities_per_country": 5,
+        }
+        call_command(
+            "generate_synthetic_data", stdout=StringIO(), **{**defaults, **options}
+        )
+
+    def listings(self):
+        return list(
+            Property.objects.order_by("id").values_list(
+                "price", "area", "property_type", "status", "city", "country_code"
+            )
+        )
+
+    def test_generate_synthetic_data(self):
+        self.generate()
+
+        self.assertEqual(Property.objects.count(), 60)
+        self.assertEqual(Address.objects.count(), 60)
+        self.assertEqual(City.objects.filter(country__code="SE").count(), 5)
+        self.assertEqual(
+            set(Property.objects.values_list("country_code", flat=True)),
+            {"MK", "DK", "SE"},
+        )
+        self.assertTrue(PropertyImage.objects.exists())
+        self.assertTrue(UserFavoriteProperty.objects.exists())
+
+        # The favorite counts match the favorites.
+        favorites = Count("favorite_user")
+        self.assertFalse(
+            Property.objects.annotate(favorites=favorites).exclude(
+                favorite_count=F("favorites")
+            )
+        )
+        self.assertTrue(Property.objects.filter(favorite_count__gt=1).exists())
+
+        # created_at is spread over time and grows with the id.
+        created = list(
+            Property.objects.order_by("id").values_list("created_at", flat=True)
+        )
+        self.assertEqual(created, sorted(created))
+        self.assertGreater(created[-1] - created[0], HISTORY / 2)
+
+        # Rows created afterwards do not collide with the assigned ids.
+        address = Address.objects.first()
+        Address.objects.create(
+            street_name="Test", postal_code="1000", city=address.city
+        )
+
+    def test_generate_synthetic_data_is_reproducible(self):
+        self.generate(seed=7)
+        first = self.listings()
+        Property.objects.all().delete()
+
+        # Users and cities already exist on the second run.
+        self.generate(seed=7)
+        self.assertEqual(self.listings(), first)
+
+        Property.objects.all().delete()
+        self.generate(seed=8)
+        self.assertNotEqual(self.listings(), first)
+
+    def test_generate_synthetic_data_invalid_countries(self):
+        with self.assertRaises(CommandError):
+            self.generate(countries="MK=abc")
+        with self.assertRaises(CommandError):
+            self.generate(countries="XX")
@@ -1,9 +1,11 @@
 from django.test import TestCase
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 
 from rest_framework.test import APIClient, APIRequestFactory
 
 from apps.properties.models import Property, PropertyStatus, PropertyType
+from apps.properties.services.detail_cache import local_detail_cache
 
 User = get_user_model()
 
@@ -45,6 +47,9 @@ class TestSetUp(TestCase):
         # shouldn’t leak between tests. Therefore, keep in setUp.
         self.client = APIClient()
         self.factory = APIRequestFactory()
+        # Cached responses must not leak between tests either.
+        cache.clear()
+        local_detail_cache().clear()
 
     def create_property(self, **params):
         payload = dict(self.property_payload)
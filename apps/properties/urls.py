@@ -2,7 +2,12 @@ from django.urls import path
 
 from rest_framework.routers import DefaultRouter
 
-from apps.properties.views import PropertySearchAPI, PropertyViewSet
+from apps.properties.views import (
+    PropertyImageDuplicatesAPI,
+    PropertySearchAPI,
+    PropertyViewSet,
+    property_image_resized_view,
+)
 
 app_name = "apps.properties"
 
@@ -12,4 +17,14 @@ router.register("properties", PropertyViewSet, basename="properties")
 
 urlpatterns = router.urls + [
     path("properties/search", PropertySearchAPI.as_view(), name="property-search"),
+    path(
+        "properties/images/duplicates",
+        PropertyImageDuplicatesAPI.as_view(),
+        name="property-image-duplicates",
+    ),
+    path(
+        "properties/images/<int:pk>/<str:version>/w<int:width>.<str:extension>",
+        property_image_resized_view,
+        name="property-image-resized",
+    ),
 ]
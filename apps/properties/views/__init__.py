@@ -1,4 +1,11 @@
+from .duplicates import PropertyImageDuplicatesAPI
+from .images import property_image_resized_view
 from .property import PropertyViewSet
 from .search import PropertySearchAPI
 
-__all__ = ["PropertySearchAPI", "PropertyViewSet"]
+__all__ = [
+    "PropertyImageDuplicatesAPI",
+    "PropertySearchAPI",
+    "PropertyViewSet",
+    "property_image_resized_view",
+]
@@ -0,0 +1,69 @@
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAdminUser
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.properties.models import NearDuplicate
+from apps.properties.pagination import NearDuplicatePagination
+from apps.properties.serializers import NearDuplicateSerializer
+from apps.properties.services.duplicates import MAX_DISTANCE
+
+
+class PropertyImageDuplicatesAPI(APIView):
+    """
+    Staff only report of the near duplicate images across listings.
+
+    Agencies re-upload resized or recompressed copies of the same photo for
+    different listings. Such copies have close perceptual hashes, which the
+    image pipeline stores for every image. `manage.py hash_property_images`
+    compares the stored hashes, without decoding any image, and stores the
+    pairs the report pages through.
+    """
+
+    permission_classes = [IsAdminUser]
+    pagination_class = NearDuplicatePagination
+
+    @extend_schema(
+        summary="Report near duplicate property images",
+        description=(
+            "Returns the pairs of images of different listings whose perceptual "
+            "hashes differ by at most `max_distance` bits, closest first, by "
+            "pages, as of the last `hash_property_images` run. Images stored in "
+            "the same file, i.e. exact duplicates, and the hashes shared by too "
+            "many images, e.g. of blank images, are left out."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="max_distance",
+                description=f"Maximum Hamming distance, 0 to {MAX_DISTANCE} (default).",
+                required=False,
+                type=int,
+                location=OpenApiParameter.QUERY,
+            ),
+        ],
+        responses={200: NearDuplicateSerializer(many=True)},
+    )
+    def get(self, request: Request) -> Response:
+        try:
+            max_distance = int(request.query_params.get("max_distance", MAX_DISTANCE))
+        except ValueError:
+            raise ValidationError({"max_distance": "A valid integer is required."})
+        if not 0 <= max_distance <= MAX_DISTANCE:
+            raise ValidationError(
+                {"max_distance": f"Must be between 0 and {MAX_DISTANCE}."}
+            )
+
+        paginator = self.pagination_class()
+        duplicates = (
+            NearDuplicate.objects.filter(distance__lte=max_distance)
+            .select_related("first", "second")
+            .order_by("distance", "first_id", "second_id")
+        )
+        page = paginator.paginate_queryset(duplicates, request, view=self)
+        serializer = NearDuplicateSerializer(
+            page, many=True, context={"request": request}
+        )
+        return paginator.get_paginated_response(serializer.data)
@@ -0,0 +1,62 @@
+from django.http import (
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseBase,
+    HttpResponsePermanentRedirect,
+    HttpResponseRedirect,
+)
+from django.shortcuts import get_object_or_404
+from django.utils.http import quote_etag
+from django.views.decorators.http import require_GET
+
+from apps.core.utils import etag_matches, file_response
+from apps.properties.models import PropertyImage
+from apps.properties.services.resizing import (
+    CONTENT_TYPES,
+    PropertyImageResizer,
+    RESIZE_FORMATS,
+    canonical_width,
+    image_version,
+    resized_url,
+)
+
+# The URL changes with the content, so responses never need revalidation.
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+@require_GET
+def property_image_resized_view(
+    request: HttpRequest, pk: int, version: str, width: int, extension: str
+) -> HttpResponseBase:
+    """
+    Serves a `PropertyImage` resized to `width` pixels in the format of the
+    `extension` (`jpg` or `webp`).
+
+    URLs embed the content version of the image, see `resized_url`, and are
+    cached forever by clients and CDNs. A URL of a replaced image redirects to
+    the current one, a width which is not canonical to its canonical width.
+    Range requests are supported.
+    """
+    if extension not in RESIZE_FORMATS:
+        raise Http404("Unsupported image format.")
+    image = get_object_or_404(PropertyImage.objects.only("image"), pk=pk)
+    if not image.image:
+        raise Http404("The property image has no file.")
+
+    if version != image_version(image):
+        return HttpResponseRedirect(resized_url(image, width, extension))
+    if width != canonical_width(width):
+        return HttpResponsePermanentRedirect(resized_url(image, width, extension))
+
+    headers = {
+        "Cache-Control": IMMUTABLE,
+        "ETag": quote_etag(PropertyImageResizer.cache_key(version, width, extension)),
+    }
+    if etag_matches(request, headers["ETag"]):
+        return HttpResponse(status=304, headers=headers)
+
+    file = PropertyImageResizer.get(image, width, extension)
+    return file_response(
+        request, file, CONTENT_TYPES[RESIZE_FORMATS[extension]], headers
+    )
@@ -1,17 +1,22 @@
-from typing import Any, Type
+from typing import Any, Dict, Type
 
 from django_filters import rest_framework as filters
 
+from django.conf import settings
 from django.db.models import QuerySet
+from django.utils.translation import get_language_from_request
 
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 from rest_framework.request import Request
 from rest_framework.serializers import ModelSerializer
 from rest_framework.status import (
     HTTP_200_OK,
+    HTTP_202_ACCEPTED,
+    HTTP_400_BAD_REQUEST,
     HTTP_405_METHOD_NOT_ALLOWED,
 )
 
@@ -22,11 +27,20 @@ from drf_spectacular.utils import (
     extend_schema,
 )
 
-from apps.core.utils import CharInFilter, CustomFilterSet, set_docstring
-from apps.core.views import BaseAPIViewSet
-from apps.locations.models import City
-from apps.properties.docs import property_count_doc
-from apps.properties.models import Property, PropertyStatus, PropertyType
+from apps.core.utils import (
+    CharInFilter,
+    CustomFilterSet,
+    etag_response,
+    set_docstring,
+)
+from apps.core.views import AsyncViewSetMixin, BaseAPIViewSet, ReplicaReadsMixin
+from apps.locations.services.city_options import country_codes
+from apps.properties.docs import (
+    property_count_doc,
+    property_form_data_doc,
+    property_images_upload_doc,
+)
+from apps.properties.models import Property, PropertyStatus
 from apps.properties.querysets import (
     property_list_queryset,
 )
@@ -34,6 +48,9 @@ from apps.properties.serializers import (
     PropertyListSerializer,
     PropertySerializer,
 )
+from apps.properties.services.detail_cache import PropertyDetailCache
+from apps.properties.services.form_data import PropertyFormData
+from apps.properties.services.uploads import PropertyImageUpload
 
 
 class PropertyFilter(CustomFilterSet):
@@ -77,19 +94,24 @@ class PropertyFilter(CustomFilterSet):
         queryset: Any = None,
         *,
         request: Any = None,
-        prefix: str | None = None
+        prefix: str | None = None,
     ) -> None:
         super().__init__(data, queryset, request=request, prefix=prefix)
         self.filters["country_code"].required = True
 
 
-class PropertyViewSet(BaseAPIViewSet[Property]):
+class PropertyViewSet(AsyncViewSetMixin, ReplicaReadsMixin, BaseAPIViewSet[Property]):
     """API endpoint that allows properties to be viewed or edited.
 
     This viewset handles comprehensive property management, including
     listing, creation, retrieval, updates, and deletion of property records.
     It supports nested creation/updates for associated addresses and images.
 
+    The `list` and `count` actions are asynchronous, under ASGI they wait
+    for the database without holding a thread. `list` and `count` read from
+    the database replicas, see `ReplicaReadsMixin`. `retrieve` is served
+    from `PropertyDetailCache`.
+
     For detailed information on request/response formats, filtering options,
     and available actions, please refer to the auto-generated API schema.
     """
@@ -103,9 +125,13 @@ class PropertyViewSet(BaseAPIViewSet[Property]):
         "area",
         "total_rooms",
         "construction_year",
+        "favorite_count",
     ]
 
     ordering = ["-id"]
+    # Not `retrieve`: a replica lagging behind a write would cache the
+    # previous detail under the new version.
+    replica_actions = ["list", "count"]
 
     def get_queryset(self) -> QuerySet[Property]:
         """
@@ -152,6 +178,8 @@ class PropertyViewSet(BaseAPIViewSet[Property]):
             )
         elif self.action == "get_create_property_form_data":
             return Property.objects.none()
+        elif self.action == "upload_images":
+            return Property.objects.only("id", "owner_id")
         else:
             return Property.objects.prefetch_related("property_images")
 
@@ -161,6 +189,22 @@ class PropertyViewSet(BaseAPIViewSet[Property]):
         else:
             return PropertySerializer
 
+    def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """Returns the detail of a property from `PropertyDetailCache`."""
+        lookup = str(kwargs[self.lookup_url_kwarg or self.lookup_field])
+
+        def load() -> Dict[str, Any]:
+            instance = self.get_object()
+            data: Dict[str, Any] = self.get_serializer(instance).data
+            return data
+
+        if not lookup.isdigit():
+            return Response(load())
+        data = PropertyDetailCache.get(
+            int(lookup), request.build_absolute_uri("/"), load
+        )
+        return Response(data)
+
     def destroy(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         """Delete operation on the `Property` is not allowed."""
         return Response(
@@ -196,31 +240,109 @@ class PropertyViewSet(BaseAPIViewSet[Property]):
             *PropertyFilter.spectacular_parameters(exclude_fields=["country_code"]),
         ],
     )
-    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
-        return super().list(request, *args, **kwargs)
+    async def list(  # type: ignore[override]
+        self, request: Request, *args: Any, **kwargs: Any
+    ) -> Response:
+        queryset = self.filter_queryset(self.get_queryset())
+        properties = [property async for property in queryset]
+        serializer = self.get_serializer(properties, many=True)
+        return Response(serializer.data)
 
+    @extend_schema(
+        summary="Get the data to create a property",
+        description=property_form_data_doc,
+        parameters=[
+            OpenApiParameter(
+                name="country_code",
+                description="ISO 3166-1 country code",
+                required=True,
+                type=str,
+                default="MK",
+                location=OpenApiParameter.QUERY,
+                examples=[
+                    OpenApiExample("North Mecedonia", value="MK"),
+                    OpenApiExample("Denmark", value="DK"),
+                ],
+            ),
+            OpenApiParameter(
+                name="language",
+                description=(
+                    "ISO 639-1 language code for the city names. Defaults to "
+                    "the language negotiated from the `Accept-Language` header."
+                ),
+                required=False,
+                type=str,
+                location=OpenApiParameter.QUERY,
+                examples=[
+                    OpenApiExample("English", value="en"),
+                    OpenApiExample("Macedonian", value="mk"),
+                ],
+            ),
+        ],
+        responses={
+            200: OpenApiResponse(
+                description="Property types, statuses and the country's cities",
+                examples=[
+                    OpenApiExample(
+                        "Successful response",
+                        value={
+                            "types": ["APARTMENT", "SINGLE_FAMILY"],
+                            "status": ["ACTIVE", "SOLD"],
+                            "cities": [
+                                {
+                                    "id": 1,
+                                    "name": "København",
+                                    "slug": "kobenhavn-dk",
+                                    "translated_name": "Copenhagen",
+                                }
+                            ],
+                        },
+                    )
+                ],
+            ),
+            304: OpenApiResponse(
+                description="The client's cached copy (`If-None-Match`) is current"
+            ),
+        },
+    )
     @action(
         detail=False,
         methods=["GET"],
         url_name="get-create-property-form-data",
         permission_classes=[IsAuthenticated],
     )
+    @set_docstring(property_form_data_doc)
     def get_create_property_form_data(
         self, request: Request, *args: Any, **kwargs: Any
     ) -> Response:
-        """Returns the data to help create a `Property`."""
-        data = {
-            "types": [choice for choice in PropertyType.values],
-            "status": [choice for choice in PropertyStatus.values],
-            "cities": list(
-                City.objects.only("name")
-                .order_by("name")
-                .values_list("name", flat=True)
-            ),
-        }
-        return Response(data=data, status=HTTP_200_OK)
+        country_code = request.query_params.get("country_code")
+        if not country_code:
+            raise ValidationError(
+                {
+                    "country_code": "This query parameter is required.",
+                },
+                code="required",
+            )
+        language = request.query_params.get("language") or get_language_from_request(
+            request._request
+        )
+        # Translations are stored with ISO 639-1 codes, e.g. "en" for "en-us".
+        language = language.split("-")[0].lower()
+
+        # Both are part of the cache key, unknown values must not add entries.
+        country_code = country_code.upper()
+        if country_code not in country_codes():
+            raise ValidationError(
+                {"country_code": "Unknown country code."}, code="invalid"
+            )
+        if language not in PropertyFormData.languages():
+            raise ValidationError({"language": "Unsupported language."}, code="invalid")
 
-    @extend_schema(
+        data, etag = PropertyFormData.get(country_code, language)
+        return etag_response(request, data, etag=etag)
+
+    # The stubs of `action` only accept synchronous views.
+    @extend_schema(  # type: ignore[type-var]
         summary="Get total properties",
         description=property_count_doc,
         parameters=[
@@ -259,7 +381,76 @@ class PropertyViewSet(BaseAPIViewSet[Property]):
         url_name="count",
     )
     @set_docstring(property_count_doc)
-    def count(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+    async def count(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         filtered_queryset = self.filter_queryset(self.get_queryset())
-        count = filtered_queryset.count()
+        count = await filtered_queryset.acount()
         return Response(data={"count": count}, status=HTTP_200_OK)
+
+    @extend_schema(
+        summary="Upload images of a property",
+        description=property_images_upload_doc,
+        request={
+            "multipart/form-data": {
+                "type": "object",
+                "properties": {
+                    "images": {
+                        "type": "array",
+                        "items": {"type": "string", "format": "binary"},
+                    }
+                },
+            }
+        },
+        responses={
+            202: OpenApiResponse(
+                description="Status of every uploaded file",
+                examples=[
+                    OpenApiExample(
+                        "Successful response",
+                        value={
+                            "results": [
+                                {"name": "kitchen.jpg", "status": "accepted", "id": 12},
+                                {
+                                    "name": "plan.pdf",
+                                    "status": "rejected",
+                                    "errors": ["Upload a valid image."],
+                                },
+                            ]
+                        },
+                    )
+                ],
+            ),
+            400: OpenApiResponse(
+                description="No file was uploaded or all were rejected"
+            ),
+            403: OpenApiResponse(description="The user does not own the property"),
+        },
+    )
+    @action(
+        detail=True,
+        methods=["POST"],
+        url_path="images",
+        url_name="images",
+        permission_classes=[IsAuthenticated],
+        parser_classes=[MultiPartParser],
+    )
+    @set_docstring(property_images_upload_doc)
+    def upload_images(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        property = self.get_object()
+        if property.owner_id != request.user.id and not request.user.is_staff:
+            raise PermissionDenied("Only the owner of the property can upload images.")
+
+        files = request.FILES.getlist("images")
+        if not files:
+            raise ValidationError({"images": "No file was uploaded."}, code="required")
+        max_files = settings.PROPERTY_IMAGE_UPLOAD_MAX_FILES
+        if len(files) > max_files:
+            raise ValidationError(
+                {"images": f"At most {max_files} files can be uploaded at once."}
+            )
+
+        results = PropertyImageUpload.upload(property, files)
+        accepted = any(result["status"] == "accepted" for result in results)
+        return Response(
+            {"results": results},
+            status=HTTP_202_ACCEPTED if accepted else HTTP_400_BAD_REQUEST,
+        )
@@ -13,9 +13,9 @@ from rest_framework import status
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.request import Request
-from rest_framework.views import APIView
 
 from apps.core.serializers import ErrorResponseSerializer
+from apps.core.views import AsyncAPIView, ReplicaReadsMixin
 from apps.properties.services.search import PropertySearch
 from apps.properties.serializers import (
     PropertySearchQuerySerializer,
@@ -25,7 +25,7 @@ from apps.properties.serializers import (
 logger = logging.getLogger(__name__)
 
 
-class PropertySearchAPI(APIView):
+class PropertySearchAPI(ReplicaReadsMixin, AsyncAPIView):
     """
     API endpoint for returning property search suggestions.
 
@@ -35,6 +35,10 @@ class PropertySearchAPI(APIView):
     to be similar to how different real estate platforms provide categorized
     suggestions.
 
+    The view is asynchronous, under ASGI the searches sent on every
+    keystroke wait for the database without holding a thread each. They
+    read from the database replicas, see `ReplicaReadsMixin`.
+
     Example:
     ```
         GET /api/v1/properties/properties/search/?text=køben
@@ -119,7 +123,7 @@ class PropertySearchAPI(APIView):
             ),
         },
     )
-    def get(self, request: Request) -> Response:
+    async def get(self, request: Request) -> Response:
         query_serializer = PropertySearchQuerySerializer(data=request.query_params)
         query_serializer.is_valid(raise_exception=True)
 
@@ -129,7 +133,7 @@ class PropertySearchAPI(APIView):
         property_types = validated_data.get("property_types")
 
         try:
-            results = PropertySearch.quick_search(
+            results = await PropertySearch.aquick_search(
                 query=query, country_code=country_code, property_types=property_types
             )
             response_serializer = PropertySearchResponseSerializer(results)
@@ -0,0 +1,119 @@
+import hashlib
+import time
+from typing import Any, NamedTuple, Tuple
+
+from django.conf import settings
+from django.utils.functional import SimpleLazyObject
+from django.utils.translation import gettext_lazy as _
+
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+
+from rest_framework.request import Request
+
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import Token
+
+from apps.core.utils import LRUCache
+from apps.users.services.revocation import is_revoked
+
+
+class CachedToken(NamedTuple):
+    user_id: int
+    is_staff: bool
+    token: Token
+
+
+_cache: LRUCache[str, CachedToken] | None = None
+
+
+def token_cache() -> LRUCache[str, CachedToken]:
+    """Returns the cache of the verified tokens, following the settings."""
+    global _cache
+    if _cache is None or _cache.max_size != settings.JWT_USER_CACHE_SIZE:
+        _cache = LRUCache(settings.JWT_USER_CACHE_SIZE)
+    return _cache
+
+
+def invalidate_user_tokens(user_id: int) -> None:
+    """Forgets the tokens of a user, the next request verifies them again."""
+    token_cache().remove_where(lambda cached: cached.user_id == user_id)
+
+
+class LazyUser(SimpleLazyObject):
+    """
+    The authenticated user, loaded from the database when a field other than
+    its `id` or `is_staff` is first accessed.
+    """
+
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, cached: CachedToken, func: Any) -> None:
+        super().__init__(func)
+        # Set on the proxy itself, reading them does not load the user.
+        self.__dict__["id"] = self.__dict__["pk"] = cached.user_id
+        self.__dict__["is_staff"] = cached.is_staff
+
+    def __bool__(self) -> bool:
+        # Permission classes test `request.user and ...`.
+        return True
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication which only loads the user from the database when its
+    fields are used.
+
+    A token is verified, and its user checked to exist and be active, on its
+    first request. The token, the user id and `is_staff` (checked by the
+    admin permissions and the request metrics) are then cached by the SHA-256
+    of the token in a `JWT_USER_CACHE_SIZE` LRU, until the token expires or
+    for at most `JWT_USER_CACHE_TIMEOUT` seconds. The following requests
+    with the token get a `LazyUser`, so views only needing `request.user.id`
+    (e.g. to mark the favorite properties) make no query for the user.
+
+    The tokens of a user are forgotten when the user is saved or deleted, in
+    the process it happens in, the other workers notice a deactivation
+    within the timeout. Revoked tokens are rejected on every request, cached
+    or not.
+    """
+
+    def authenticate(self, request: Request) -> Tuple[Any, Token] | None:
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        cache = token_cache()
+        key = hashlib.sha256(raw_token).hexdigest()
+        cached = cache.get(key)
+        if cached is not None:
+            token = cached.token
+            self.check_revoked(token)
+            return LazyUser(cached, lambda: self.get_user(token)), token
+
+        token = self.get_validated_token(raw_token)
+        self.check_revoked(token)
+        user = self.get_user(token)
+        lifetime = min(
+            float(token.get("exp", 0)) - time.time(), settings.JWT_USER_CACHE_TIMEOUT
+        )
+        if lifetime > 0:
+            cached = CachedToken(user.pk, getattr(user, "is_staff", False), token)
+            cache.set(key, cached, time.monotonic() + lifetime)
+        return user, token
+
+    def check_revoked(self, token: Token) -> None:
+        if is_revoked(token):
+            raise AuthenticationFailed(
+                str(_("Token has been revoked.")), code="token_revoked"
+            )
+
+
+class CachedJWTScheme(SimpleJWTScheme):  # type: ignore[no-untyped-call]
+    """Documents `CachedJWTAuthentication` as the JWT bearer scheme."""
+
+    target_class = "apps.users.authentication.CachedJWTAuthentication"
@@ -0,0 +1,16 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.users.models import RevokedToken
+
+
+class Command(BaseCommand):
+    help = "Deletes the revoked tokens which have expired, and are rejected anyway."
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        deleted, _ = RevokedToken.objects.filter(
+            expires_at__lte=timezone.now()
+        ).delete()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} revoked tokens."))
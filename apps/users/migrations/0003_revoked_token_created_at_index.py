@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0002_revoked_token"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="revokedtoken",
+            index=models.Index(
+                fields=["created_at"], name="users_revok_created_cae386_idx"
+            ),
+        ),
+    ]
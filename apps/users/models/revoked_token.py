@@ -0,0 +1,35 @@
+from django.db import models
+
+from apps.core.models import TimeTracking
+
+
+class RevokedToken(TimeTracking):
+    """
+    A JWT revoked before its expiry, on logout, by its `jti` claim.
+
+    Workers test tokens against a Bloom filter of these JTIs, see
+    `apps.users.services.revocation`, and only query this table for probable
+    matches. Rows are useless once `expires_at` has passed and are removed by
+    `manage.py purge_revoked_tokens`.
+    """
+
+    jti = models.CharField(
+        max_length=255,
+        unique=True,
+        help_text="The `jti` claim of the revoked token.",
+    )
+    expires_at = models.DateTimeField(
+        db_index=True,
+        help_text="The expiry of the token, after which it is rejected anyway.",
+    )
+
+    class Meta:
+        verbose_name = "Revoked Token"
+        verbose_name_plural = "Revoked Tokens"
+        indexes = [
+            # The rows created since the last sync of the revocation filters.
+            models.Index(fields=["created_at"]),
+        ]
+
+    def __str__(self) -> str:
+        return self.jti
@@ -12,12 +12,17 @@ from rest_framework.serializers import (
     ValidationError,
 )
 
+from dj_rest_auth.jwt_auth import CookieTokenRefreshSerializer
 from dj_rest_auth.registration.serializers import RegisterSerializer
 from dj_rest_auth.serializers import LoginSerializer
 
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
 from allauth.account.adapter import get_adapter
 
 from .models import User
+from .services.revocation import is_revoked
 
 
 class CustomLoginSerializer(LoginSerializer):
@@ -130,3 +135,12 @@ class CustomRegisterSerializer(RegisterSerializer):  # type: ignore [misc]
             }
         )
         return data
+
+
+class RevocableTokenRefreshSerializer(CookieTokenRefreshSerializer):  # type: ignore [misc]
+    """Refuses to refresh the refresh tokens revoked on logout."""
+
+    def validate(self, attrs: Dict[str, Any]) -> Dict[str, Any]:
+        if is_revoked(RefreshToken(self.extract_refresh_token())):
+            raise InvalidToken(str(_("Token has been revoked.")))
+        return super().validate(attrs)  # type: ignore [no-any-return]
@@ -0,0 +1,118 @@
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from apps.core.utils import BloomFilter
+from apps.users.models import RevokedToken
+
+_filter: "RevocationFilter | None" = None
+
+
+class RevocationFilter:
+    """
+    Bloom filter of the JTIs of the revoked tokens in this worker.
+
+    Most tokens were never revoked, the filter tells so in microseconds and
+    only probable matches are confirmed with a query on `RevokedToken`. The
+    filter is synced with the table every `interval` seconds, with a query
+    for the rows created since `margin` seconds before the last sync, so
+    tokens revoked by other workers are rejected within the interval, even
+    when their transaction commits late or the clocks of the workers differ.
+    The overlapping rows are added once.
+
+    The filter is built from the unexpired rows on the first sync, and
+    rebuilt once it holds as many JTIs as it was sized for, for at least
+    `capacity` JTIs and twice the unexpired rows.
+    """
+
+    def __init__(self, capacity: int, interval: float, margin: float = 60) -> None:
+        self.capacity = capacity
+        self.interval = interval
+        self.margin = margin
+        self._filter = BloomFilter(capacity)
+        self._last_sync: datetime | None = None
+        self._synced_at = -math.inf
+        self._lock = threading.Lock()
+
+    def sync(self, force: bool = False) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._synced_at < self.interval:
+                return
+            self._synced_at = now
+            started_at = timezone.now()
+            revoked = RevokedToken.objects.filter(expires_at__gt=started_at)
+            rebuild = True
+            if (
+                self._last_sync is not None
+                and self._filter.count < self._filter.capacity
+            ):
+                rebuild = False
+                revoked = revoked.filter(
+                    created_at__gte=self._last_sync - timedelta(seconds=self.margin)
+                )
+            jtis = list(revoked.values_list("jti", flat=True))
+            if rebuild:
+                self._filter = BloomFilter(max(self.capacity, 2 * len(jtis)))
+            for jti in jtis:
+                if jti not in self._filter:
+                    self._filter.add(jti)
+            self._last_sync = started_at
+
+    def add(self, jti: str) -> None:
+        with self._lock:
+            if jti not in self._filter:
+                self._filter.add(jti)
+
+    def is_revoked(self, jti: str) -> bool:
+        self.sync()
+        if jti not in self._filter:
+            return False
+        return RevokedToken.objects.filter(
+            jti=jti, expires_at__gt=timezone.now()
+        ).exists()
+
+
+def revocation_filter() -> RevocationFilter:
+    """Returns the revocation filter of the process, following the settings."""
+    global _filter
+    capacity = settings.REVOKED_TOKEN_FILTER_CAPACITY
+    interval = settings.REVOKED_TOKEN_SYNC_SECONDS
+    margin = settings.REVOKED_TOKEN_SYNC_MARGIN_SECONDS
+    if _filter is None or (_filter.capacity, _filter.interval, _filter.margin) != (
+        capacity,
+        interval,
+        margin,
+    ):
+        _filter = RevocationFilter(capacity, interval, margin)
+    return _filter
+
+
+def token_jti(token: Token) -> str | None:
+    jti = token.get(api_settings.JTI_CLAIM)
+    return str(jti) if jti else None
+
+
+def revoke_token(token: Token) -> None:
+    """Revokes a token until its expiry, in every worker."""
+    jti = token_jti(token)
+    if jti is None:
+        return
+    RevokedToken.objects.bulk_create(
+        [RevokedToken(jti=jti, expires_at=datetime_from_epoch(token["exp"]))],
+        ignore_conflicts=True,
+    )
+    revocation_filter().add(jti)
+
+
+def is_revoked(token: Token) -> bool:
+    jti = token_jti(token)
+    return jti is not None and revocation_filter().is_revoked(jti)
@@ -0,0 +1,19 @@
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import invalidate_user_tokens
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_user_tokens(sender: Any, instance: Any, **kwargs: Any) -> None:
+    """
+    Forgets the cached tokens of a saved or deleted user, so that a
+    deactivation or a password change applies to the next request.
+    """
+    invalidate_user_tokens(instance.pk)
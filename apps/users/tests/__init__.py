@@ -1,8 +1,12 @@
+from .authentication_tests import TestCachedJWTAuthentication
+from .revocation_tests import TestTokenRevocation
 from .user_api_tests import UserAPITests
 from .user_model_tests import UserModelTests
 from .user_serializers_tests import CustomRegisterSerializerTests
 
 __all__ = [
+    "TestCachedJWTAuthentication",
+    "TestTokenRevocation",
     "UserAPITests",
     "UserModelTests",
     "CustomRegisterSerializerTests",
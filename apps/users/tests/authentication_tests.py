@@ -0,0 +1,74 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.users.authentication import CachedJWTAuthentication, LazyUser, token_cache
+from apps.users.services.revocation import revocation_filter
+
+User = get_user_model()
+
+
+class TestCachedJWTAuthentication(APITestCase):
+    def setUp(self):
+        token_cache().clear()
+        self.addCleanup(token_cache().clear)
+        # Not due for a sync query during the test.
+        revocation_filter().sync(force=True)
+        self.user = User.objects.create_user(
+            email="jwt@example.com",
+            password="testpass123",
+            first_name="JWT",
+            last_name="User",
+            agreed_to_terms=True,
+        )
+        self.token = str(AccessToken.for_user(self.user))
+        self.ids_url = reverse("apps.favorites:favorite-ids")
+
+    def authenticate(self, token):
+        request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        return CachedJWTAuthentication().authenticate(Request(request))
+
+    def test_user_is_loaded_once_per_token(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+
+        # The user, then the favorite ids.
+        with self.assertNumQueries(2):
+            res = self.client.get(self.ids_url)
+        self.assertEqual(res.status_code, 200)
+
+        with self.assertNumQueries(1):
+            res = self.client.get(self.ids_url)
+        self.assertEqual(res.status_code, 200)
+
+    def test_cached_user_is_lazy(self):
+        self.authenticate(self.token)
+
+        with self.assertNumQueries(0):
+            user, token = self.authenticate(self.token)
+            self.assertIsInstance(user, LazyUser)
+            self.assertTrue(user.is_authenticated)
+            self.assertEqual((user.id, user.pk), (self.user.id, self.user.id))
+            self.assertFalse(user.is_staff)
+            self.assertEqual(token["user_id"], self.user.id)
+        with self.assertNumQueries(1):
+            self.assertEqual(user.email, "jwt@example.com")
+            self.assertEqual(user.first_name, "JWT")
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+        self.assertEqual(self.client.get(self.ids_url).status_code, 200)
+
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertEqual(self.client.get(self.ids_url).status_code, 401)
+
+    def test_invalid_token_is_not_cached(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}x")
+
+        self.assertEqual(self.client.get(self.ids_url).status_code, 401)
+        self.assertEqual(len(token_cache()), 0)
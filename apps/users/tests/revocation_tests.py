@@ -0,0 +1,130 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework.test import APITestCase
+
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.users.authentication import token_cache
+from apps.users.models import RevokedToken
+from apps.users.services.revocation import RevocationFilter, revocation_filter
+
+User = get_user_model()
+
+
+class TestTokenRevocation(APITestCase):
+    def setUp(self):
+        token_cache().clear()
+        self.addCleanup(token_cache().clear)
+        revocation_filter().sync(force=True)
+        self.user = User.objects.create_user(
+            email="revoked@example.com",
+            password="testpass123",
+            first_name="Revoked",
+            last_name="User",
+            agreed_to_terms=True,
+        )
+        self.refresh = RefreshToken.for_user(self.user)
+        self.access = str(self.refresh.access_token)
+        self.ids_url = reverse("apps.favorites:favorite-ids")
+
+    def test_logout_revokes_the_tokens(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access}")
+        self.assertEqual(self.client.get(self.ids_url).status_code, 200)
+
+        res = self.client.post(
+            reverse("apps.users:rest_logout"), {"refresh": str(self.refresh)}
+        )
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json(), {"detail": "Successfully logged out."})
+        self.assertEqual(RevokedToken.objects.count(), 2)
+
+        res = self.client.get(self.ids_url)
+        self.assertEqual(res.status_code, 401)
+        self.assertEqual(res.json()["detail"], "Token has been revoked.")
+
+        self.client.credentials()
+        res = self.client.post(
+            reverse("apps.users:token_refresh"), {"refresh": str(self.refresh)}
+        )
+        self.assertEqual(res.status_code, 401)
+
+    def test_refresh_token_which_is_not_revoked(self):
+        res = self.client.post(
+            reverse("apps.users:token_refresh"), {"refresh": str(self.refresh)}
+        )
+        self.assertEqual(res.status_code, 200)
+        self.assertIn("access", res.json())
+
+    def test_filter_syncs_tokens_revoked_by_other_workers(self):
+        revoked = RevokedToken.objects.create(
+            jti="revoked", expires_at=timezone.now() + timedelta(hours=1)
+        )
+        revocations = RevocationFilter(capacity=10, interval=60)
+
+        # The sync, then the confirmation of the probable match.
+        with self.assertNumQueries(2):
+            self.assertTrue(revocations.is_revoked(revoked.jti))
+        # Tokens missing from the filter make no query until the next sync.
+        with self.assertNumQueries(0):
+            self.assertFalse(revocations.is_revoked("valid"))
+
+        RevokedToken.objects.create(
+            jti="later", expires_at=timezone.now() + timedelta(hours=1)
+        )
+        self.assertFalse(revocations.is_revoked("later"))
+        revocations.sync(force=True)
+        self.assertTrue(revocations.is_revoked("later"))
+
+    def test_filter_syncs_tokens_committed_late(self):
+        revocations = RevocationFilter(capacity=10, interval=60, margin=60)
+        revocations.sync(force=True)
+        # Created before the sync, committed after it.
+        late = RevokedToken.objects.create(
+            jti="late", expires_at=timezone.now() + timedelta(hours=1)
+        )
+        RevokedToken.objects.filter(pk=late.pk).update(
+            created_at=timezone.now() - timedelta(seconds=30)
+        )
+
+        revocations.sync(force=True)
+        self.assertTrue(revocations.is_revoked(late.jti))
+
+        # The rows read again by the next syncs are counted once.
+        revocations.add(late.jti)
+        revocations.sync(force=True)
+        self.assertEqual(revocations._filter.count, 1)
+
+    def test_filter_is_sized_for_the_revoked_tokens(self):
+        expires_at = timezone.now() + timedelta(hours=1)
+        RevokedToken.objects.bulk_create(
+            [RevokedToken(jti=f"revoked-{i}", expires_at=expires_at) for i in range(8)]
+        )
+        revocations = RevocationFilter(capacity=5, interval=60)
+
+        revocations.sync(force=True)
+        self.assertEqual(revocations._filter.capacity, 16)
+        self.assertEqual(revocations._filter.count, 8)
+
+        # Not rebuilt on the next sync.
+        revocations.sync(force=True)
+        self.assertEqual(revocations._filter.count, 8)
+        self.assertTrue(revocations.is_revoked("revoked-7"))
+
+    def test_purge_expired_revoked_tokens(self):
+        now = timezone.now()
+        RevokedToken.objects.create(jti="expired", expires_at=now - timedelta(1))
+        RevokedToken.objects.create(jti="current", expires_at=now + timedelta(1))
+
+        out = StringIO()
+        call_command("purge_revoked_tokens", stdout=out)
+
+        self.assertIn("Deleted 1 revoked tokens.", out.getvalue())
+        self.assertEqual(
+            list(RevokedToken.objects.values_list("jti", flat=True)), ["current"]
+        )
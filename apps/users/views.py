@@ -1,10 +1,49 @@
-from dj_rest_auth.views import UserDetailsView
+from django.utils.translation import gettext_lazy as _
+
+from dj_rest_auth.app_settings import api_settings
+from dj_rest_auth.jwt_auth import get_refresh_view
+from dj_rest_auth.views import LogoutView, UserDetailsView
 
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import RefreshToken, Token
 
-from .serializers import AuthUserDetailsSerializer
+from .serializers import AuthUserDetailsSerializer, RevocableTokenRefreshSerializer
+from .services.revocation import revoke_token
 
 
 class AuthUserDetailsView(UserDetailsView):
     serializer_class = AuthUserDetailsSerializer
     permission_classes = [IsAuthenticated]
+
+
+class RevokingLogoutView(LogoutView):
+    """
+    Logs out by revoking the access token of the request and the refresh
+    token in the request data (or cookie), which are then rejected until
+    they expire.
+    """
+
+    def logout(self, request: Request) -> Response:
+        response = super().logout(request)  # type: ignore [misc]
+        tokens = [request.auth] if isinstance(request.auth, Token) else []
+        raw_refresh = request.data.get("refresh") or request.COOKIES.get(
+            api_settings.JWT_AUTH_REFRESH_COOKIE or ""
+        )
+        if raw_refresh:
+            try:
+                tokens.append(RefreshToken(raw_refresh))  # type: ignore [arg-type]
+            except TokenError:
+                pass
+        for token in tokens:
+            revoke_token(token)
+        if response.status_code == 200:
+            response.data = {"detail": _("Successfully logged out.")}
+        return response  # type: ignore [no-any-return]
+
+
+class RevocableTokenRefreshView(get_refresh_view()):  # type: ignore [misc]
+    serializer_class = RevocableTokenRefreshSerializer
@@ -9,12 +9,17 @@ from drf_spectacular.views import (
     SpectacularSwaggerView,
 )
 
+from apps.core.views import metrics_view
+
 
 urlpatterns = [
     path("api/v1/control-center/", admin.site.urls),
     path("api/v1/", include("apps.properties.urls")),
     path("api/v1/", include("apps.users.urls")),
     path("api/v1/", include("apps.favorites.urls")),
+    path("api/v1/", include("apps.core.urls")),
+    # Prometheus scrape endpoint
+    path("metrics", metrics_view, name="metrics"),
     path("api/v1/schema/", SpectacularAPIView.as_view(), name="schema"),
     # Swagger UI endpoint
     path(
@@ -0,0 +1,431 @@
+"""
+Runs the benchmark scenarios and compares them with the stored baseline.
+
+Each scenario is requested through the full Django stack (middleware,
+authentication, views, serializers) with the test client. For every scenario
+we record the p50/p95 latency, the number of SQL queries and, on PostgreSQL,
+the number of rows the queries read according to `EXPLAIN ANALYZE`.
+"""
+
+import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.utils import load_backend
+from django.http import HttpRequest, HttpResponse
+from django.test import Client, RequestFactory, override_settings
+from django.urls import reverse
+
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.core.middleware import StatefulMiddleware
+from apps.core.utils import QueryRecorder, RecordedQuery
+from apps.favorites.models import UserFavoriteProperty
+from apps.properties.models import Property, PropertyStatus
+
+from benchmarks.scenarios import BenchmarkContext, BenchmarkDataError, Scenario
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+
+# Relative slack allowed over the baseline before a budget is exceeded.
+DEFAULT_TOLERANCE = {"latency": 0.25, "rows_scanned": 0.10}
+
+# Latency budgets are ratios to the p50 of this scenario, a single indexed
+# count through the whole stack, so that they hold on a faster or slower
+# machine than the one the baseline was measured on. The p95 of a few
+# iterations is too noisy for a ratio.
+REFERENCE_SCENARIO = "properties-count"
+
+# Plan nodes reading rows from a table or an index.
+SCAN_NODES = {
+    "Seq Scan",
+    "Index Scan",
+    "Index Only Scan",
+    "Bitmap Heap Scan",
+    "Parallel Seq Scan",
+    "Parallel Index Scan",
+    "Parallel Index Only Scan",
+}
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    status_code: int
+    p50_ms: float
+    p95_ms: float
+    queries: int
+    rows_scanned: int | None
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """Returns the `percent` percentile of `values` (nearest rank)."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def plan_rows_scanned(plan: Dict[str, Any]) -> int:
+    """Sums the rows read by the scan nodes of an `EXPLAIN (ANALYZE, FORMAT JSON)` plan."""
+    rows = 0
+    if plan.get("Node Type") in SCAN_NODES:
+        loops = plan.get("Actual Loops", 1)
+        rows += (
+            plan.get("Actual Rows", 0)
+            + plan.get("Rows Removed by Filter", 0)
+            + plan.get("Rows Removed by Index Recheck", 0)
+        ) * loops
+    for child in plan.get("Plans", []):
+        rows += plan_rows_scanned(child)
+    return int(rows)
+
+
+def rows_scanned(queries: Iterable[RecordedQuery]) -> int | None:
+    """
+    Returns the rows read by the `SELECT` queries, replayed on the database
+    which ran them, None if a database backend is not supported (only
+    PostgreSQL is).
+    """
+    selects = [
+        query
+        for query in queries
+        if not query.many and query.sql.lstrip().upper().startswith("SELECT")
+    ]
+    aliases = {DEFAULT_DB_ALIAS, *(query.using for query in selects)}
+    if any(connections[alias].vendor != "postgresql" for alias in aliases):
+        return None
+    total = 0
+    for query in selects:
+        with connections[query.using].cursor() as cursor:
+            cursor.execute(f"EXPLAIN (ANALYZE, FORMAT JSON) {query.sql}", query.params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        total += plan_rows_scanned(plan[0]["Plan"])
+    return total
+
+
+def benchmark_client() -> Client:
+    """Returns a test client requesting a host the settings allow."""
+    hosts = [host for host in settings.ALLOWED_HOSTS if host and "*" not in host]
+    return Client(HTTP_HOST=hosts[0].lstrip(".") if hosts else "localhost")
+
+
+class BenchmarkRunner:
+    def __init__(
+        self, context: BenchmarkContext, iterations: int = 30, warmup: int = 3
+    ) -> None:
+        self.context = context
+        self.iterations = iterations
+        self.warmup = warmup
+        self.client = benchmark_client()
+        self.token: str | None = None
+        if context.user is not None:
+            self.token = str(RefreshToken.for_user(context.user).access_token)
+
+    def run(self, scenario: Scenario) -> ScenarioResult:
+        headers: Dict[str, str] = {}
+        if scenario.authenticated:
+            if self.token is None:
+                raise BenchmarkDataError(
+                    f"Scenario '{scenario.name}' needs a user with favorites."
+                )
+            headers["Authorization"] = f"Bearer {self.token}"
+
+        path = scenario.path(self.context)
+        params = scenario.params(self.context)
+        for _ in range(self.warmup):
+            self.client.get(path, params, headers=headers)
+
+        durations, queries = [], 0
+        recorder = QueryRecorder()
+        for _ in range(self.iterations):
+            recorder = QueryRecorder()
+            start = time.perf_counter()
+            with recorder:
+                response = self.client.get(path, params, headers=headers)
+            durations.append((time.perf_counter() - start) * 1000)
+            queries = max(queries, recorder.count)
+
+        return ScenarioResult(
+            name=scenario.name,
+            status_code=response.status_code,
+            p50_ms=round(statistics.median(durations), 2),
+            p95_ms=round(percentile(durations, 95), 2),
+            queries=queries,
+            rows_scanned=rows_scanned(recorder.queries),
+        )
+
+
+def latency_ratios(results: Iterable[ScenarioResult]) -> Dict[str, float]:
+    """Returns the p50 latency of every result relative to `REFERENCE_SCENARIO`."""
+    results = list(results)
+    reference = next(
+        (result for result in results if result.name == REFERENCE_SCENARIO), None
+    )
+    if reference is None:
+        raise ValueError(f"The reference scenario '{REFERENCE_SCENARIO}' did not run.")
+    return {
+        result.name: round(result.p50_ms / max(reference.p50_ms, 0.01), 3)
+        for result in results
+    }
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> Dict[str, Any]:
+    if not path.exists():
+        return {"tolerance": DEFAULT_TOLERANCE, "scenarios": {}}
+    with path.open() as f:
+        baseline: Dict[str, Any] = json.load(f)
+    return baseline
+
+
+def save_baseline(
+    results: Iterable[ScenarioResult], vendor: str, path: Path = BASELINE_PATH
+) -> None:
+    """
+    Stores `results`, measured on a `vendor` database, as the new baseline,
+    keeping the other scenarios.
+    """
+    results = list(results)
+    ratios = latency_ratios(results)
+    baseline = load_baseline(path)
+    baseline.setdefault("dataset", {})["vendor"] = vendor
+    for result in results:
+        budget = asdict(result)
+        del budget["name"], budget["status_code"]
+        budget["p50_ratio"] = ratios[result.name]
+        baseline["scenarios"][result.name] = budget
+    with path.open("w") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def compare(
+    results: Iterable[ScenarioResult], baseline: Dict[str, Any], vendor: str
+) -> List[str]:
+    """
+    Compares `results`, measured on a `vendor` database, with the `baseline`
+    budgets.
+
+    The query count budget is strict, any additional query is a regression.
+    The p50 latency relative to `REFERENCE_SCENARIO` and the rows scanned may
+    exceed the baseline by the configured relative tolerance, to absorb
+    noise. Both depend on the database, so they are only compared with a
+    baseline measured on the same database vendor. Scenarios without a
+    baseline are not checked.
+
+    Returns:
+        A description of every exceeded budget, empty if all are respected.
+    """
+    results = list(results)
+    tolerance = {**DEFAULT_TOLERANCE, **baseline.get("tolerance", {})}
+    violations = []
+    baseline_vendor = baseline.get("dataset", {}).get("vendor", vendor)
+    if baseline_vendor != vendor:
+        violations.append(
+            f"The baseline was measured on {baseline_vendor}, not {vendor}, "
+            "regenerate it on this database to compare latency and rows scanned."
+        )
+    ratios = latency_ratios(results)
+    for result in results:
+        if result.status_code >= 400:
+            violations.append(f"{result.name}: responded with {result.status_code}")
+        budget = baseline.get("scenarios", {}).get(result.name)
+        if budget is None:
+            continue
+
+        if result.queries > budget["queries"]:
+            violations.append(
+                f"{result.name}: {result.queries} queries, budget is {budget['queries']}"
+            )
+        if baseline_vendor != vendor:
+            continue
+        ratio = budget.get("p50_ratio")
+        if result.name != REFERENCE_SCENARIO and ratio is not None:
+            limit = ratio * (1 + tolerance["latency"])
+            if ratios[result.name] > limit:
+                violations.append(
+                    f"{result.name}: p50 {result.p50_ms}ms is "
+                    f"{ratios[result.name]:.2f}x {REFERENCE_SCENARIO}, exceeds "
+                    f"{limit:.2f}x (baseline {ratio:.2f}x)"
+                )
+        if result.rows_scanned is not None and budget.get("rows_scanned") is not None:
+            limit = budget["rows_scanned"] * (1 + tolerance["rows_scanned"])
+            if result.rows_scanned > limit:
+                violations.append(
+                    f"{result.name}: {result.rows_scanned} rows scanned exceeds "
+                    f"{limit:.0f} (baseline {budget['rows_scanned']})"
+                )
+    return violations
+
+
+def middleware_overhead(path: str, iterations: int = 10_000) -> Dict[str, float]:
+    """
+    Returns the mean time in microseconds `StatefulMiddleware` adds to a
+    request of `path`, when it runs the `STATEFUL_MIDDLEWARE` for every route
+    ("full") and as configured ("lean").
+
+    The middleware wrap a view returning an empty response, so that only
+    their own work is timed, which the noise of complete requests hides.
+    """
+
+    def view(request: HttpRequest) -> HttpResponse:
+        return HttpResponse()
+
+    factory = RequestFactory()
+    results = {}
+    for name, prefixes in [("full", []), ("lean", settings.STATELESS_PATH_PREFIXES)]:
+        with override_settings(STATELESS_PATH_PREFIXES=prefixes):
+            middleware = StatefulMiddleware(view)
+        requests = [factory.get(path) for _ in range(iterations)]
+        start = time.perf_counter()
+        for request in requests:
+            middleware(request)
+        results[name] = round((time.perf_counter() - start) / iterations * 1e6, 2)
+    return results
+
+
+def connection_overhead(
+    threads: int = 8, requests: int = 200, alias: str = DEFAULT_DB_ALIAS
+) -> Dict[str, Dict[str, float]]:
+    """
+    Measures the time to get a connection and run `SELECT 1`, as the first
+    query of a request does, in `threads` concurrent threads making
+    `requests` requests each. Returns the p50/p95 in milliseconds and the
+    requests per second of every way to get a connection:
+    - "direct": a new connection per request (`CONN_MAX_AGE=0`);
+    - "persistent": a connection kept by every thread, as with
+      `CONN_MAX_AGE` under WSGI;
+    - "pooled": a connection of a pool sized by `DATABASE_POOL_OPTIONS`, on
+      the backends with a pool.
+    """
+    settings_dict = {**connections[alias].settings_dict, "CONN_MAX_AGE": 0}
+    options = {
+        key: value for key, value in settings_dict["OPTIONS"].items() if key != "pool"
+    }
+    backend = load_backend(settings_dict["ENGINE"])
+    modes = {
+        "direct": {**settings_dict, "OPTIONS": options},
+        "persistent": {**settings_dict, "OPTIONS": options},
+    }
+    if hasattr(backend.DatabaseWrapper, "pool"):
+        pool = settings_dict["OPTIONS"].get("pool") or settings.DATABASE_POOL_OPTIONS
+        modes["pooled"] = {**settings_dict, "OPTIONS": {**options, "pool": pool}}
+
+    def run(mode: str) -> List[float]:
+        wrapper = backend.DatabaseWrapper(modes[mode], alias=f"benchmark-{mode}")
+        durations = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            with wrapper.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            if mode != "persistent":
+                wrapper.close()
+            durations.append(time.perf_counter() - start)
+        wrapper.close()
+        return durations
+
+    results = {}
+    for mode in modes:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            runs = list(executor.map(run, [mode] * threads))
+        elapsed = time.perf_counter() - start
+        if mode == "pooled":
+            backend.DatabaseWrapper(modes[mode], alias="benchmark-pooled").close_pool()
+        durations = [duration for run_durations in runs for duration in run_durations]
+        results[mode] = {
+            "p50_ms": round(percentile(durations, 50) * 1000, 3),
+            "p95_ms": round(percentile(durations, 95) * 1000, 3),
+            "requests_per_second": round(len(durations) / elapsed, 1),
+        }
+    return results
+
+
+def favorite_throughput(
+    context: BenchmarkContext, threads: int = 8, requests: int = 50
+) -> Dict[str, float]:
+    """
+    Measures adding and removing favorites through the API in `threads`
+    concurrent threads, each adding and then removing a favorite `requests`
+    times as `BenchmarkContext.user`. Every two threads share a property, so
+    that concurrent double taps on the same favorite are part of the load.
+
+    Returns the p50/p95 in milliseconds and the requests per second of all
+    the requests, the number of adds refused as duplicates ("conflicts") and
+    of unexpected responses ("errors").
+    """
+    if context.user is None:
+        raise BenchmarkDataError("The favorite benchmark needs a user with favorites.")
+    property_ids = list(
+        Property.objects.filter(
+            country_code=context.country_code, status=PropertyStatus.ACTIVE
+        )
+        .exclude(
+            id__in=UserFavoriteProperty.objects.filter(user=context.user).values(
+                "property_id"
+            )
+        )
+        .order_by("id")
+        .values_list("id", flat=True)[: (threads + 1) // 2]
+    )
+    if len(property_ids) < (threads + 1) // 2:
+        raise BenchmarkDataError(
+            f"There are not enough active properties in {context.country_code} "
+            "which the user has not favorited."
+        )
+    headers = {
+        "Authorization": f"Bearer {RefreshToken.for_user(context.user).access_token}"
+    }
+    list_url = reverse("apps.favorites:favorite-list")
+
+    def run(property_id: int) -> Tuple[List[float], int, int]:
+        client = benchmark_client()
+        durations, conflicts, errors = [], 0, 0
+        try:
+            for _ in range(requests):
+                start = time.perf_counter()
+                response = client.post(
+                    list_url, {"property_id": property_id}, headers=headers
+                )
+                durations.append(time.perf_counter() - start)
+                if response.status_code == 409:
+                    conflicts += 1
+                    continue
+                if response.status_code != 201:
+                    errors += 1
+                    continue
+                start = time.perf_counter()
+                response = client.delete(
+                    reverse(
+                        "apps.favorites:favorite-detail", args=[response.json()["id"]]
+                    ),
+                    headers=headers,
+                )
+                durations.append(time.perf_counter() - start)
+                if response.status_code != 204:
+                    errors += 1
+        finally:
+            connections.close_all()
+        return durations, conflicts, errors
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        runs = list(
+            executor.map(run, [property_ids[thread // 2] for thread in range(threads)])
+        )
+    elapsed = time.perf_counter() - start
+    durations = [duration for run_durations, _, _ in runs for duration in run_durations]
+    return {
+        "p50_ms": round(percentile(durations, 50) * 1000, 3),
+        "p95_ms": round(percentile(durations, 95) * 1000, 3),
+        "requests_per_second": round(len(durations) / elapsed, 1),
+        "conflicts": sum(conflicts for _, conflicts, _ in runs),
+        "errors": sum(errors for _, _, errors in runs),
+    }
@@ -0,0 +1,164 @@
+"""
+The hot API paths covered by the benchmark suite.
+
+Scenario parameters depend on the dataset (which city has listings, which
+user has favorites), so they are resolved from a `BenchmarkContext` built
+from the database right before the run.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count
+from django.urls import reverse
+
+from apps.favorites.models import UserFavoriteProperty
+from apps.properties.models import Property, PropertyStatus, PropertyType
+
+User = get_user_model()
+
+# A city with about this many active listings is used for list requests, as
+# the list endpoint is not paginated.
+TYPICAL_CITY_LISTINGS = 200
+
+
+class BenchmarkDataError(Exception):
+    """The database does not contain the data the scenarios need."""
+
+
+@dataclass
+class BenchmarkContext:
+    country_code: str
+    # The city with the most listings, used for count and search.
+    top_city: str
+    # A city with a typical number of listings, used for lists.
+    typical_city: str
+    property_id: int
+    # The user with the most favorites, None if nobody has favorites.
+    user: Any = None
+
+    @classmethod
+    def from_database(cls, country_code: str) -> "BenchmarkContext":
+        country_code = country_code.upper()
+        cities = list(
+            Property.objects.filter(
+                country_code=country_code, status=PropertyStatus.ACTIVE
+            )
+            .values("city")
+            .annotate(listings=Count("id"))
+            .order_by("-listings", "city")
+            .values_list("city", "listings")
+        )
+        if not cities:
+            raise BenchmarkDataError(
+                f"There are no active properties in {country_code}, generate a "
+                "dataset with `manage.py generate_synthetic_data` first."
+            )
+        typical_city = min(
+            cities, key=lambda city: abs(city[1] - TYPICAL_CITY_LISTINGS)
+        )[0]
+        property_id = (
+            Property.objects.filter(country_code=country_code, city=cities[0][0])
+            .values_list("id", flat=True)
+            .first()
+        )
+        favorite = (
+            UserFavoriteProperty.objects.values("user")
+            .annotate(favorites=Count("id"))
+            .order_by("-favorites", "user")
+            .first()
+        )
+        return cls(
+            country_code=country_code,
+            top_city=cities[0][0],
+            typical_city=typical_city,
+            property_id=property_id or 0,
+            user=User.objects.get(pk=favorite["user"]) if favorite else None,
+        )
+
+
+@dataclass
+class Scenario:
+    """
+    One request of the benchmark suite.
+
+    Attributes:
+        name: Unique name, used as key in the baseline file.
+        path: Returns the URL path of the request.
+        params: Returns the query parameters of the request.
+        authenticated: Send the request as `BenchmarkContext.user`.
+    """
+
+    name: str
+    path: Callable[[BenchmarkContext], str]
+    params: Callable[[BenchmarkContext], Dict[str, str]] = field(
+        default=lambda context: {}
+    )
+    authenticated: bool = False
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario(
+        name="properties-list",
+        path=lambda context: reverse("apps.properties:properties-list"),
+        params=lambda context: {
+            "country_code": context.country_code,
+            "city": context.typical_city,
+        },
+    ),
+    Scenario(
+        name="properties-list-authenticated",
+        path=lambda context: reverse("apps.properties:properties-list"),
+        params=lambda context: {
+            "country_code": context.country_code,
+            "city": context.typical_city,
+        },
+        authenticated=True,
+    ),
+    Scenario(
+        name="properties-list-filtered",
+        path=lambda context: reverse("apps.properties:properties-list"),
+        params=lambda context: {
+            "country_code": context.country_code,
+            "city": context.top_city,
+            "property_type": f"{PropertyType.APARTMENT},{PropertyType.PENTHOUSE}",
+            "min_area": "60",
+            "max_area": "90",
+            "ordering": "-price",
+        },
+    ),
+    Scenario(
+        name="properties-count",
+        path=lambda context: reverse("apps.properties:properties-count"),
+        params=lambda context: {"country_code": context.country_code},
+    ),
+    Scenario(
+        name="properties-count-filtered",
+        path=lambda context: reverse("apps.properties:properties-count"),
+        params=lambda context: {
+            "country_code": context.country_code,
+            "property_type": f"{PropertyType.APARTMENT},{PropertyType.SINGLE_FAMILY}",
+            "min_price": "100000",
+        },
+    ),
+    Scenario(
+        name="properties-search",
+        path=lambda context: reverse("apps.properties:property-search"),
+        params=lambda context: {
+            "text": context.top_city[:3],
+            "country_code": context.country_code,
+        },
+    ),
+    Scenario(
+        name="property-detail",
+        path=lambda context: reverse(
+            "apps.properties:properties-detail", args=[context.property_id]
+        ),
+    ),
+    Scenario(
+        name="favorites-list",
+        path=lambda context: reverse("apps.favorites:favorite-list"),
+        authenticated=True,
+    ),
+]
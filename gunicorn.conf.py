@@ -0,0 +1,27 @@
+"""
+Gunicorn configuration, loaded automatically from the working directory.
+
+Prometheus metrics are aggregated across the workers through files in
+PROMETHEUS_MULTIPROC_DIR. The directory is wiped when the master starts, so
+that the values of a previous run are not reported, and the files of a dead
+worker are marked so that its gauges are dropped.
+"""
+
+import os
+import shutil
+from typing import Any
+
+multiproc_dir = os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR", "/tmp/homeapi-prometheus"
+)
+
+
+def on_starting(server: Any) -> None:
+    shutil.rmtree(multiproc_dir, ignore_errors=True)
+    os.makedirs(multiproc_dir, exist_ok=True)
+
+
+def child_exit(server: Any, worker: Any) -> None:
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)  # type: ignore[no-untyped-call]
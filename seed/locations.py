@@ -7,6 +7,7 @@ from django.db.utils import IntegrityError
 from django.utils.text import slugify
 
 from apps.locations.models import City, Country
+from apps.locations.services.city_options import invalidate_city_options
 
 from seed.city_data import danish_cities, macedonia_cities
 from seed.countries_data import countries_data
@@ -90,3 +91,7 @@ try:
     seed_cities(danish_cities, denmark)
 except Country.DoesNotExist:
     logger.error("Country not found")
+
+
+# `bulk_create` bypasses the model signals, drop the cached city options.
+invalidate_city_options()
@@ -0,0 +1,679 @@
+"""
+Reproducible, production scale synthetic data for benchmarking.
+
+The generator creates users, addresses, properties, property images and
+favorites with realistic distributions:
+
+- properties are spread over the requested countries by weight, and over the
+  cities of a country following a Zipf distribution, so that a few big cities
+  hold most of the listings as they do in production;
+- prices, areas, types and statuses follow per type/country distributions;
+- favorites concentrate on a minority of popular properties.
+
+Every value is drawn from a single `random.Random(seed)`, so the same
+configuration always produces the same dataset. Rows are written in chunks
+with `bulk_create`, or with `COPY` on PostgreSQL, and primary keys are
+assigned up front so that chunks never need to read back generated ids.
+
+Used by the `generate_synthetic_data` management command.
+"""
+
+import io
+import logging
+import math
+import random
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from decimal import Decimal
+from itertools import accumulate
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple, Type
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import DateTimeField, Max, Model
+from django.utils import timezone
+from django.utils.text import slugify
+
+from apps.favorites.models import UserFavoriteProperty
+from apps.favorites.services.counts import reconcile_favorite_counts
+from apps.locations.models import Address, City, Country
+from apps.locations.services.city_options import invalidate_city_options
+from apps.properties.models import (
+    Property,
+    PropertyImage,
+    PropertyStatus,
+    PropertyType,
+)
+
+from seed.city_data import danish_cities, macedonia_cities
+from seed.countries_data import countries_data
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+# Countries with real city data, other countries get generated cities.
+KNOWN_CITIES: Dict[str, List[Dict[str, Any]]] = {
+    "DK": danish_cities,
+    "MK": macedonia_cities,
+}
+
+# (currency, median price per square meter)
+COUNTRY_PRICING: Dict[str, Tuple[str, int]] = {
+    "DK": ("DKK", 28_000),
+    "MK": ("EUR", 1_300),
+}
+DEFAULT_PRICING = ("EUR", 2_500)
+
+PROPERTY_TYPE_WEIGHTS: Dict[str, float] = {
+    PropertyType.APARTMENT: 35,
+    PropertyType.SINGLE_FAMILY: 25,
+    PropertyType.TOWNHOUSE: 8,
+    PropertyType.CONDOMINIUM: 6,
+    PropertyType.LAND: 4,
+    PropertyType.COTTAGE: 3,
+    PropertyType.FARMHOUSE: 2,
+    PropertyType.PENTHOUSE: 2,
+}
+# Every other type is rare but present.
+DEFAULT_TYPE_WEIGHT = 0.5
+
+# (median living area in m², log-normal sigma)
+PROPERTY_TYPE_AREA: Dict[str, Tuple[float, float]] = {
+    PropertyType.APARTMENT: (70, 0.35),
+    PropertyType.PENTHOUSE: (140, 0.3),
+    PropertyType.TINY_HOME: (30, 0.2),
+    PropertyType.LAND: (800, 0.8),
+    PropertyType.MANSION: (450, 0.3),
+    PropertyType.WAREHOUSE: (1_200, 0.6),
+}
+DEFAULT_AREA = (130, 0.4)
+
+PROPERTY_STATUS_WEIGHTS: Dict[str, float] = {
+    PropertyStatus.ACTIVE: 70,
+    PropertyStatus.SOLD: 10,
+    PropertyStatus.PENDING: 4,
+    PropertyStatus.UNDER_CONTRACT: 4,
+    PropertyStatus.COMING_SOON: 3,
+    PropertyStatus.OFF_MARKET: 3,
+    PropertyStatus.LEASED: 2,
+    PropertyStatus.EXPIRED: 1,
+    PropertyStatus.WITHDRAWN: 1,
+    PropertyStatus.CANCELED: 1,
+    PropertyStatus.DRAFT: 0.5,
+    PropertyStatus.AUCTION: 0.5,
+}
+
+SYLLABLES = [
+    "ba",
+    "bo",
+    "da",
+    "ko",
+    "ve",
+    "li",
+    "ma",
+    "ni",
+    "ro",
+    "sa",
+    "ta",
+    "vo",
+    "gra",
+    "bre",
+    "sto",
+    "dra",
+    "ki",
+    "lu",
+    "mo",
+    "ze",
+    "ha",
+    "ri",
+    "ne",
+    "pe",
+]
+STREET_SUFFIXES: Dict[str, List[str]] = {
+    "DK": ["vej", "gade", "allé", "stræde", "parken"],
+}
+HEATING = ["Central heating", "District heating", "Heat pump", "Gas", "Electric"]
+OUTER_WALLS = ["Brick", "Concrete", "Wood", "Stone", "Stucco"]
+ROOF_TYPES = ["Tile", "Flat", "Pitched", "Slate", "Metal"]
+ENERGY_CLASSES = ["A", "B", "C", "D", "E", "F", "G"]
+
+# Listings are spread over this period, the newest ones are the latest rows.
+HISTORY = timedelta(days=730)
+
+
+@dataclass
+class SyntheticDataConfig:
+    """
+    Size and shape of the generated dataset.
+
+    Attributes:
+        properties: Number of properties (and addresses) to generate.
+        users: Number of users owning favorites.
+        images_per_property: Average number of images per property.
+        favorites_per_user: Average number of favorites per user.
+        countries: ISO 3166-1 country code to relative weight of properties.
+        cities_per_country: Cities generated for countries without city data.
+        city_skew: Zipf exponent of properties over the cities of a country.
+            0 spreads them uniformly, higher values favour the big cities.
+        favorite_skew: How strongly favorites concentrate on few properties.
+            1 is uniform, higher values favour the popular properties.
+        seed: Seed of the random generator.
+        chunk_size: Rows generated and written per chunk.
+        use_copy: Use `COPY` instead of `bulk_create` on PostgreSQL.
+    """
+
+    properties: int = 10_000
+    users: int = 1_000
+    images_per_property: float = 3.0
+    favorites_per_user: float = 10.0
+    countries: Dict[str, float] = field(default_factory=lambda: {"MK": 1, "DK": 1})
+    cities_per_country: int = 50
+    city_skew: float = 1.1
+    favorite_skew: float = 3.0
+    seed: int = 42
+    chunk_size: int = 5_000
+    use_copy: bool = True
+
+
+@dataclass
+class CityPool:
+    """The cities of a country with their cumulative sampling weights."""
+
+    country_code: str
+    cities: List[City]
+    cum_weights: List[float]
+    streets: Dict[int, List[str]] = field(default_factory=dict)
+
+
+@contextmanager
+def without_auto_timestamps(*models: Type[Model]) -> Iterator[None]:
+    """
+    Temporarily disables `auto_now` and `auto_now_add` on the given models.
+
+    `TimeTracking` fields would otherwise overwrite the generated
+    `created_at`/`updated_at` values with the insertion time.
+    """
+    patched: List[Tuple["DateTimeField[Any, Any]", bool, bool]] = []
+    for model in models:
+        for model_field in model._meta.concrete_fields:
+            if isinstance(model_field, DateTimeField) and (
+                model_field.auto_now or model_field.auto_now_add
+            ):
+                patched.append(
+                    (model_field, model_field.auto_now, model_field.auto_now_add)
+                )
+                model_field.auto_now = model_field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for model_field, auto_now, auto_now_add in patched:
+            model_field.auto_now = auto_now
+            model_field.auto_now_add = auto_now_add
+
+
+def next_id(model: Type[Model]) -> int:
+    return int(model._default_manager.aggregate(max_id=Max("pk"))["max_id"] or 0) + 1
+
+
+def copy_value(value: Any) -> str:
+    """Formats a database value for PostgreSQL's `COPY ... FROM STDIN` text format."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+class SyntheticDataGenerator:
+    def __init__(
+        self,
+        config: SyntheticDataConfig,
+        log: Callable[[str], None] = logger.info,
+    ) -> None:
+        self.config = config
+        self.log = log
+        self.rng = random.Random(config.seed)
+        self.now = timezone.now()
+
+    def reseed(self, stage: str) -> None:
+        """
+        Gives every stage its own random stream, so that skipping existing
+        rows (cities, users) in a stage does not shift the values of the next.
+        """
+        self.rng = random.Random(f"{self.config.seed}:{stage}")
+
+    # ------------------------------------------------------------------ #
+    # Writing
+    # ------------------------------------------------------------------ #
+    @property
+    def copy_enabled(self) -> bool:
+        return self.config.use_copy and connection.vendor == "postgresql"
+
+    def write(self, model: Type[Model], objs: Sequence[Model]) -> None:
+        """Inserts `objs`, with `COPY` on PostgreSQL when enabled."""
+        if not objs:
+            return
+        if self.copy_enabled:
+            self.copy(model, objs)
+        else:
+            model._default_manager.bulk_create(objs, batch_size=self.config.chunk_size)
+
+    def copy(self, model: Type[Model], objs: Sequence[Model]) -> None:
+        fields = model._meta.concrete_fields
+        buffer = io.StringIO()
+        for obj in objs:
+            values = (
+                f.get_db_prep_save(getattr(obj, f.attname), connection) for f in fields
+            )
+            buffer.write("\t".join(copy_value(v) for v in values))
+            buffer.write("\n")
+
+        quote = connection.ops.quote_name
+        sql = "COPY {table} ({columns}) FROM STDIN".format(
+            table=quote(model._meta.db_table),
+            columns=", ".join(quote(f.column) for f in fields),
+        )
+        with connection.cursor() as cursor:
+            raw_cursor: Any = cursor.cursor
+            if hasattr(raw_cursor, "copy_expert"):  # psycopg2
+                buffer.seek(0)
+                raw_cursor.copy_expert(sql, buffer)
+            else:  # psycopg 3
+                with raw_cursor.copy(sql) as copy:
+                    copy.write(buffer.getvalue())
+
+    def reset_sequences(self, *models: Type[Model]) -> None:
+        """Moves the id sequences past the explicitly assigned primary keys."""
+        statements = connection.ops.sequence_reset_sql(no_style(), list(models))
+        if not statements:
+            return
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+    # ------------------------------------------------------------------ #
+    # Reference data
+    # ------------------------------------------------------------------ #
+    def synthetic_name(self, syllables: int) -> str:
+        return "".join(self.rng.choice(SYLLABLES) for _ in range(syllables)).title()
+
+    def ensure_countries(self) -> Dict[str, Country]:
+        codes = {code.upper() for code in self.config.countries}
+        known = {data["code"] for data in countries_data}
+        unknown = codes - known
+        if unknown:
+            raise ValueError(f"Unknown country codes: {', '.join(sorted(unknown))}")
+
+        Country.objects.bulk_create(
+            [Country(**data) for data in countries_data if data["code"] in codes],
+            ignore_conflicts=True,
+        )
+        return {c.code: c for c in Country.objects.filter(code__in=codes)}
+
+    def ensure_cities(self, country: Country) -> List[City]:
+        cities = list(City.objects.filter(country=country).order_by("id"))
+        if cities:
+            return cities
+
+        city_data = KNOWN_CITIES.get(country.code)
+        if city_data is None:
+            names: set[str] = set()
+            while len(names) < self.config.cities_per_country:
+                names.add(self.synthetic_name(self.rng.randint(2, 4)))
+            city_data = [{"name": name} for name in sorted(names)]
+
+        code = country.code.lower()
+        City.objects.bulk_create(
+            [
+                City(
+                    name=data["name"],
+                    slug=f"{slugify(data['name']) or 'city'}-{code}-{i}",
+                    country=country,
+                    region=data.get("region"),
+                    latitude=data.get("latitude"),
+                    longitude=data.get("longitude"),
+                )
+                for i, data in enumerate(city_data)
+            ],
+            ignore_conflicts=True,
+        )
+        invalidate_city_options()
+        return list(City.objects.filter(country=country).order_by("id"))
+
+    def city_pools(self, countries: Dict[str, Country]) -> Dict[str, CityPool]:
+        cities_by_country = {
+            code: self.ensure_cities(countries[code]) for code in sorted(countries)
+        }
+        self.reseed("city-weights")
+        pools = {}
+        for code, cities in cities_by_country.items():
+            # Shuffle so that the biggest cities are not simply the first ones
+            # alphabetically, then weight them by rank (Zipf).
+            self.rng.shuffle(cities)
+            weights = [
+                1 / (rank**self.config.city_skew) for rank in range(1, len(cities) + 1)
+            ]
+            pools[code] = CityPool(code, cities, list(accumulate(weights)))
+        return pools
+
+    def streets(self, pool: CityPool, city: City, rank: int) -> List[str]:
+        """Street names of a city, bigger cities have more streets."""
+        if city.id not in pool.streets:
+            count = max(5, int(300 / rank))
+            suffixes = STREET_SUFFIXES.get(pool.country_code)
+            names = []
+            for _ in range(count):
+                if suffixes:
+                    name = self.synthetic_name(2) + self.rng.choice(suffixes)
+                else:
+                    name = f"{self.synthetic_name(2)} {self.synthetic_name(3)}"
+                names.append(name)
+            pool.streets[city.id] = names
+        return pool.streets[city.id]
+
+    # ------------------------------------------------------------------ #
+    # Users
+    # ------------------------------------------------------------------ #
+    def user_email(self, index: int) -> str:
+        return f"user{index}.seed{self.config.seed}@synthetic.invalid"
+
+    def generate_users(self) -> List[int]:
+        """Creates the synthetic users that do not exist yet, returns all their ids."""
+        emails = [self.user_email(i) for i in range(self.config.users)]
+        existing = set(
+            User.objects.filter(
+                email__endswith=f".seed{self.config.seed}@synthetic.invalid"
+            ).values_list("email", flat=True)
+        )
+        # Hashing is slow on purpose, every synthetic user shares one password.
+        password = make_password("synthetic-password")
+        first_id = next_id(User)
+        users: List[Any] = []
+        for email in emails:
+            first_name, last_name = self.synthetic_name(2), self.synthetic_name(3)
+            date_joined = self.now - HISTORY * self.rng.random()
+            if email in existing:
+                continue
+            users.append(
+                User(
+                    id=first_id + len(users),
+                    email=email,
+                    password=password,
+                    first_name=first_name,
+                    last_name=last_name,
+                    full_name=f"{first_name} {last_name}",
+                    agreed_to_terms=True,
+                    date_joined=date_joined,
+                )
+            )
+
+        with transaction.atomic():
+            for start in range(0, len(users), self.config.chunk_size):
+                end = start + self.config.chunk_size
+                self.write(User, users[start:end])
+            self.reset_sequences(User)
+        self.log(f"Created {len(users)} users ({len(existing)} already existed)")
+        return list(
+            User.objects.filter(email__in=emails)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+
+    # ------------------------------------------------------------------ #
+    # Properties
+    # ------------------------------------------------------------------ #
+    def build_listing(
+        self,
+        address_id: int,
+        property_id: int,
+        created_at: datetime,
+        pool: CityPool,
+        owner_id: int | None,
+    ) -> Tuple[Address, Property]:
+        """Builds one address and the property listed at it."""
+        rng = self.rng
+        city = rng.choices(pool.cities, cum_weights=pool.cum_weights)[0]
+        rank = pool.cities.index(city) + 1
+        street = rng.choice(self.streets(pool, city, rank))
+        street_number = str(rng.randint(1, 200))
+        if rng.random() < 0.1:
+            street_number += rng.choice("ABCD")
+        postal_code = str(1000 + (city.id * 37 + rank) % 9000)
+
+        latitude = longitude = None
+        if city.latitude is not None and city.longitude is not None:
+            latitude = round(city.latitude + rng.gauss(0, 0.02), 6)
+            longitude = round(city.longitude + rng.gauss(0, 0.02), 6)
+        updated_at = min(created_at + timedelta(days=rng.expovariate(1 / 20)), self.now)
+
+        address = Address(
+            id=address_id,
+            street_name=street,
+            street_number=street_number,
+            postal_code=postal_code,
+            city_id=city.id,
+            latitude=latitude,
+            longitude=longitude,
+            created_at=created_at,
+            updated_at=created_at,
+        )
+
+        types = list(PropertyType.values)
+        property_type = rng.choices(
+            types,
+            weights=[PROPERTY_TYPE_WEIGHTS.get(t, DEFAULT_TYPE_WEIGHT) for t in types],
+        )[0]
+        status = rng.choices(
+            list(PROPERTY_STATUS_WEIGHTS),
+            weights=list(PROPERTY_STATUS_WEIGHTS.values()),
+        )[0]
+        median_area, sigma = PROPERTY_TYPE_AREA.get(property_type, DEFAULT_AREA)
+        area = round(max(15.0, rng.lognormvariate(math.log(median_area), sigma)), 1)
+        total_area = round(area * rng.uniform(1.0, 4.0), 1)
+        currency, price_per_sqm = COUNTRY_PRICING.get(
+            pool.country_code, DEFAULT_PRICING
+        )
+        # Big cities are more expensive than the countryside.
+        city_factor = 1.6 / (rank**0.15)
+        price = area * price_per_sqm * city_factor * rng.lognormvariate(0, 0.25)
+        construction_year = rng.randint(1900, created_at.year)
+
+        listing = Property(
+            id=property_id,
+            price=Decimal(max(1_000, round(price, -3))),
+            price_currency=currency,
+            area=area,
+            total_area=total_area,
+            measured_area=area if rng.random() < 0.3 else None,
+            total_rooms=float(max(1, round(area / rng.uniform(20, 35)))),
+            toilets=max(1, round(area / 70)),
+            construction_year=construction_year,
+            renovation_year=(
+                rng.randint(construction_year, created_at.year)
+                if rng.random() < 0.4
+                else None
+            ),
+            total_floors=rng.randint(1, 3),
+            heating=rng.choice(HEATING),
+            outer_walls=rng.choice(OUTER_WALLS),
+            roof_type=rng.choice(ROOF_TYPES),
+            description=f"{PropertyType(property_type).label} in {city.name}.",
+            property_type=property_type,
+            status=status,
+            owner_id=owner_id,
+            energy_class=rng.choice(ENERGY_CLASSES),
+            address_id=address_id,
+            street_name=street,
+            street_number=street_number,
+            postal_code=postal_code,
+            city=city.name,
+            region=city.region,
+            country_code=pool.country_code,
+            created_at=created_at,
+            updated_at=updated_at,
+        )
+        return address, listing
+
+    def build_images(self, first_id: int, listing: Property) -> List[PropertyImage]:
+        mean = self.config.images_per_property
+        if mean <= 0:
+            return []
+        count = max(1, round(self.rng.gauss(mean, mean / 2)))
+        return [
+            PropertyImage(
+                id=first_id + i,
+                is_primary=i == 0,
+                image=(
+                    f"media/property/images/property_{listing.id}/"
+                    f"synthetic_{listing.id}_{i}.jpg"
+                ),
+                property_id=listing.id,
+                created_at=listing.created_at,
+                updated_at=listing.created_at,
+            )
+            for i in range(count)
+        ]
+
+    def generate_properties(
+        self, pools: Dict[str, CityPool], owner_ids: Sequence[int]
+    ) -> Tuple[int, int]:
+        """
+        Generates the addresses, properties and images chunk by chunk.
+
+        Returns:
+            The id of the first generated property and the number of images.
+        """
+        config = self.config
+        codes = sorted(pools)
+        country_cum_weights = list(accumulate(config.countries[c] for c in codes))
+        address_id, property_id = next_id(Address), next_id(Property)
+        image_id = next_id(PropertyImage)
+        first_property_id, images_total = property_id, 0
+        start = self.now - HISTORY
+
+        for chunk_start in range(0, config.properties, config.chunk_size):
+            chunk_end = min(chunk_start + config.chunk_size, config.properties)
+            addresses, listings, images = [], [], []
+            for i in range(chunk_start, chunk_end):
+                code = self.rng.choices(codes, cum_weights=country_cum_weights)[0]
+                # Ids grow with `created_at`, as they would in production.
+                created_at = start + HISTORY * (i / max(1, config.properties))
+                owner_id = self.rng.choice(owner_ids) if owner_ids else None
+                address, listing = self.build_listing(
+                    address_id, property_id, created_at, pools[code], owner_id
+                )
+                listing_images = self.build_images(image_id, listing)
+                addresses.append(address)
+                listings.append(listing)
+                images.extend(listing_images)
+                address_id += 1
+                property_id += 1
+                image_id += len(listing_images)
+
+            with transaction.atomic():
+                self.write(Address, addresses)
+                self.write(Property, listings)
+                self.write(PropertyImage, images)
+            images_total += len(images)
+            self.log(f"Created {chunk_end}/{config.properties} properties")
+
+        self.reset_sequences(Address, Property, PropertyImage)
+        return first_property_id, images_total
+
+    # ------------------------------------------------------------------ #
+    # Favorites
+    # ------------------------------------------------------------------ #
+    def generate_favorites(
+        self, user_ids: Sequence[int], first_property_id: int
+    ) -> int:
+        """
+        Generates favorites of the users for the generated properties.
+
+        Popularity follows a power law: the index of a favorited property is
+        `n * u ** favorite_skew` for a uniform `u`, scrambled with a
+        multiplicative permutation so that the popular properties are spread
+        over the whole id range instead of being the oldest ones.
+
+        The favorite counts of the properties are then recomputed, the bulk
+        writes bypassing `count_favorites`.
+        """
+        config = self.config
+        n = config.properties
+        if not n or not user_ids or config.favorites_per_user <= 0:
+            return 0
+
+        # A multiplier coprime with n makes `(i * step) % n` a permutation.
+        step = max(1, int(n * 0.618))
+        while math.gcd(step, n) != 1:
+            step += 1
+
+        favorite_id, total = next_id(UserFavoriteProperty), 0
+        favorites: List[UserFavoriteProperty] = []
+        for user_id in user_ids:
+            count = min(n, int(self.rng.expovariate(1 / config.favorites_per_user)))
+            indexes: set[int] = set()
+            while len(indexes) < count:
+                indexes.add(int(n * self.rng.random() ** config.favorite_skew))
+            for index in sorted(indexes):
+                created_at = self.now - HISTORY * self.rng.random() / 2
+                favorites.append(
+                    UserFavoriteProperty(
+                        id=favorite_id,
+                        user_id=user_id,
+                        property_id=first_property_id + (index * step) % n,
+                        created_at=created_at,
+                        updated_at=created_at,
+                    )
+                )
+                favorite_id += 1
+
+            if len(favorites) >= config.chunk_size:
+                with transaction.atomic():
+                    self.write(UserFavoriteProperty, favorites)
+                total += len(favorites)
+                favorites = []
+                self.log(f"Created {total} favorites")
+
+        with transaction.atomic():
+            self.write(UserFavoriteProperty, favorites)
+        total += len(favorites)
+        self.reset_sequences(UserFavoriteProperty)
+        reconcile_favorite_counts()
+        return total
+
+    # ------------------------------------------------------------------ #
+    # Entry point
+    # ------------------------------------------------------------------ #
+    def run(self) -> Dict[str, int]:
+        """Generates the whole dataset and returns the number of created rows."""
+        with without_auto_timestamps(
+            Address, Property, PropertyImage, UserFavoriteProperty
+        ):
+            countries = self.ensure_countries()
+            self.reseed("cities")
+            pools = self.city_pools(countries)
+            self.reseed("users")
+            user_ids = self.generate_users()
+            self.reseed("properties")
+            first_property_id, images = self.generate_properties(pools, user_ids)
+            self.reseed("favorites")
+            favorites = self.generate_favorites(user_ids, first_property_id)
+
+        return {
+            "users": len(user_ids),
+            "properties": self.config.properties,
+            "images": images,
+            "favorites": favorites,
+        }
@@ -46,17 +46,40 @@ INSTALLED_APPS = (
 SITE_ID = 1
 
 MIDDLEWARE = [
+    # First, so that the queries of the other middleware are measured too.
+    "apps.core.middleware.RequestMetricsMiddleware",
+    "apps.core.middleware.PrometheusMetricsMiddleware",
+    "apps.core.middleware.SlowQueryMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     # "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "django.contrib.messages.middleware.MessageMiddleware",
+    # Runs STATEFUL_MIDDLEWARE, skipped by the JWT authenticated API routes.
+    "apps.core.middleware.ReplicaPinningMiddleware",
+    "apps.core.middleware.StatefulMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    # Required in MIDDLEWARE itself by allauth.
     "allauth.account.middleware.AccountMiddleware",
 ]
 
+STATEFUL_MIDDLEWARE = [
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+]
+STATELESS_PATH_PREFIXES = ["/api/v1/"]
+# Routes using the session: the admin, and dj-rest-auth's session login.
+STATEFUL_PATH_PREFIXES = [
+    "/api/v1/control-center/",
+    "/api/v1/register",
+    "/api/v1/login",
+    "/api/v1/logout",
+]
+
+# The admin checks for the session, authentication and messages middleware
+# in MIDDLEWARE, they are run by StatefulMiddleware for its routes.
+SILENCED_SYSTEM_CHECKS = ["admin.E408", "admin.E409", "admin.E410"]
+
 AUTHENTICATION_BACKENDS = [
     "django.contrib.auth.backends.ModelBackend",
     "allauth.account.auth_backends.AuthenticationBackend",
@@ -116,11 +139,152 @@ USE_TZ = True
 STATIC_URL = "/static/"
 STATIC_ROOT = BASE_DIR / "static/"
 
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+    # Property images are stored once per unique content, see ImageBlob.
+    "property_images": {
+        "BACKEND": "apps.properties.storage.ContentAddressedStorage",
+    },
+}
+
+# Uploads are streamed to temporary files rather than held in memory, so
+# concurrent uploads of large photos do not exhaust the workers. Pillow reads
+# them from disk too when validating them.
+# https://docs.djangoproject.com/en/5.2/ref/settings/#file-upload-handlers
+FILE_UPLOAD_HANDLERS = ["django.core.files.uploadhandler.TemporaryFileUploadHandler"]
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Local memory is per process, the environment settings use Redis (REDIS_URL)
+# so that the invalidations and the replica pins reach all the workers.
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+# Seconds to keep the create property form data (types, statuses, cities).
+# Entries are invalidated on `City`/`CityTranslation` changes, the timeout
+# only bounds stale data after bulk loads that bypass the model signals.
+PROPERTY_FORM_DATA_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Property details are cached in the memory of every worker, at most
+# PROPERTY_DETAIL_LOCAL_CACHE_SIZE of them, and in the shared cache (Redis
+# with several workers), for PROPERTY_DETAIL_CACHE_TIMEOUT seconds. Writes to
+# a property or its images replace its version, which makes its entries in
+# both tiers stale.
+PROPERTY_DETAIL_CACHE_TIMEOUT = 60 * 60
+PROPERTY_DETAIL_LOCAL_CACHE_SIZE = 1000
+
+# Uploaded property images are oriented, stripped of their metadata, capped
+# to PROPERTY_IMAGE_MAX_DIMENSION pixels and re-encoded to
+# PROPERTY_IMAGE_FORMAT ("JPEG", progressive, or "WEBP"), as are the variants.
+PROPERTY_IMAGE_FORMAT = os.getenv("PROPERTY_IMAGE_FORMAT", "JPEG")
+PROPERTY_IMAGE_QUALITY = 85
+PROPERTY_IMAGE_MAX_DIMENSION = 4096
+# Uploads with more pixels are rejected from their header, before decoding.
+PROPERTY_IMAGE_MAX_PIXELS = 100_000_000
+# Files accepted by a single bulk upload to /properties/{id}/images/, below
+# Django's DATA_UPLOAD_MAX_NUMBER_FILES (100).
+PROPERTY_IMAGE_UPLOAD_MAX_FILES = 50
+
+# Resized variants (max width, max height) generated for every uploaded
+# property image, stored next to the original.
+PROPERTY_IMAGE_VARIANTS = {
+    "card": (480, 360),
+    "gallery": (1280, 960),
+    "full": (2048, 1536),
+}
+PROPERTY_IMAGE_VARIANT_QUALITY = 82
+# Threads processing uploaded images in each web process, 0 processes them
+# synchronously in the request.
+PROPERTY_IMAGE_WORKERS = int(os.getenv("PROPERTY_IMAGE_WORKERS", 2))
+# Images resized on demand have their width rounded up to a multiple of
+# PROPERTY_IMAGE_RESIZE_STEP, and are cached on local disk in
+# PROPERTY_IMAGE_CACHE_DIR, evicting the least recently used ones beyond
+# PROPERTY_IMAGE_CACHE_MAX_BYTES.
+PROPERTY_IMAGE_RESIZE_STEP = 64
+PROPERTY_IMAGE_CACHE_DIR = os.getenv(
+    "PROPERTY_IMAGE_CACHE_DIR", str(BASE_DIR / "cache" / "images")
+)
+PROPERTY_IMAGE_CACHE_MAX_BYTES = int(
+    os.getenv("PROPERTY_IMAGE_CACHE_MAX_BYTES", 512 * 1024 * 1024)
+)
+
+# Database connections are pooled in every worker process when DATABASE_POOL
+# is on, with psycopg's pool on PostgreSQL and `apps.core.db.backends.mysql`
+# on MySQL. Under ASGI the synchronous code of every request runs in a new
+# thread, persistent connections (CONN_MAX_AGE, DATABASE_CONN_MAX_AGE seconds
+# when the pool is off) are only reused under WSGI. The database must accept
+# DATABASE_POOL_MAX_SIZE connections per worker.
+DATABASE_POOL = os.getenv("DATABASE_POOL", "true") == "true"
+DATABASE_CONN_MAX_AGE = int(os.getenv("DATABASE_CONN_MAX_AGE", 60))
+DATABASE_POOL_OPTIONS = {
+    "max_size": int(os.getenv("DATABASE_POOL_MAX_SIZE", 10)),
+    # Seconds a request waits for a connection before failing.
+    "timeout": float(os.getenv("DATABASE_POOL_TIMEOUT", 10)),
+    "max_lifetime": float(os.getenv("DATABASE_POOL_MAX_LIFETIME", 1800)),
+}
+
+# The property list, count and search read from a random replica of
+# DATABASE_REPLICAS, aliases of DATABASES added by the environment settings.
+# Users are pinned to the primary for DATABASE_REPLICA_PIN_SECONDS after a
+# write, by their id in the shared cache, so that they read their writes
+# despite the replication lag.
+DATABASE_ROUTERS = ["apps.core.db.routers.ReplicaRouter"]
+DATABASE_REPLICAS: List[str] = []
+DATABASE_REPLICA_PIN_SECONDS = int(os.getenv("DATABASE_REPLICA_PIN_SECONDS", 5))
+
+# Changes of Property.favorite_count are buffered per worker and written in
+# batches, once FAVORITE_COUNT_FLUSH_SIZE properties have changes or
+# FAVORITE_COUNT_FLUSH_SECONDS after the first change (0 writes immediately).
+FAVORITE_COUNT_FLUSH_SIZE = 100
+FAVORITE_COUNT_FLUSH_SECONDS = float(os.getenv("FAVORITE_COUNT_FLUSH_SECONDS", 5))
+
+# Request metrics (queries, DB/serializer time, cache hits) are logged for
+# every request, at WARNING level above this number of queries.
+REQUEST_METRICS_QUERY_WARNING = 50
+
+# Queries slower than the threshold are sampled, with their `EXPLAIN` plan,
+# into an in-memory ring buffer per worker (`api/v1/slow-queries`).
+# Set SLOW_QUERY_THRESHOLD_MS to an empty string to disable the sampling.
+slow_query_threshold = os.getenv("SLOW_QUERY_THRESHOLD_MS", "200")
+SLOW_QUERY_THRESHOLD_MS = float(slow_query_threshold) if slow_query_threshold else None
+SLOW_QUERY_SAMPLE_RATE = float(os.getenv("SLOW_QUERY_SAMPLE_RATE", 0.1))
+SLOW_QUERY_LOG_SIZE = 500
+
+# Bearer token required to scrape the Prometheus `/metrics` endpoint. When
+# empty the endpoint is public with DEBUG and denied otherwise. Multiprocess
+# aggregation of the workers is configured with PROMETHEUS_MULTIPROC_DIR, see
+# gunicorn.conf.py.
+METRICS_AUTH_TOKEN = os.getenv("METRICS_AUTH_TOKEN", "")
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "apps.core.middleware.request_metrics": {
+            "handlers": ["console"],
+            "level": os.getenv("REQUEST_METRICS_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+    },
+}
+
 REST_FRAMEWORK = {
     # 3.0 gives you the option to serialize decimals as floats.
     # if COERCE_DECIMAL_TO_STRING then the decimals are serialized as strings.
@@ -128,10 +292,26 @@ REST_FRAMEWORK = {
     "NON_FIELD_ERRORS_KEY": "detail",
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.users.authentication.CachedJWTAuthentication",
     ],
 }
 
+# Verified JWTs are cached with their user id, in an LRU of
+# JWT_USER_CACHE_SIZE tokens per worker, for at most JWT_USER_CACHE_TIMEOUT
+# seconds (the staleness of a deactivation in the other workers).
+JWT_USER_CACHE_SIZE = 10_000
+JWT_USER_CACHE_TIMEOUT = 60
+
+# Tokens revoked on logout are rejected by every worker within
+# REVOKED_TOKEN_SYNC_SECONDS, workers keep a Bloom filter of the revoked JTIs
+# sized for REVOKED_TOKEN_FILTER_CAPACITY tokens (~180 kB for 100k). Every
+# sync reads the rows created since REVOKED_TOKEN_SYNC_MARGIN_SECONDS before
+# the previous one, which must exceed the longest transaction revoking a
+# token plus the clock skew between the servers.
+REVOKED_TOKEN_SYNC_SECONDS = 10
+REVOKED_TOKEN_SYNC_MARGIN_SECONDS = 60
+REVOKED_TOKEN_FILTER_CAPACITY = 100_000
+
 REST_AUTH = {
     "USE_JWT": True,
     "JWT_AUTH_HTTPONLY": False,
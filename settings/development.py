@@ -1,4 +1,5 @@
 import os
+from typing import Any, Dict
 
 from .base import *
 
@@ -6,17 +7,51 @@ ALLOWED_HOSTS = os.getenv("ALLOWED_HOSTS", "").split(",")
 
 DEBUG = True
 
-DATABASES = {
+DATABASES: Dict[str, Dict[str, Any]] = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql_psycopg2",
+        "ENGINE": "django.db.backends.postgresql",
         "NAME": os.environ.get("DATABASE_NAME"),
         "USER": os.environ.get("DATABASE_USER"),
         "PASSWORD": os.environ.get("DATABASE_PASSWORD"),
         "HOST": os.environ.get("DATABASE_HOST_POSTGRES"),
         "PORT": os.environ.get("DATABASE_PORT_POSTGRES"),
+        "CONN_MAX_AGE": 0 if DATABASE_POOL else DATABASE_CONN_MAX_AGE,
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": (
+            {
+                "pool": {
+                    **DATABASE_POOL_OPTIONS,
+                    "min_size": int(os.getenv("DATABASE_POOL_MIN_SIZE", 2)),
+                }
+            }
+            if DATABASE_POOL
+            else {}
+        ),
     }
 }
 
+# Read replicas, e.g. "replica1,replica2:5433".
+replica_hosts = os.getenv("DATABASE_REPLICA_HOSTS_POSTGRES", "")
+for index, address in enumerate(filter(None, replica_hosts.split(",")), 1):
+    host, _, port = address.partition(":")
+    DATABASES[f"replica_{index}"] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "PORT": port or DATABASES["default"]["PORT"],
+        # The tests read the replicas from the primary test database.
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(f"replica_{index}")
+
+# Required with several workers, e.g. "redis://localhost:6379/0", see `CACHES`.
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+
 ###############################
 # CUSTOM DEVELOPMENT SETTINGS #
 ###############################
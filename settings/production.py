@@ -25,17 +25,45 @@ if ALLOWED_HOSTS:
 
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.mysql",
+        # Django's MySQL backend with a connection pool.
+        "ENGINE": "apps.core.db.backends.mysql",
         "NAME": env("DATABASE_NAME_MYSQL"),
         "USER": env("DATABASE_USER_MYSQL"),
         "PASSWORD": env("DATABASE_PASSWORD"),
         "HOST": env("DATABASE_HOST_MYSQL"),
         "PORT": env("DATABASE_PORT_MYSQL"),
+        "CONN_MAX_AGE": 0 if DATABASE_POOL else DATABASE_CONN_MAX_AGE,
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {"pool": DATABASE_POOL_OPTIONS} if DATABASE_POOL else {},
+    }
+}
+
+# Read replicas, e.g. "replica1,replica2:3307".
+for index, address in enumerate(
+    env.list("DATABASE_REPLICA_HOSTS_MYSQL", default=[]), 1
+):
+    host, _, port = address.partition(":")
+    DATABASES[f"replica_{index}"] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "PORT": port or DATABASES["default"]["PORT"],
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(f"replica_{index}")
+
+# Shared by the workers, e.g. "redis://redis:6379/0", see `CACHES`.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": env("REDIS_URL"),
     }
 }
 
 CORS_ALLOW_ALL_ORIGINS = True
 
+# `/metrics` is denied until a token is configured.
+METRICS_AUTH_TOKEN = env("METRICS_AUTH_TOKEN", default="")
+
 STATIC_URL = "/static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
 